@@ -1,9 +1,8 @@
-from langfuse import get_client
 import asyncio
 from agents import Agent, Runner
 import os
 from dotenv import load_dotenv
-import logfire
+from deep_research.telemetry import init_telemetry
 import nest_asyncio
 nest_asyncio.apply()
 load_dotenv()
@@ -18,22 +17,9 @@ os.environ["LANGFUSE_HOST"] = os.getenv("LANGFUSE_HOST")
 os.environ["OPENAI_API_KEY"] = os.getenv("OPENAI_API_KEY")
 
  
-# Configure logfire instrumentation.
-logfire.configure(
-    service_name='my_agent_service',
-    send_to_logfire=False,
-)
-# This method automatically patches the OpenAI Agents SDK to send logs via OTLP to Langfuse.
-logfire.instrument_openai_agents()
- 
-langfuse = get_client()
- 
-# Verify connection
-if langfuse.auth_check():
-    print("Langfuse client is authenticated and ready!")
-else:
-    print("Authentication failed. Please check your credentials and host.")
-    
+# Configure tracing once; the Langfuse auth check reports from a background thread.
+init_telemetry("my_agent_service")
+
 async def main():
     agent = Agent(
         name="Assistant",
@@ -0,0 +1,157 @@
+import argparse
+import asyncio
+import json
+import os
+import re
+import time
+from planner_agent import WebSearchPlan
+from research_manager import ResearchManager
+from search_cache import SearchCache, normalize_query, query_key
+from search_scheduler import SearchScheduler
+from telemetry import init_telemetry
+from writer_agent import ReportData
+from dotenv import load_dotenv
+load_dotenv(override=True)
+
+
+def read_queries(path: str) -> list[str]:
+    """ One query per line; blank lines, '#' comments and repeated queries are skipped """
+    queries, seen = [], set()
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            query = line.strip()
+            if not query or query.startswith("#") or normalize_query(query) in seen:
+                continue
+            seen.add(normalize_query(query))
+            queries.append(query)
+    return queries
+
+
+class ProgressJournal:
+    """ Append-only JSONL log of per-query progress, replayed on start so a crashed batch can resume.
+
+    Each line is {"key", "query", "status", ...} with status "planned" (carrying the search plan),
+    "done" (carrying the report path) or "failed" (carrying the error). The last line for a key wins.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.entries: dict[str, dict] = {}
+        torn = False
+        if os.path.exists(path):
+            with open(path, encoding="utf-8") as f:
+                for line in f:
+                    torn = not line.endswith("\n")
+                    try:
+                        entry = json.loads(line)
+                    except json.JSONDecodeError:
+                        continue  # a torn final line from a crash
+                    self.entries[entry["key"]] = entry
+        self._file = open(path, "a", encoding="utf-8")
+        if torn:
+            self._file.write("\n")  # so the next entry starts on a line of its own
+
+    def status(self, query: str) -> str | None:
+        entry = self.entries.get(query_key(query))
+        return entry["status"] if entry else None
+
+    def plan(self, query: str) -> WebSearchPlan | None:
+        entry = self.entries.get(query_key(query))
+        return WebSearchPlan.model_validate(entry["plan"]) if entry and "plan" in entry else None
+
+    def record(self, query: str, status: str, **fields) -> None:
+        entry = {"key": query_key(query), "query": query, "status": status, "time": time.time(), **fields}
+        previous = self.entries.get(entry["key"], {})
+        if "plan" in previous and "plan" not in entry:
+            entry["plan"] = previous["plan"]
+        self.entries[entry["key"]] = entry
+        self._file.write(json.dumps(entry) + "\n")
+        self._file.flush()
+        os.fsync(self._file.fileno())
+
+    def close(self) -> None:
+        self._file.close()
+
+
+def report_path(out_dir: str, query: str) -> str:
+    slug = re.sub(r"[^a-z0-9]+", "-", normalize_query(query))[:60].strip("-") or "report"
+    return os.path.join(out_dir, f"{slug}-{query_key(query)[:8]}.md")
+
+
+def write_report(path: str, report: ReportData) -> None:
+    """ Write the report via a temporary file, so a crash never leaves a half-written report behind """
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        f.write(report.markdown_report)
+    os.replace(tmp, path)
+
+
+async def research_one(manager: ResearchManager, journal: ProgressJournal, out_dir: str, query: str) -> bool:
+    """ Research one query, journaling its plan and outcome; returns whether a report was written """
+    try:
+        search_plan = journal.plan(query)
+        if search_plan is None:
+            search_plan = await manager.plan_searches(query)
+            journal.record(query, "planned", plan=search_plan.model_dump())
+        report = None
+        async for update in manager.research(query, search_plan):
+            if isinstance(update, ReportData):
+                report = update
+        path = report_path(out_dir, query)
+        write_report(path, report)
+    except Exception as exc:
+        journal.record(query, "failed", error=f"{type(exc).__name__}: {exc}")
+        print(f"Failed: {query} ({type(exc).__name__}: {exc})")
+        return False
+    journal.record(query, "done", report=path)
+    print(f"Report written: {path}")
+    return True
+
+
+async def run_batch(queries: list[str], out_dir: str, journal_path: str, concurrency: int = 4,
+                    manager: ResearchManager | None = None, retry_failed: bool = False) -> dict[str, int]:
+    """ Research every query not already done, at most concurrency at a time, over one shared manager.
+
+    The shared manager dedupes in-flight searches across queries, and its scheduler
+    applies one rate limit and retry budget to the whole batch.
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    journal = ProgressJournal(journal_path)
+    manager = manager or ResearchManager(
+        pipelined=True,
+        search_cache=SearchCache(),
+        scheduler=SearchScheduler(concurrency=8),
+    )
+    skip = {"done", "failed"} if not retry_failed else {"done"}
+    todo = [query for query in queries if journal.status(query) not in skip]
+    print(f"{len(queries) - len(todo)} queries already handled, {len(todo)} to research")
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def bounded(query: str) -> bool:
+        async with semaphore:
+            return await research_one(manager, journal, out_dir, query)
+
+    try:
+        results = await asyncio.gather(*(bounded(query) for query in todo))
+    finally:
+        journal.close()
+    return {"skipped": len(queries) - len(todo), "done": sum(results), "failed": len(results) - sum(results)}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Research every query in a file, writing one report per query")
+    parser.add_argument("queries", help="text file with one research query per line")
+    parser.add_argument("--out", default="reports", help="directory for the markdown reports")
+    parser.add_argument("--journal", default=None, help="progress journal (default: <out>/progress.jsonl)")
+    parser.add_argument("--concurrency", type=int, default=4, help="queries researched at once")
+    parser.add_argument("--retry-failed", action="store_true", help="research queries that failed last time again")
+    args = parser.parse_args()
+    init_telemetry("Deep Research Batch")
+    totals = asyncio.run(run_batch(
+        read_queries(args.queries),
+        args.out,
+        args.journal or os.path.join(args.out, "progress.jsonl"),
+        concurrency=args.concurrency,
+        retry_failed=args.retry_failed,
+    ))
+    print(f"Batch finished: {totals}")
@@ -1,12 +1,20 @@
 import gradio as gr
 from dotenv import load_dotenv
 from research_manager import ResearchManager
+from search_cache import SearchCache
+from search_scheduler import SearchScheduler
+from telemetry import init_telemetry
 
 load_dotenv(override=True)
+init_telemetry("Deep Research Manager")
+
+search_cache = SearchCache("search_cache.sqlite3")
+# One scheduler for the whole app, so every user's searches share its rate limit and retry budget.
+search_scheduler = SearchScheduler()
 
 
 async def run(query: str):
-    async for chunk in ResearchManager().run(query):
+    async for chunk in ResearchManager(pipelined=True, search_cache=search_cache, scheduler=search_scheduler).run(query):
         yield chunk
 
 
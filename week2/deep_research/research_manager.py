@@ -1,40 +1,65 @@
 from agents import Runner, trace
 from search_agent import search_agent
 from planner_agent import planner_agent, WebSearchItem, WebSearchPlan
-from writer_agent import writer_agent, ReportData
+from writer_agent import writer_agent, section_writer_agent, ReportData, SectionData
 from email_agent import email_agent
+from search_cache import SearchCache, query_key
+from search_scheduler import SearchScheduler, SearchOutcome, describe, summarize
+from telemetry import init_telemetry
 import asyncio
-import logfire
-from langfuse import get_client
 from dotenv import load_dotenv
 load_dotenv(override=True)
 
 
 class ResearchManager:
 
+    def __init__(self, pipelined: bool = False, straggler_deadline: float | None = 60.0, search_cache: SearchCache | None = None,
+                 scheduler: SearchScheduler | None = None):
+        """ pipelined drafts report sections as searches complete instead of waiting for all of them;
+        straggler_deadline is how many seconds after planning to wait for late searches in that mode;
+        search_cache, when given, answers repeated queries without calling the search agent;
+        scheduler bounds the concurrency, rate and retries of search agent calls; pass one shared
+        scheduler to every manager for limits that hold across the whole process """
+        self.pipelined = pipelined
+        self.straggler_deadline = straggler_deadline
+        self.search_cache = search_cache
+        self.scheduler = scheduler or SearchScheduler()
+        self._searches: dict[str, asyncio.Future] = {}
+        self._waiters: dict[asyncio.Future, int] = {}
+
     async def run(self, query: str):
         """ Run the deep research process, yielding the status updates and the final report"""
-        langfuse = get_client()
-        assert langfuse.auth_check()
-        logfire.configure(
-            service_name="Deep Research Manager",
-            send_to_logfire=False
-        )
-        logfire.instrument_openai_agents()
-        
+        init_telemetry("Deep Research Manager")
         with trace("Research trace"):
             print("Starting research...")
-            search_plan = await self.plan_searches(query)
-            yield "Searches planned, starting to search..."     
-            search_results = await self.perform_searches(search_plan)
-            yield "Searches complete, writing report..."
-            report = await self.write_report(query, search_results)
+            async for update in self.research(query):
+                if isinstance(update, ReportData):
+                    report = update
+                else:
+                    yield update
             yield "Report written, sending email..."
             await self.send_email(report)
             yield "Email sent, research complete"
             yield report.markdown_report
         
 
+    async def research(self, query: str, search_plan: WebSearchPlan | None = None):
+        """ Plan (unless a plan is given), search and write, yielding status updates and finally the ReportData """
+        if search_plan is None:
+            search_plan = await self.plan_searches(query)
+        yield "Searches planned, starting to search..."
+        if self.pipelined:
+            async for update in self.research_pipelined(query, search_plan):
+                yield update
+        else:
+            outcomes = []
+            num_searches = len(unique_searches(search_plan))
+            async for outcome in self.perform_searches(search_plan):
+                outcomes.append(outcome)
+                yield f"Search {len(outcomes)}/{num_searches} done ({describe(outcome)})"
+            yield f"Searches complete ({summarize(outcomes)}), writing report..."
+            yield await self.write_report(query, [outcome.result for outcome in outcomes if outcome.ok])
+
     async def plan_searches(self, query: str) -> WebSearchPlan:
         """ Plan the searches to perform for the query """
         print("Planning searches...")
@@ -45,32 +70,124 @@ class ResearchManager:
         print(f"Will perform {len(result.final_output.searches)} searches")
         return result.final_output_as(WebSearchPlan)
 
-    async def perform_searches(self, search_plan: WebSearchPlan) -> list[str]:
-        """ Perform the searches to perform for the query """
+    async def perform_searches(self, search_plan: WebSearchPlan):
+        """ Perform the plan's distinct searches, yielding each SearchOutcome as it completes """
         print("Searching...")
-        num_completed = 0
-        tasks = [asyncio.create_task(self.search(item)) for item in search_plan.searches]
-        results = []
+        tasks = [asyncio.create_task(self.search(item)) for item in unique_searches(search_plan)]
         for task in asyncio.as_completed(tasks):
-            result = await task
-            if result is not None:
-                results.append(result)
-            num_completed += 1
-            print(f"Searching... {num_completed}/{len(tasks)} completed")
+            yield await task
         print("Finished searching")
-        return results
 
-    async def search(self, item: WebSearchItem) -> str | None:
-        """ Perform a search for the query """
-        input = f"Search term: {item.query}\nReason for searching: {item.reason}"
+    async def search(self, item: WebSearchItem) -> SearchOutcome:
+        """ Perform a search for the query, joining an identical search already in flight.
+
+        The shared search is cancelled once every caller waiting on it has been cancelled, so
+        an abandoned search stops holding the scheduler's concurrency and rate tokens.
+        """
+        key = query_key(item.query)
+        shared = self._searches.get(key)
+        if shared is None:
+            shared = self._searches[key] = asyncio.ensure_future(self._search(item))
+            shared.add_done_callback(lambda done: self._forget(key, done))
+        self._waiters[shared] = self._waiters.get(shared, 0) + 1
         try:
+            return await asyncio.shield(shared)
+        finally:
+            self._waiters[shared] -= 1
+            if not self._waiters[shared]:
+                del self._waiters[shared]
+                if not shared.done():
+                    shared.cancel()
+                    self._forget(key, shared)
+
+    def _forget(self, key: str, search: asyncio.Future) -> None:
+        """ Drop a finished or abandoned search, unless a newer one for the same query replaced it """
+        if self._searches.get(key) is search:
+            del self._searches[key]
+
+    async def _search(self, item: WebSearchItem) -> SearchOutcome:
+        """ Run the search through the scheduler, serving it from the search cache when possible """
+        if self.search_cache is not None:
+            cached = await asyncio.to_thread(self.search_cache.get, item.query)
+            if cached is not None:
+                return SearchOutcome(item.query, cached, cached=True)
+        input = f"Search term: {item.query}\nReason for searching: {item.reason}"
+
+        async def call() -> str:
             result = await Runner.run(
                 search_agent,
                 input,
             )
             return str(result.final_output)
-        except Exception:
-            return None
+
+        outcome = await self.scheduler.run(item.query, call)
+        if outcome.ok and self.search_cache is not None:
+            await asyncio.to_thread(self.search_cache.put, item.query, outcome.result)
+        return outcome
+
+    async def research_pipelined(self, query: str, search_plan: WebSearchPlan):
+        """ Search and draft sections concurrently, yielding status updates and finally the ReportData.
+
+        Each search result is handed to the section writer as soon as it arrives. Searches still
+        running at the straggler deadline are cancelled, counted as failed with error "deadline",
+        and the report goes ahead without them; sections that fail to draft are reported and skipped.
+        """
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        deadline = started + self.straggler_deadline if self.straggler_deadline is not None else None
+        queries = {asyncio.create_task(self.search(item)): item.query for item in unique_searches(search_plan)}
+        pending = {task: "search" for task in queries}
+        num_searches = len(pending)
+        searches_done = 0
+        outcomes = []
+        sections = []
+        section_errors = []
+        while pending:
+            searching = "search" in pending.values()
+            timeout = max(deadline - loop.time(), 0) if searching and deadline is not None else None
+            done, _ = await asyncio.wait(pending, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+            if not done:
+                late = [task for task, kind in pending.items() if kind == "search"]
+                for task in late:
+                    task.cancel()
+                    del pending[task]
+                    outcomes.append(SearchOutcome(queries[task], error="deadline", latency=loop.time() - started))
+                yield f"Straggler deadline reached, continuing without {len(late)} late search(es)..."
+                continue
+            for task in done:
+                kind = pending.pop(task)
+                if kind == "search":
+                    searches_done += 1
+                    outcome = task.result()
+                    outcomes.append(outcome)
+                    if outcome.ok:
+                        pending[asyncio.create_task(self.write_section(query, outcome.result))] = "section"
+                    yield (f"Search {searches_done}/{num_searches} done after {loop.time() - started:.1f}s "
+                           f"({describe(outcome)}), drafting sections...")
+                elif task.exception() is not None:
+                    exc = task.exception()
+                    section_errors.append(f"{type(exc).__name__}: {exc}")
+                    yield f"Section draft failed ({section_errors[-1]}), continuing without it..."
+                else:
+                    section = task.result()
+                    sections.append(section)
+                    if len(sections) == 1:
+                        yield f"First section written after {loop.time() - started:.1f}s: {section.title}"
+                    else:
+                        yield f"Section {len(sections)} written: {section.title}"
+        yield f"Searches: {summarize(outcomes)}"
+        failed = f", {len(section_errors)} failed" if section_errors else ""
+        yield f"{len(sections)} sections drafted{failed}, writing report..."
+        yield await self.write_report(query, [f"## {s.title}\n\n{s.markdown_section}" for s in sections])
+
+    async def write_section(self, query: str, search_result: str) -> SectionData:
+        """ Draft one report section from a single search result """
+        input = f"Original query: {query}\nSearch result: {search_result}"
+        result = await Runner.run(
+            section_writer_agent,
+            input,
+        )
+        return result.final_output_as(SectionData)
 
     async def write_report(self, query: str, search_results: list[str]) -> ReportData:
         """ Write the report for the query """
@@ -91,4 +208,16 @@ class ResearchManager:
             report.markdown_report,
         )
         print("Email sent")
-        return report
\ No newline at end of file
+        return report
+
+
+def unique_searches(search_plan: WebSearchPlan) -> list[WebSearchItem]:
+    """ The plan's searches with repeated queries (by query_key) dropped, keeping the first of each """
+    seen = set()
+    unique = []
+    for item in search_plan.searches:
+        key = query_key(item.query)
+        if key not in seen:
+            seen.add(key)
+            unique.append(item)
+    return unique
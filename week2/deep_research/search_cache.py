@@ -0,0 +1,141 @@
+import hashlib
+import math
+import re
+import sqlite3
+import threading
+import time
+from array import array
+from operator import mul
+from typing import Callable
+
+Embedder = Callable[[str], list[float]]
+
+
+def normalize_query(query: str) -> str:
+    """ Case-fold, drop punctuation and collapse whitespace, so trivially different queries share a key """
+    return " ".join(re.sub(r"[^\w\s]", " ", query.casefold()).split())
+
+
+def number_tokens(query: str) -> str:
+    """ The query's tokens containing digits, sorted; near-duplicates must agree on these exactly """
+    return " ".join(sorted(token for token in normalize_query(query).split() if any(ch.isdigit() for ch in token)))
+
+
+def query_key(query: str) -> str:
+    """ Content address of a search: the SHA-256 of its normalized query """
+    return hashlib.sha256(normalize_query(query).encode()).hexdigest()
+
+
+def hashed_ngram_embedding(text: str, dims: int = 256) -> list[float]:
+    """ Cheap local embedding: hashed character trigrams of the normalized text, L2-normalized.
+
+    Needs no model call, and catches reworded or reordered queries that share most of their words.
+    """
+    text = f" {normalize_query(text)} "
+    vector = [0.0] * dims
+    for i in range(len(text) - 2):
+        digest = hashlib.blake2b(text[i:i + 3].encode(), digest_size=4).digest()
+        vector[int.from_bytes(digest, "little") % dims] += 1.0
+    norm = math.sqrt(sum(v * v for v in vector)) or 1.0
+    return [v / norm for v in vector]
+
+
+class SearchCache:
+    """ Persistent SQLite cache of search summaries keyed by normalized query hash.
+
+    Exact hits are a primary-key lookup. When an embedder is given, a miss falls back to the
+    most similar cached query whose cosine similarity is at least similarity_threshold and
+    whose numbers (years, prices, versions) are exactly the same, so "... 2024" never answers
+    "... 2025". That fallback scans the candidate rows, so call get and put off the event loop.
+    Entries older than ttl seconds are ignored and purged; beyond max_entries the least
+    recently used entries are evicted.
+    """
+
+    schema_version = 2
+
+    def __init__(self, path: str = "search_cache.sqlite3", ttl: float = 7 * 24 * 3600, max_entries: int = 5000,
+                 embedder: Embedder | None = None, similarity_threshold: float = 0.95):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.embedder = embedder
+        self.similarity_threshold = similarity_threshold
+        self.hits = 0
+        self.near_hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        if self._db.execute("PRAGMA user_version").fetchone()[0] != self.schema_version:
+            self._db.execute("DROP TABLE IF EXISTS searches")  # it is only a cache
+            self._db.execute(f"PRAGMA user_version = {self.schema_version}")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS searches ("
+            "key TEXT PRIMARY KEY, query TEXT NOT NULL, result TEXT NOT NULL, numbers TEXT NOT NULL, "
+            "created REAL NOT NULL, last_used REAL NOT NULL, embedding BLOB)"
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS searches_last_used ON searches (last_used)")
+        self._db.commit()
+
+    def get(self, query: str) -> str | None:
+        """ Return the cached result for the query, or a near-duplicate's when similarity lookup is on """
+        now = time.time()
+        with self._lock:
+            row = self._db.execute(
+                "SELECT key, result FROM searches WHERE key = ? AND created >= ?", (query_key(query), now - self.ttl)
+            ).fetchone()
+            if row is None and self.embedder is not None:
+                row = self._nearest(query, now)
+                if row is not None:
+                    self.near_hits += 1
+            elif row is not None:
+                self.hits += 1
+            if row is None:
+                self.misses += 1
+                return None
+            self._db.execute("UPDATE searches SET last_used = ? WHERE key = ?", (now, row[0]))
+            self._db.commit()
+            return row[1]
+
+    def _nearest(self, query: str, now: float) -> tuple[str, str] | None:
+        target = self.embedder(query)
+        best, best_score = None, self.similarity_threshold
+        rows = self._db.execute(
+            "SELECT key, result, embedding FROM searches WHERE embedding IS NOT NULL AND numbers = ? AND created >= ?",
+            (number_tokens(query), now - self.ttl),
+        )
+        for key, result, blob in rows:
+            vector = array("f")
+            vector.frombytes(blob)
+            score = sum(map(mul, target, vector))
+            if score >= best_score:
+                best, best_score = (key, result), score
+        return best
+
+    def put(self, query: str, result: str) -> None:
+        """ Store a search result, then purge expired entries and evict down to max_entries """
+        now = time.time()
+        embedding = array("f", self.embedder(query)).tobytes() if self.embedder is not None else None
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO searches (key, query, result, numbers, created, last_used, embedding) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (query_key(query), query, result, number_tokens(query), now, now, embedding),
+            )
+            self._db.execute("DELETE FROM searches WHERE created < ?", (now - self.ttl,))
+            self._db.execute(
+                "DELETE FROM searches WHERE key IN ("
+                "SELECT key FROM searches ORDER BY last_used DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,),
+            )
+            self._db.commit()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._db.execute("SELECT COUNT(*) FROM searches").fetchone()[0]
+
+    def stats(self) -> dict[str, int]:
+        return {"hits": self.hits, "near_hits": self.near_hits, "misses": self.misses, "size": len(self)}
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
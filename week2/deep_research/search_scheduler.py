@@ -0,0 +1,135 @@
+import asyncio
+import random
+import time
+from dataclasses import dataclass
+from typing import Awaitable, Callable
+
+TRANSPORT_ERRORS: tuple[type[BaseException], ...] = (ConnectionError, TimeoutError, asyncio.TimeoutError)
+try:
+    import httpx
+    TRANSPORT_ERRORS += (httpx.TransportError,)
+except ImportError:
+    pass
+try:
+    import openai
+    TRANSPORT_ERRORS += (openai.APIConnectionError,)  # includes APITimeoutError
+except ImportError:
+    pass
+
+
+class TokenBucket:
+    """ Allows rate calls per second on average, with bursts of up to capacity calls """
+
+    def __init__(self, rate: float, capacity: float | None = None):
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(rate, 1.0)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self) -> None:
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+
+@dataclass
+class SearchOutcome:
+    """ What happened to one scheduled search """
+    query: str
+    result: str | None = None
+    error: str | None = None
+    attempts: int = 0
+    latency: float = 0.0
+    cached: bool = False
+
+    @property
+    def ok(self) -> bool:
+        return self.result is not None
+
+
+def is_retryable(exc: BaseException) -> bool:
+    """ Retry rate limits (429), server errors (5xx) and transport failures; anything else is a real failure """
+    status = getattr(exc, "status_code", None) or getattr(getattr(exc, "response", None), "status_code", None)
+    if isinstance(status, int):
+        return status == 429 or status >= 500
+    return isinstance(exc, TRANSPORT_ERRORS)
+
+
+def describe(outcome: SearchOutcome) -> str:
+    """ Short status for one search, e.g. "'query' ok in 2.3s, 2 attempts" """
+    if outcome.cached:
+        return f"{outcome.query!r} from cache"
+    status = "ok" if outcome.ok else f"failed ({outcome.error})"
+    attempts = f", {outcome.attempts} attempts" if outcome.attempts > 1 else ""
+    return f"{outcome.query!r} {status} in {outcome.latency:.1f}s{attempts}"
+
+
+def summarize(outcomes: list[SearchOutcome]) -> str:
+    """ One-line status: successes, failures, retries, cache hits and latency percentiles """
+    if not outcomes:
+        return "no searches"
+    ok = sum(outcome.ok for outcome in outcomes)
+    retries = sum(max(outcome.attempts - 1, 0) for outcome in outcomes)
+    cached = sum(outcome.cached for outcome in outcomes)
+    latencies = sorted(outcome.latency for outcome in outcomes)
+    p50 = latencies[len(latencies) // 2]
+    p95 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))]
+    return (f"{ok}/{len(outcomes)} ok, {len(outcomes) - ok} failed, {retries} retries, "
+            f"{cached} cached, p50 {p50:.1f}s, p95 {p95:.1f}s")
+
+
+class SearchScheduler:
+    """ Runs searches with bounded concurrency, a token-bucket rate limit and jittered exponential retries.
+
+    At most concurrency calls are in flight, and new attempts start at no more than rate per second.
+    Failed attempts back off by a random delay up to base_delay * 2**attempt (capped at max_delay) and
+    are retried up to max_attempts in total, as long as the global retry budget allows: across the
+    scheduler's lifetime, retries may not exceed min_retries plus retry_ratio of the searches submitted.
+    """
+
+    def __init__(self, concurrency: int = 5, rate: float = 2.0, burst: float | None = None, max_attempts: int = 4,
+                 base_delay: float = 1.0, max_delay: float = 30.0, retry_ratio: float = 0.5, min_retries: int = 3):
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.retry_ratio = retry_ratio
+        self.min_retries = min_retries
+        self.submitted = 0
+        self.retries = 0
+        self._semaphore = asyncio.Semaphore(concurrency)
+        self._bucket = TokenBucket(rate, burst)
+
+    def _may_retry(self) -> bool:
+        return self.retries < self.min_retries + self.retry_ratio * self.submitted
+
+    async def run(self, query: str, call: Callable[[], Awaitable[str]]) -> SearchOutcome:
+        """ Run call under the scheduler's limits; failures are reported in the outcome rather than raised """
+        self.submitted += 1
+        outcome = SearchOutcome(query)
+        started = time.monotonic()
+        while True:
+            outcome.attempts += 1
+            async with self._semaphore:
+                await self._bucket.acquire()
+                try:
+                    outcome.result = await call()
+                    outcome.error = None
+                except Exception as exc:
+                    outcome.error = f"{type(exc).__name__}: {exc}"
+                    retry = is_retryable(exc)
+                else:
+                    break
+            if not retry or outcome.attempts >= self.max_attempts or not self._may_retry():
+                break
+            self.retries += 1
+            delay = min(self.max_delay, self.base_delay * 2 ** (outcome.attempts - 1))
+            await asyncio.sleep(random.uniform(0, delay))
+        outcome.latency = time.monotonic() - started
+        return outcome
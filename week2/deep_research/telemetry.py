@@ -0,0 +1,101 @@
+import atexit
+import os
+import threading
+
+_lock = threading.Lock()
+_telemetry = None
+
+
+class Telemetry:
+    """ The process-wide tracing setup created by init_telemetry.
+
+    exporter is "otlp" (logfire exports to the OTLP endpoint in the environment, i.e. Langfuse),
+    "none" (tracing is not instrumented at all), "memory" (spans are kept in-process, for tests)
+    or "file:<path>" (spans are appended to a local file as JSON lines). The memory and file
+    exporters strip the OTEL_EXPORTER_OTLP_* variables from the environment first, so logfire
+    never also ships those spans to the OTLP endpoint.
+    """
+
+    def __init__(self, service_name: str, exporter: str):
+        self.service_name = service_name
+        self.exporter = exporter
+        self._memory = None
+        self._file = None
+        self._auth_ok = None
+        self._auth_thread = None
+
+    def _configure(self) -> None:
+        if self.exporter not in ("none", "otlp", "memory") and not self.exporter.startswith("file:"):
+            raise ValueError(f"Unknown telemetry exporter: {self.exporter}")
+        if self.exporter == "none":
+            return
+        import logfire
+        processors = []
+        if self.exporter != "otlp":
+            for name in [name for name in os.environ if name.startswith("OTEL_EXPORTER_OTLP_")]:
+                del os.environ[name]
+        if self.exporter == "memory":
+            from opentelemetry.sdk.trace.export import SimpleSpanProcessor
+            from opentelemetry.sdk.trace.export.in_memory_span_exporter import InMemorySpanExporter
+            self._memory = InMemorySpanExporter()
+            processors.append(SimpleSpanProcessor(self._memory))
+        elif self.exporter.startswith("file:"):
+            from opentelemetry.sdk.trace.export import ConsoleSpanExporter, SimpleSpanProcessor
+            self._file = open(self.exporter[len("file:"):], "a", encoding="utf-8")
+            atexit.register(self.close)  # registered before logfire's own shutdown hook, so it runs after it
+            processors.append(SimpleSpanProcessor(ConsoleSpanExporter(out=self._file, formatter=lambda span: span.to_json(indent=None) + "\n")))
+        logfire.configure(
+            service_name=self.service_name,
+            send_to_logfire=False,
+            additional_span_processors=processors or None,
+        )
+        logfire.instrument_openai_agents()
+        if self.exporter == "otlp":
+            self._auth_thread = threading.Thread(target=self._check_auth, name="langfuse-auth-check", daemon=True)
+            self._auth_thread.start()
+
+    def _check_auth(self) -> None:
+        try:
+            from langfuse import get_client
+            self._auth_ok = bool(get_client().auth_check())
+        except Exception as exc:
+            print(f"Langfuse auth check failed: {exc}")
+            self._auth_ok = False
+            return
+        if self._auth_ok:
+            print("Langfuse client is authenticated and ready!")
+        else:
+            print("Langfuse authentication failed. Please check your credentials and host.")
+
+    def auth_ok(self, timeout: float | None = 0) -> bool | None:
+        """ Result of the background Langfuse auth check, or None while it is still running (or not applicable) """
+        if self._auth_thread is not None:
+            self._auth_thread.join(timeout)
+        return self._auth_ok
+
+    def close(self) -> None:
+        """ Close the "file" exporter's output file """
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def spans(self) -> list:
+        """ Finished spans captured by the "memory" exporter """
+        return list(self._memory.get_finished_spans()) if self._memory is not None else []
+
+
+def init_telemetry(service_name: str = "Deep Research", exporter: str | None = None) -> Telemetry:
+    """ Configure tracing once per process and return the shared Telemetry; later calls are no-ops.
+
+    The exporter defaults to the TELEMETRY_EXPORTER environment variable, then "otlp". The Langfuse
+    auth check runs on a background thread, so nothing here waits on the network.
+    """
+    global _telemetry
+    if _telemetry is not None:
+        return _telemetry
+    with _lock:
+        if _telemetry is None:
+            telemetry = Telemetry(service_name, exporter or os.getenv("TELEMETRY_EXPORTER") or "otlp")
+            telemetry._configure()
+            _telemetry = telemetry
+    return _telemetry
@@ -0,0 +1,91 @@
+import asyncio
+import json
+
+import pytest
+
+pytest.importorskip("agents")
+pytest.importorskip("pydantic")
+pytest.importorskip("sendgrid")
+
+from batch_research import ProgressJournal, run_batch
+from planner_agent import WebSearchItem, WebSearchPlan
+from search_cache import query_key
+from writer_agent import ReportData
+
+
+class Interrupted(BaseException):
+    """Stands in for the process dying mid-batch: it is not an Exception, so nothing journals it."""
+
+
+class FakeManager:
+    """Stands in for ResearchManager: plans one search per query and reports on it, failing or dying on request."""
+
+    def __init__(self, failing=(), interrupting=()):
+        self.failing = failing
+        self.interrupting = interrupting
+        self.planned = []
+        self.researched = []
+
+    async def plan_searches(self, query):
+        self.planned.append(query)
+        return WebSearchPlan(searches=[WebSearchItem(reason="reason", query=f"{query} search")])
+
+    async def research(self, query, search_plan):
+        self.researched.append((query, [item.query for item in search_plan.searches]))
+        if query in self.interrupting:
+            raise Interrupted()
+        if query in self.failing:
+            raise RuntimeError("search failed")
+        yield "Searches planned, starting to search..."
+        yield ReportData(short_summary="summary", markdown_report=f"# {query}", follow_up_questions=[])
+
+
+def batch(tmp_path, queries, manager, **kwargs):
+    return asyncio.run(run_batch(queries, str(tmp_path / "reports"), str(tmp_path / "progress.jsonl"),
+                                 manager=manager, **kwargs))
+
+
+class TestProgressJournal:
+    def test_torn_last_line_is_ignored_and_not_appended_to(self, tmp_path):
+        path = tmp_path / "progress.jsonl"
+        done = {"key": query_key("first"), "query": "first", "status": "done", "report": "first.md"}
+        path.write_text(json.dumps(done) + "\n" + '{"key": "abc", "query": "sec', encoding="utf-8")
+        journal = ProgressJournal(str(path))
+        assert journal.status("first") == "done"
+        assert journal.status("second") is None
+        journal.record("second", "failed", error="RuntimeError: boom")
+        journal.close()
+        reopened = ProgressJournal(str(path))
+        assert reopened.status("first") == "done"
+        assert reopened.status("second") == "failed"
+        reopened.close()
+
+
+class TestRunBatch:
+    def test_resumes_after_interruption_with_the_journaled_plan(self, tmp_path):
+        first = FakeManager(interrupting=("second",))
+        with pytest.raises(Interrupted):
+            batch(tmp_path, ["first", "second"], first, concurrency=1)
+        assert first.planned == ["first", "second"]
+
+        second = FakeManager()
+        totals = batch(tmp_path, ["first", "second"], second)
+        assert totals == {"skipped": 1, "done": 1, "failed": 0}
+        assert second.planned == []
+        assert second.researched == [("second", ["second search"])]
+        assert sorted(p.read_text() for p in (tmp_path / "reports").glob("*.md")) == ["# first", "# second"]
+
+    def test_skips_handled_queries_unless_retrying_failures(self, tmp_path):
+        totals = batch(tmp_path, ["good", "bad"], FakeManager(failing=("bad",)))
+        assert totals == {"skipped": 0, "done": 1, "failed": 1}
+
+        manager = FakeManager()
+        totals = batch(tmp_path, ["good", "bad", "new"], manager)
+        assert totals == {"skipped": 2, "done": 1, "failed": 0}
+        assert [query for query, _ in manager.researched] == ["new"]
+
+        manager = FakeManager()
+        totals = batch(tmp_path, ["good", "bad", "new"], manager, retry_failed=True)
+        assert totals == {"skipped": 2, "done": 1, "failed": 0}
+        assert [query for query, _ in manager.researched] == ["bad"]
+        assert manager.planned == []
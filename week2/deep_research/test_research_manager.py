@@ -0,0 +1,144 @@
+import asyncio
+
+import pytest
+
+pytest.importorskip("agents")
+pytest.importorskip("pydantic")
+pytest.importorskip("sendgrid")
+
+import research_manager
+from planner_agent import WebSearchItem, WebSearchPlan
+from research_manager import ResearchManager
+from search_scheduler import SearchScheduler
+from writer_agent import ReportData, SectionData
+
+
+class Result:
+    def __init__(self, output):
+        self.final_output = output
+
+    def final_output_as(self, cls):
+        return self.final_output
+
+
+class FakeRunner:
+    """Stands in for agents.Runner: searches sleep for their query's delay, sections and reports return at once."""
+
+    def __init__(self, delays, failing_sections=()):
+        self.delays = delays
+        self.failing_sections = failing_sections
+        self.searches = []
+        self.sections = []
+        self.cancelled = []
+
+    async def run(self, agent, input):
+        if agent is research_manager.search_agent:
+            query = input.split("\n")[0].removeprefix("Search term: ")
+            self.searches.append(query)
+            try:
+                await asyncio.sleep(self.delays[query])
+            except asyncio.CancelledError:
+                self.cancelled.append(query)
+                raise
+            return Result(f"summary of {query}")
+        if agent is research_manager.section_writer_agent:
+            result = input.split("Search result: ")[1]
+            self.sections.append(result)
+            if result in self.failing_sections:
+                raise RuntimeError(f"could not draft {result}")
+            return Result(SectionData(title=result, markdown_section="body"))
+        if agent is research_manager.writer_agent:
+            return Result(ReportData(short_summary="summary", markdown_report=input, follow_up_questions=[]))
+        raise AssertionError(f"unexpected agent {agent.name}")
+
+
+def plan(*queries):
+    return WebSearchPlan(searches=[WebSearchItem(reason="reason", query=query) for query in queries])
+
+
+def manager(**kwargs):
+    return ResearchManager(scheduler=SearchScheduler(rate=1000), **kwargs)
+
+
+async def collect(updates):
+    return [update async for update in updates]
+
+
+@pytest.fixture
+def runner(monkeypatch):
+    def install(delays, **kwargs):
+        fake = FakeRunner(delays, **kwargs)
+        monkeypatch.setattr(research_manager, "Runner", fake)
+        return fake
+    return install
+
+
+class TestSearch:
+    def test_duplicate_queries_in_a_plan_run_once(self, runner):
+        fake = runner({"AI chips": 0.01})
+        updates = asyncio.run(collect(manager(pipelined=True).research("topic", plan("AI chips", "ai  chips"))))
+        assert fake.searches == ["AI chips"]
+        assert fake.sections == ["summary of AI chips"]
+        assert updates[0] == "Searches planned, starting to search..."
+        assert updates[1].startswith("Search 1/1 done")
+
+    def test_cancelling_every_waiter_cancels_the_search(self, runner):
+        fake = runner({"slow": 10})
+
+        async def main():
+            research = manager()
+            item = plan("slow").searches[0]
+            first = asyncio.create_task(research.search(item))
+            second = asyncio.create_task(research.search(item))
+            await asyncio.sleep(0.01)
+            first.cancel()
+            await asyncio.sleep(0.01)
+            # The other caller still wants the result.
+            assert fake.cancelled == []
+            second.cancel()
+            await asyncio.sleep(0.01)
+            return research
+
+        research = asyncio.run(main())
+        assert fake.searches == ["slow"]
+        assert fake.cancelled == ["slow"]
+        assert research._searches == {} and research._waiters == {}
+
+
+class TestResearchPipelined:
+    def test_deadline_cancels_late_searches(self, runner):
+        fake = runner({"fast": 0.01, "slow": 10})
+
+        async def main():
+            research = manager(pipelined=True, straggler_deadline=0.2)
+            updates = await collect(research.research("topic", plan("fast", "slow")))
+            await asyncio.sleep(0.01)
+            return updates, list(fake.cancelled)
+
+        updates, cancelled = asyncio.run(main())
+        assert "Straggler deadline reached, continuing without 1 late search(es)..." in updates
+        assert cancelled == ["slow"]
+        assert updates[-3].startswith("Searches: 1/2 ok, 1 failed")
+        assert updates[-2] == "1 sections drafted, writing report..."
+        assert "## summary of fast" in updates[-1].markdown_report
+
+    def test_failed_section_is_reported_and_skipped(self, runner):
+        runner({"good": 0.01, "bad": 0.02}, failing_sections=("summary of bad",))
+        updates = asyncio.run(collect(manager(pipelined=True).research("topic", plan("good", "bad"))))
+        assert "Section draft failed (RuntimeError: could not draft summary of bad), continuing without it..." in updates
+        assert updates[-3].startswith("Searches: 2/2 ok")
+        assert updates[-2] == "1 sections drafted, 1 failed, writing report..."
+        report = updates[-1].markdown_report
+        assert "## summary of good" in report and "summary of bad" not in report
+
+    def test_updates_follow_completion_order(self, runner):
+        runner({"first": 0.01, "second": 0.2})
+        updates = asyncio.run(collect(manager(pipelined=True).research("topic", plan("second", "first"))))
+        assert updates[0] == "Searches planned, starting to search..."
+        assert updates[1].startswith("Search 1/2 done") and "'first' ok" in updates[1]
+        assert updates[2].startswith("First section written") and updates[2].endswith("summary of first")
+        assert updates[3].startswith("Search 2/2 done") and "'second' ok" in updates[3]
+        assert updates[4] == "Section 2 written: summary of second"
+        assert updates[5].startswith("Searches: 2/2 ok")
+        assert updates[6] == "2 sections drafted, writing report..."
+        assert isinstance(updates[7], ReportData) and len(updates) == 8
@@ -0,0 +1,87 @@
+import pytest
+
+import search_cache
+from search_cache import SearchCache, hashed_ngram_embedding, normalize_query, number_tokens, query_key
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1_000_000.0
+
+    def __call__(self):
+        self.now += 1.0
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(search_cache.time, "time", clock)
+    return clock
+
+
+class TestKeys:
+    def test_normalization(self):
+        assert normalize_query("  Latest AI agent-frameworks,  2025!\n") == "latest ai agent frameworks 2025"
+        assert query_key("Latest AI agent frameworks 2025") == query_key("latest ai  agent frameworks, 2025!")
+        assert query_key("AI agent frameworks 2024") != query_key("AI agent frameworks 2025")
+
+    def test_number_tokens(self):
+        assert number_tokens("laptops under 1000 dollars in 2025") == "1000 2025"
+        assert number_tokens("python 3.12 release") == "12 3"
+        assert number_tokens("no numbers here") == ""
+
+
+class TestSearchCache:
+    def test_exact_hit_and_miss(self, tmp_path):
+        cache = SearchCache(str(tmp_path / "cache.sqlite3"))
+        cache.put("Latest AI agent frameworks", "summary")
+        assert cache.get("latest ai agent frameworks?") == "summary"
+        assert cache.get("history of rome") is None
+        assert cache.stats() == {"hits": 1, "near_hits": 0, "misses": 1, "size": 1}
+
+    def test_persists_across_instances(self, tmp_path):
+        path = str(tmp_path / "cache.sqlite3")
+        first = SearchCache(path)
+        first.put("quantum computing", "summary")
+        first.close()
+        assert SearchCache(path).get("Quantum computing") == "summary"
+
+    def test_ttl_expiry(self, clock):
+        cache = SearchCache(":memory:", ttl=10)
+        cache.put("old query", "stale")
+        clock.now += 20
+        assert cache.get("old query") is None
+        cache.put("new query", "fresh")
+        assert len(cache) == 1  # expired rows are purged on the next put
+
+    def test_lru_eviction(self, clock):
+        cache = SearchCache(":memory:", max_entries=2)
+        cache.put("a", "A")
+        cache.put("b", "B")
+        assert cache.get("a") == "A"  # a is now more recently used than b
+        cache.put("c", "C")
+        assert len(cache) == 2
+        assert cache.get("b") is None
+        assert cache.get("a") == "A"
+        assert cache.get("c") == "C"
+
+    def test_near_hits(self):
+        cache = SearchCache(":memory:", embedder=hashed_ngram_embedding)
+        cache.put("latest AI agent frameworks", "summary")
+        assert cache.get("AI agent frameworks latest") == "summary"
+        assert cache.get("apple stock prices") is None
+        assert cache.stats()["near_hits"] == 1
+
+    def test_near_hits_require_the_same_numbers(self):
+        cache = SearchCache(":memory:", embedder=hashed_ngram_embedding, similarity_threshold=0.5)
+        cache.put("AI agent frameworks 2024", "2024 summary")
+        cache.put("best laptops under 1000 dollars", "cheap laptops")
+        assert cache.get("AI agent frameworks 2025") is None
+        assert cache.get("best laptops under 2000 dollars") is None
+        assert cache.get("frameworks for AI agents 2024") == "2024 summary"
+
+    def test_near_hits_are_off_without_an_embedder(self):
+        cache = SearchCache(":memory:")
+        cache.put("latest AI agent frameworks", "summary")
+        assert cache.get("AI agent frameworks latest") is None
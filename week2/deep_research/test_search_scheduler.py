@@ -0,0 +1,119 @@
+import asyncio
+import time
+
+from search_scheduler import SearchOutcome, SearchScheduler, TokenBucket, describe, is_retryable, summarize
+
+
+class StatusError(Exception):
+    def __init__(self, status_code):
+        super().__init__(f"status {status_code}")
+        self.status_code = status_code
+
+
+def flaky(failures):
+    """A search call that raises the given exceptions in turn, then succeeds."""
+    calls = []
+
+    async def call():
+        calls.append(time.monotonic())
+        if len(calls) <= len(failures):
+            raise failures[len(calls) - 1]
+        return "result"
+    return call, calls
+
+
+class TestTokenBucket:
+    def test_burst_then_rate(self):
+        async def main():
+            bucket = TokenBucket(rate=50, capacity=5)
+            started = time.monotonic()
+            for _ in range(5):
+                await bucket.acquire()
+            burst = time.monotonic() - started
+            for _ in range(5):
+                await bucket.acquire()
+            return burst, time.monotonic() - started
+
+        burst, total = asyncio.run(main())
+        assert burst < 0.05
+        assert total >= 5 / 50 * 0.9
+
+
+class TestRetryable:
+    def test_classification(self):
+        assert is_retryable(StatusError(429))
+        assert is_retryable(StatusError(503))
+        assert is_retryable(ConnectionResetError())
+        assert is_retryable(asyncio.TimeoutError())
+        assert not is_retryable(StatusError(400))
+        assert not is_retryable(TypeError("bad argument"))
+        assert not is_retryable(ValueError("model output did not parse"))
+
+
+class TestSearchScheduler:
+    def scheduler(self, **kwargs):
+        return SearchScheduler(rate=1000, base_delay=0.001, max_delay=0.01, **kwargs)
+
+    def test_retries_transient_failures(self):
+        call, calls = flaky([StatusError(429), StatusError(502)])
+        scheduler = self.scheduler()
+        outcome = asyncio.run(scheduler.run("q", call))
+        assert outcome.ok and outcome.result == "result"
+        assert outcome.attempts == 3 and len(calls) == 3
+        assert scheduler.retries == 2
+
+    def test_does_not_retry_other_errors(self):
+        call, calls = flaky([TypeError("bug")])
+        outcome = asyncio.run(self.scheduler().run("q", call))
+        assert not outcome.ok
+        assert outcome.attempts == 1 and len(calls) == 1
+        assert outcome.error == "TypeError: bug"
+
+    def test_gives_up_after_max_attempts(self):
+        call, calls = flaky([StatusError(500)] * 10)
+        outcome = asyncio.run(self.scheduler(max_attempts=3).run("q", call))
+        assert not outcome.ok and len(calls) == 3
+
+    def test_retry_budget_is_shared(self):
+        scheduler = self.scheduler(retry_ratio=0.0, min_retries=2)
+
+        async def main():
+            calls = [flaky([StatusError(429)] * 10) for _ in range(3)]
+            return await asyncio.gather(*(scheduler.run(f"q{i}", call) for i, (call, _) in enumerate(calls)))
+
+        outcomes = asyncio.run(main())
+        assert scheduler.retries == 2
+        assert sum(outcome.attempts for outcome in outcomes) == 3 + 2
+
+    def test_concurrency_is_bounded(self):
+        scheduler = self.scheduler(concurrency=2)
+        running, peak = 0, 0
+
+        async def call():
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.01)
+            running -= 1
+            return "ok"
+
+        async def main():
+            return await asyncio.gather(*(scheduler.run(f"q{i}", call) for i in range(6)))
+
+        assert all(outcome.ok for outcome in asyncio.run(main()))
+        assert peak == 2
+
+
+class TestMetrics:
+    def test_describe_and_summarize(self):
+        outcomes = [
+            SearchOutcome("a", "x", attempts=1, latency=1.0),
+            SearchOutcome("b", "y", attempts=3, latency=3.0),
+            SearchOutcome("c", error="StatusError: status 400", attempts=1, latency=0.5),
+            SearchOutcome("d", "z", cached=True),
+        ]
+        assert describe(outcomes[1]) == "'b' ok in 3.0s, 3 attempts"
+        assert describe(outcomes[2]) == "'c' failed (StatusError: status 400) in 0.5s"
+        assert describe(outcomes[3]) == "'d' from cache"
+        assert summarize(outcomes) == "3/4 ok, 1 failed, 2 retries, 1 cached, p50 1.0s, p95 3.0s"
+        assert summarize([]) == "no searches"
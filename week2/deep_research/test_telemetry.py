@@ -0,0 +1,36 @@
+import os
+
+import pytest
+
+import telemetry
+from telemetry import Telemetry, init_telemetry
+
+
+def test_none_exporter_is_configured_once(monkeypatch):
+    monkeypatch.setattr(telemetry, "_telemetry", None)
+    first = init_telemetry("telemetry test", exporter="none")
+    assert init_telemetry("another service", exporter="memory") is first
+    assert first.exporter == "none" and first.service_name == "telemetry test"
+    assert first.spans() == [] and first.auth_ok() is None
+
+
+def test_unknown_exporter_is_rejected_before_touching_the_environment(monkeypatch):
+    monkeypatch.setattr(telemetry, "_telemetry", None)
+    monkeypatch.setenv("OTEL_EXPORTER_OTLP_ENDPOINT", "http://localhost:4318")
+    with pytest.raises(ValueError, match="Unknown telemetry exporter: jaeger"):
+        init_telemetry("telemetry test", exporter="jaeger")
+    assert os.environ["OTEL_EXPORTER_OTLP_ENDPOINT"] == "http://localhost:4318"
+    assert telemetry._telemetry is None
+
+
+def test_memory_exporter_captures_spans_without_otlp(monkeypatch):
+    logfire = pytest.importorskip("logfire")
+    monkeypatch.setenv("OTEL_EXPORTER_OTLP_ENDPOINT", "http://localhost:4318")
+    monkeypatch.setenv("OTEL_EXPORTER_OTLP_HEADERS", "Authorization=Basic secret")
+    telemetry = Telemetry("telemetry test", "memory")
+    telemetry._configure()
+    assert not any(name.startswith("OTEL_EXPORTER_OTLP_") for name in os.environ)
+    with logfire.span("research step"):
+        pass
+    assert "research step" in [span.name for span in telemetry.spans()]
+    assert telemetry.auth_ok() is None
@@ -24,4 +24,27 @@ writer_agent = Agent(
     instructions=INSTRUCTIONS,
     model="gpt-4o-mini",
     output_type=ReportData,
-)
\ No newline at end of file
+)
+
+SECTION_INSTRUCTIONS = (
+    "You are a senior researcher drafting one section of a larger report for a research query. "
+    "You will be provided with the original query and the summary of a single web search.\n"
+    "Write a focused markdown section (a few paragraphs, no top-level heading) covering what this "
+    "search contributes to answering the query, and give it a short descriptive title. "
+    "Other sections are being drafted in parallel from other searches, so do not write an "
+    "introduction or conclusion for the whole report."
+)
+
+
+class SectionData(BaseModel):
+    title: str = Field(description="A short title for the section.")
+
+    markdown_section: str = Field(description="The section body in markdown")
+
+
+section_writer_agent = Agent(
+    name="SectionWriterAgent",
+    instructions=SECTION_INSTRUCTIONS,
+    model="gpt-4o-mini",
+    output_type=SectionData,
+)
@@ -0,0 +1,142 @@
+import itertools
+import threading
+import time
+from contextlib import contextmanager
+
+from accounts import UserAccount
+
+
+class LatencyStats:
+    """Running count, total and max latency for one operation name."""
+    __slots__ = ('count', 'total', 'max')
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def record(self, elapsed):
+        self.count += 1
+        self.total += elapsed
+        if elapsed > self.max:
+            self.max = elapsed
+
+    def to_dict(self):
+        return {
+            'count': self.count,
+            'total_ms': self.total * 1000,
+            'mean_ms': self.total * 1000 / self.count if self.count else 0.0,
+            'max_ms': self.max * 1000
+        }
+
+
+class AccountRegistry:
+    """Thread-safe store of accounts indexed by id, username and email.
+
+    Ids are allocated atomically. Each account has its own lock, so operations
+    on different accounts run concurrently while operations on the same
+    account are serialized.
+    """
+    def __init__(self, account_class=UserAccount):
+        self.account_class = account_class
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+        self._by_id = {}
+        self._by_username = {}
+        self._by_email = {}
+        self._account_locks = {}
+        self._stats_lock = threading.Lock()
+        self._latency = {}
+
+    def create(self, username, password, email, balance=0.0, **kwargs):
+        """Creates and registers a new account, allocating the next user id."""
+        started = time.perf_counter()
+        with self._lock:
+            if username in self._by_username:
+                raise ValueError("Username already taken.")
+            if email in self._by_email:
+                raise ValueError("Email already registered.")
+            account = self.account_class(next(self._ids), username, password, email, balance, **kwargs)
+            self._register(account)
+        self._record('create', time.perf_counter() - started)
+        return account
+
+    def add(self, account):
+        """Registers an existing account, e.g. one restored with from_dict."""
+        with self._lock:
+            if account.user_id in self._by_id:
+                raise ValueError("User id already registered.")
+            if account.username in self._by_username:
+                raise ValueError("Username already taken.")
+            if account.email in self._by_email:
+                raise ValueError("Email already registered.")
+            self._register(account)
+            # Keep future ids clear of anything registered by hand.
+            next_id = next(self._ids)
+            self._ids = itertools.count(max(next_id, account.user_id + 1))
+        return account
+
+    def _register(self, account):
+        self._by_id[account.user_id] = account
+        self._by_username[account.username] = account
+        self._by_email[account.email] = account
+        self._account_locks[account.user_id] = threading.RLock()
+
+    def get(self, user_id):
+        """Returns the account with the given id."""
+        try:
+            return self._by_id[int(user_id)]
+        except (KeyError, TypeError, ValueError):
+            raise ValueError("Account not found.") from None
+
+    def get_by_username(self, username):
+        try:
+            return self._by_username[username]
+        except KeyError:
+            raise ValueError("Account not found.") from None
+
+    def get_by_email(self, email):
+        try:
+            return self._by_email[email]
+        except KeyError:
+            raise ValueError("Account not found.") from None
+
+    def lock_for(self, user_id):
+        """Returns the lock guarding the given account."""
+        return self._account_locks[self.get(user_id).user_id]
+
+    @contextmanager
+    def locked(self, user_id, operation):
+        """Holds the account's lock for the block and records the operation's latency."""
+        account = self.get(user_id)
+        lock = self._account_locks[account.user_id]
+        started = time.perf_counter()
+        try:
+            with lock:
+                yield account
+        finally:
+            self._record(operation, time.perf_counter() - started)
+
+    def _record(self, operation, elapsed):
+        with self._stats_lock:
+            stats = self._latency.get(operation)
+            if stats is None:
+                stats = self._latency[operation] = LatencyStats()
+            stats.record(elapsed)
+
+    def stats(self):
+        """Returns latency counters per operation name."""
+        with self._stats_lock:
+            return {operation: stats.to_dict() for operation, stats in self._latency.items()}
+
+    def __len__(self):
+        return len(self._by_id)
+
+    def __iter__(self):
+        return iter(list(self._by_id.values()))
+
+    def __contains__(self, user_id):
+        try:
+            return int(user_id) in self._by_id
+        except (TypeError, ValueError):
+            return False
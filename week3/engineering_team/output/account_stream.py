@@ -0,0 +1,83 @@
+import json
+from itertools import islice
+
+from accounts import UserAccount
+
+HEADER_FIELDS = ('user_id', 'username', 'password', 'email', 'balance', 'holdings')
+BATCH_SIZE = 1024
+
+
+def iter_jsonl(account, start=0):
+    """Yields the account as JSON Lines: a header line, then one line per transaction.
+
+    Transactions are encoded one at a time straight from the ledger, so memory
+    use does not grow with the history. start is the number of lines already
+    written, for appending to a partially written export.
+    """
+    if start == 0:
+        header = {field: getattr(account, field) for field in HEADER_FIELDS}
+        header['transaction_count'] = len(account.transactions)
+        yield json.dumps(header, separators=(',', ':')) + '\n'
+    history = account.get_transaction_history()
+    for position in range(max(start - 1, 0), len(history)):
+        yield json.dumps(dict(history[position]), separators=(',', ':')) + '\n'
+
+
+def dump_jsonl(account, fp):
+    """Writes the account to a text file object as JSON Lines; returns the number of lines."""
+    lines = 0
+    for line in iter_jsonl(account):
+        fp.write(line)
+        lines += 1
+    return lines
+
+
+def _iter_lines(source, offset):
+    """Yields (line_bytes, end_offset) for complete lines of a path, binary file or line iterable."""
+    if isinstance(source, str):
+        with open(source, 'rb') as f:
+            yield from _iter_lines(f, offset)
+        return
+    if hasattr(source, 'seek'):
+        source.seek(offset)
+    position = offset
+    for line in source:
+        if isinstance(line, str):
+            line = line.encode('utf-8')
+        if not line.endswith(b'\n'):
+            return  # incomplete trailing line; resume from here once it is written
+        position += len(line)
+        yield line, position
+
+
+def load_jsonl(source, ledger=None, account=None, offset=0):
+    """Rebuilds a UserAccount from JSON Lines in bounded memory.
+
+    source may be a path, a binary file object or an iterable of lines.
+    Transactions are appended to the ledger in fixed-size batches. Returns
+    (account, offset) where offset is the byte position after the last
+    complete line read; pass both back in to resume a partial load. When
+    resuming from an iterable, it must start at that offset.
+    """
+    lines = _iter_lines(source, offset)
+    end = offset
+    if account is None:
+        first = next(lines, None)
+        if first is None:
+            raise ValueError("Stream does not contain an account header.")
+        header, end = json.loads(first[0]), first[1]
+        account = UserAccount(
+            user_id=header['user_id'],
+            username=header['username'],
+            password=header['password'],
+            email=header['email'],
+            balance=header['balance'],
+            ledger=ledger
+        )
+        account.holdings = header['holdings']
+    while True:
+        batch = list(islice(lines, BATCH_SIZE))
+        if not batch:
+            return account, end
+        account.transactions.extend(json.loads(line) for line, _ in batch)
+        end = batch[-1][1]
@@ -0,0 +1,15 @@
+"""Account domain core shared by the API, the Gradio app and the tests.
+
+Only the core and its pure-Python dependencies are imported here; NumPy-backed
+helpers (accounts.valuation) load on first use, keeping `import accounts` fast.
+"""
+from .core import Transaction, UserAccount
+from .ledger import ListLedger, MmapLedger
+from .money import MONEY_SCALE
+from .prices import get_share_price
+from .records import TransactionRecord, TransactionType
+
+__all__ = [
+    'MONEY_SCALE', 'ListLedger', 'MmapLedger', 'Transaction', 'TransactionRecord', 'TransactionType',
+    'UserAccount', 'get_share_price',
+]
@@ -0,0 +1,48 @@
+"""Example usage: python -m accounts"""
+import json
+
+from accounts import UserAccount, get_share_price
+
+account1 = UserAccount(user_id=1, username='john_doe', password='password123', email='john@example.com', balance=1000.0)
+
+# Deposit
+account1.deposit(500.0)
+print(f"Balance after deposit: {account1.balance}")
+
+# Buy shares
+account1.buy_shares('AAPL', 5, get_share_price)
+print(f"Balance after buying 5 AAPL shares: {account1.balance}")
+print(f"Holdings: {account1.holdings}")
+
+# Sell shares
+account1.sell_shares('AAPL', 2, get_share_price)
+print(f"Balance after selling 2 AAPL shares: {account1.balance}")
+print(f"Holdings: {account1.holdings}")
+
+# Portfolio Value
+portfolio_value = account1.get_portfolio_value(get_share_price)
+print(f"Portfolio value: {portfolio_value}")
+
+# Profit/Loss
+profit_loss = account1.get_profit_loss(1000.0) # Initial deposit of 1000
+print(f"Profit/Loss: {profit_loss}")
+
+# Transaction History
+print(f"Transaction history: {account1.get_transaction_history()}")
+
+# Serialize to JSON
+account_dict = account1.to_dict()
+account_json = json.dumps(account_dict, indent=4)
+print(f"Serialized account: {account_json}")
+
+# Deserialize from JSON
+account2 = UserAccount.from_dict(json.loads(account_json))
+print(f"Deserialized account balance: {account2.balance}")
+
+# Additional test case for profit/loss calculation
+account3 = UserAccount(user_id=2, username='jane_doe', password='password456', email='jane@example.com', balance=5000.0)
+initial_deposit = 5000.0
+account3.buy_shares('TSLA', 2, get_share_price)
+account3.sell_shares('TSLA', 1, get_share_price)
+profit_loss3 = account3.get_profit_loss(initial_deposit)
+print(f"Profit/Loss for jane_doe: {profit_loss3}")
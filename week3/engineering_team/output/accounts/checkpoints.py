@@ -0,0 +1,152 @@
+from bisect import bisect_right
+
+from .money import MONEY_SCALE, cost_units, from_units, proceeds_units, to_units, value_units
+from .records import entry_epoch_ns, to_epoch_ns
+
+
+def _apply(state, entry, scale):
+    """Advances a (balance units, holdings, marks) state by one ledger entry."""
+    balance, holdings, marks = state
+    transaction_type = entry['transaction_type']
+    if transaction_type == 'deposit':
+        return balance + to_units(entry['amount'], scale), holdings, marks
+    if transaction_type == 'withdrawal':
+        return balance - to_units(entry['amount'], scale), holdings, marks
+    symbol, quantity, price = entry['symbol'], entry['quantity'], entry['price']
+    marks[symbol] = price
+    if transaction_type == 'buy':
+        holdings[symbol] = holdings.get(symbol, 0) + quantity
+        return balance - cost_units(price, quantity, scale), holdings, marks
+    holdings[symbol] -= quantity
+    if holdings[symbol] == 0:
+        del holdings[symbol]
+    return balance + proceeds_units(price, quantity, scale), holdings, marks
+
+
+class HoldingsCheckpoints:
+    """Periodic balance/holdings checkpoints over an account's ledger.
+
+    A checkpoint is taken every interval entries. A point-in-time query
+    bisects to the last checkpoint at or before the requested time and
+    replays at most interval entries from there, so historical queries are
+    O(log n + interval). Like TransactionIndex, it relies on the ledger being
+    chronological and append-only, and catches up on new entries lazily.
+
+    Building checkpoints for an existing history undoes the whole ledger once,
+    which is O(n). AccountStore avoids that on open: it maintains the
+    checkpoints from its write-ahead log, persists them with each snapshot
+    via to_dict, and hands them back to recovered accounts with from_dict.
+    """
+    def __init__(self, account, interval=1000):
+        if interval <= 0:
+            raise ValueError("Checkpoint interval must be positive.")
+        self.account = account
+        self.interval = interval
+        self.scale = scale = getattr(account, 'money_scale', MONEY_SCALE)
+        # The state before the first entry is the current state with every entry undone.
+        balance, holdings = to_units(account.balance, scale), dict(account.holdings)
+        for entry in account.get_transaction_history():
+            transaction_type = entry['transaction_type']
+            if transaction_type == 'deposit':
+                balance -= to_units(entry['amount'], scale)
+            elif transaction_type == 'withdrawal':
+                balance += to_units(entry['amount'], scale)
+            elif transaction_type == 'buy':
+                balance += cost_units(entry['price'], entry['quantity'], scale)
+                holdings[entry['symbol']] = holdings.get(entry['symbol'], 0) - entry['quantity']
+            else:
+                balance -= proceeds_units(entry['price'], entry['quantity'], scale)
+                holdings[entry['symbol']] = holdings.get(entry['symbol'], 0) + entry['quantity']
+        holdings = {symbol: quantity for symbol, quantity in holdings.items() if quantity != 0}
+        self._positions = [0]
+        self._times = [float('-inf')]
+        self._states = [(balance, holdings, {})]
+        self._tail = (balance, dict(holdings), {})
+        self._tail_position = 0
+        self.refresh()
+
+    @classmethod
+    def from_dict(cls, data, account=None):
+        """Restores checkpoints saved by to_dict; without an account, only append() may be used."""
+        checkpoints = cls.__new__(cls)
+        checkpoints.account = account
+        checkpoints.interval = data['interval']
+        checkpoints.scale = data['scale']
+        checkpoints._positions = list(data['positions'])
+        checkpoints._times = [float('-inf'), *data['times']]
+        checkpoints._states = [(balance, dict(holdings), dict(marks)) for balance, holdings, marks in data['states']]
+        balance, holdings, marks = data['tail']
+        checkpoints._tail = (balance, dict(holdings), dict(marks))
+        checkpoints._tail_position = data['tail_position']
+        return checkpoints
+
+    def to_dict(self):
+        """Serializes the checkpoints and the state after the last covered entry."""
+        balance, holdings, marks = self._tail
+        return {
+            'interval': self.interval,
+            'scale': self.scale,
+            'positions': list(self._positions),
+            'times': self._times[1:],
+            'states': list(self._states),
+            'tail': (balance, dict(holdings), dict(marks)),
+            'tail_position': self._tail_position,
+        }
+
+    @property
+    def position(self):
+        """The number of ledger entries covered so far."""
+        return self._tail_position
+
+    def latest(self):
+        """Returns (balance in money units, holdings, last trade prices) after the last covered entry."""
+        balance, holdings, marks = self._tail
+        return balance, dict(holdings), dict(marks)
+
+    def append(self, entry):
+        """Advances past the next ledger entry, checkpointing every interval entries."""
+        self._tail = _apply(self._tail, entry, self.scale)
+        self._tail_position += 1
+        if self._tail_position % self.interval == 0:
+            balance, holdings, marks = self._tail
+            self._positions.append(self._tail_position)
+            self._times.append(entry_epoch_ns(entry))
+            self._states.append((balance, dict(holdings), dict(marks)))
+
+    def refresh(self):
+        """Replays entries appended since the last call."""
+        ledger = self.account.transactions
+        while self._tail_position < len(ledger):
+            self.append(ledger[self._tail_position])
+
+    def state_at(self, at):
+        """Returns (balance in money units, holdings, last trade prices) as of the given time, inclusive."""
+        self.refresh()
+        at_ns = to_epoch_ns(at)
+        index = bisect_right(self._times, at_ns) - 1
+        balance, holdings, marks = self._states[index]
+        state = (balance, dict(holdings), dict(marks))
+        ledger = self.account.transactions
+        end = self._positions[index + 1] if index + 1 < len(self._positions) else len(ledger)
+        for position in range(self._positions[index], end):
+            entry = ledger[position]
+            if entry_epoch_ns(entry) > at_ns:
+                break
+            state = _apply(state, entry, self.scale)
+        return state
+
+    def holdings_at(self, at):
+        return self.state_at(at)[1]
+
+    def profit_loss_at(self, initial_deposit, at, get_share_price):
+        """Profit/loss at a past time.
+
+        Holdings are valued at their last traded price up to that time;
+        get_share_price is only used for positions with no trade in the ledger.
+        """
+        balance, holdings, marks = self.state_at(at)
+        market_value = sum(
+            value_units(marks[symbol] if symbol in marks else get_share_price(symbol), quantity, self.scale)
+            for symbol, quantity in holdings.items()
+        )
+        return from_units(balance + market_value, self.scale) - initial_deposit
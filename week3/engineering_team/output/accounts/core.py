@@ -0,0 +1,352 @@
+
+from datetime import datetime
+
+from .checkpoints import HoldingsCheckpoints
+from .history_index import TransactionIndex
+from .ledger import ListLedger
+from .money import MONEY_SCALE, cost_units, from_units, proceeds_units, to_units
+from .prices import get_share_price
+from .records import TransactionRecord, TransactionType, intern_symbol, now_epoch_ns
+
+class UserAccount:
+    """Represents a user account with balance, holdings, and transaction history.
+
+    The balance is held as an integer number of money units (1 / money_scale,
+    cents by default) in balance_units; balance reads and writes it as a float.
+    The ledger and the default price provider are pluggable: trades and
+    valuations use price_provider unless a price function is passed in.
+    When journal is set, journal(account, entries) is called with every
+    validated transaction before the account changes, so a write-ahead log
+    can make it durable first; listeners are only told afterwards.
+    """
+    __slots__ = (
+        'user_id', 'username', 'password', 'email', 'balance_units', 'holdings', 'transactions',
+        'price_provider', 'valuation', 'history_index', 'checkpoints', 'journal', '_listeners', '__weakref__'
+    )
+    money_scale = MONEY_SCALE
+
+    def __init__(self, user_id, username, password, email, balance=0.0, ledger=None, price_provider=None):
+        self.user_id = user_id
+        self.username = username
+        self.password = password  # In real-world, hash the password
+        self.email = email
+        self.balance = balance
+        self.holdings = {}
+        self.transactions = ledger if ledger is not None else ListLedger()
+        self.price_provider = price_provider
+        self.journal = None
+        self._listeners = []
+        self.valuation = None
+        self.history_index = None
+        self.checkpoints = None
+
+    @property
+    def balance(self):
+        return from_units(self.balance_units, self.money_scale)
+
+    @balance.setter
+    def balance(self, amount):
+        self.balance_units = to_units(amount, self.money_scale)
+
+    def deposit(self, amount):
+        """Deposits funds into the account."""
+        if amount <= 0:
+            raise ValueError("Deposit amount must be positive.")
+        units = to_units(amount, self.money_scale)
+        if units == 0:
+            raise ValueError("Deposit amount is below the smallest money unit.")
+        entries = (TransactionRecord(TransactionType.DEPOSIT, amount=amount),)
+        self._record(entries)
+        self.balance_units += units
+        self._notify(entries)
+
+    def withdraw(self, amount):
+        """Withdraws funds from the account."""
+        if amount <= 0:
+            raise ValueError("Withdrawal amount must be positive.")
+        units = to_units(amount, self.money_scale)
+        if units == 0:
+            raise ValueError("Withdrawal amount is below the smallest money unit.")
+        if self.balance_units < units:
+            raise ValueError("Insufficient funds.")
+        entries = (TransactionRecord(TransactionType.WITHDRAWAL, amount=amount),)
+        self._record(entries)
+        self.balance_units -= units
+        self._notify(entries)
+
+    def buy_shares(self, symbol, quantity, get_share_price=None):
+        """Buys shares of a given symbol."""
+        if quantity <= 0:
+            raise ValueError("Quantity must be positive.")
+        share_price = self._price_function(get_share_price)(symbol)
+        cost = cost_units(share_price, quantity, self.money_scale)
+        if cost == 0:
+            raise ValueError("Trade value is below the smallest money unit.")
+        if self.balance_units < cost:
+            raise ValueError("Insufficient funds to buy shares.")
+
+        entries = (TransactionRecord(TransactionType.BUY, symbol, quantity, share_price),)
+        self._record(entries)
+        self.balance_units -= cost
+        if symbol in self.holdings:
+            self.holdings[symbol] += quantity
+        else:
+            self.holdings[symbol] = quantity
+        self._notify(entries)
+
+    def sell_shares(self, symbol, quantity, get_share_price=None):
+        """Sells shares of a given symbol."""
+        if quantity <= 0:
+            raise ValueError("Quantity must be positive.")
+        if symbol not in self.holdings or self.holdings[symbol] < quantity:
+            raise ValueError("Insufficient shares to sell.")
+
+        share_price = self._price_function(get_share_price)(symbol)
+        proceeds = proceeds_units(share_price, quantity, self.money_scale)
+        if proceeds == 0:
+            raise ValueError("Trade value is below the smallest money unit.")
+        entries = (TransactionRecord(TransactionType.SELL, symbol, quantity, share_price),)
+        self._record(entries)
+        self.balance_units += proceeds
+        self.holdings[symbol] -= quantity
+        if self.holdings[symbol] == 0:
+            del self.holdings[symbol]
+        self._notify(entries)
+
+    def execute_orders(self, orders, price_provider=None):
+        """Executes a batch of orders atomically at a single timestamp.
+
+        orders is an iterable of (side, symbol, quantity) tuples, side being
+        'buy' or 'sell'. Every distinct symbol is priced once, through
+        price_provider.get_share_prices(symbols) when the provider has it, or
+        by calling price_provider(symbol) otherwise. Orders are validated in
+        sequence against the running balance and holdings; if any fails, a
+        ValueError is raised and the account is left untouched.
+        """
+        orders = list(orders)
+        price_provider = self._price_function(price_provider)
+        symbols = {symbol for _, symbol, _ in orders}
+        get_share_prices = getattr(price_provider, 'get_share_prices', None)
+        if get_share_prices is not None:
+            prices = get_share_prices(list(symbols))
+            missing = symbols - prices.keys()
+            if missing:
+                raise ValueError(f"No price returned for: {', '.join(sorted(missing))}")
+        else:
+            prices = {symbol: price_provider(symbol) for symbol in symbols}
+
+        balance = self.balance_units
+        positions = {}
+        for index, (side, symbol, quantity) in enumerate(orders):
+            if quantity <= 0:
+                raise ValueError(f"Order {index}: Quantity must be positive.")
+            held = positions[symbol] if symbol in positions else self.holdings.get(symbol, 0)
+            if side == 'buy':
+                value = cost_units(prices[symbol], quantity, self.money_scale)
+                if value == 0:
+                    raise ValueError(f"Order {index}: Trade value is below the smallest money unit.")
+                if balance < value:
+                    raise ValueError(f"Order {index}: Insufficient funds to buy shares.")
+                balance -= value
+                positions[symbol] = held + quantity
+            elif side == 'sell':
+                if held < quantity:
+                    raise ValueError(f"Order {index}: Insufficient shares to sell.")
+                value = proceeds_units(prices[symbol], quantity, self.money_scale)
+                if value == 0:
+                    raise ValueError(f"Order {index}: Trade value is below the smallest money unit.")
+                balance += value
+                positions[symbol] = held - quantity
+            else:
+                raise ValueError(f"Order {index}: Unknown order side: {side}")
+
+        timestamp_ns = now_epoch_ns()
+        sides = {'buy': TransactionType.BUY, 'sell': TransactionType.SELL}
+        entries = tuple(
+            TransactionRecord(sides[side], symbol, quantity, prices[symbol], timestamp_ns=timestamp_ns)
+            for side, symbol, quantity in orders
+        )
+        # If the ledger rejects an entry or the journal fails, balance and holdings are unchanged.
+        self._record(entries)
+        self.balance_units = balance
+        for symbol, quantity in positions.items():
+            if quantity == 0:
+                self.holdings.pop(symbol, None)
+            else:
+                self.holdings[symbol] = quantity
+        # Listeners get the whole batch at once.
+        self._notify(entries)
+        return list(entries)
+
+    def apply_transaction(self, entry):
+        """Applies a previously recorded transaction without re-validating or re-pricing it."""
+        transaction_type = entry['transaction_type']
+        if transaction_type not in ('deposit', 'withdrawal', 'buy', 'sell'):
+            raise ValueError(f"Unknown transaction type: {transaction_type}")
+        self._record((entry,))
+        scale = self.money_scale
+        if transaction_type == 'deposit':
+            self.balance_units += to_units(entry['amount'], scale)
+        elif transaction_type == 'withdrawal':
+            self.balance_units -= to_units(entry['amount'], scale)
+        elif transaction_type == 'buy':
+            self.balance_units -= cost_units(entry['price'], entry['quantity'], scale)
+            self.holdings[entry['symbol']] = self.holdings.get(entry['symbol'], 0) + entry['quantity']
+        else:
+            self.balance_units += proceeds_units(entry['price'], entry['quantity'], scale)
+            self.holdings[entry['symbol']] -= entry['quantity']
+            if self.holdings[entry['symbol']] == 0:
+                del self.holdings[entry['symbol']]
+        self._notify((entry,))
+
+    def add_listener(self, listener):
+        """Registers listener(account, entries), called after every recorded transaction.
+
+        entries is a tuple of the new ledger entries: one for a single
+        transaction, every order's entry for an execute_orders batch.
+        """
+        self._listeners.append(listener)
+
+    def remove_listener(self, listener):
+        self._listeners.remove(listener)
+
+    def _record(self, entries):
+        """Journals a tuple of validated entries and writes them to the ledger.
+
+        Runs before balance and holdings change: the ledger's check() sees
+        every entry first, so nothing the ledger would reject reaches the
+        journal, and a failure at any step leaves the account untouched.
+        """
+        check = getattr(self.transactions, 'check', None)
+        if check is not None:
+            for entry in entries:
+                check(entry)
+        if self.journal is not None:
+            self.journal(self, entries)
+        if len(entries) == 1:
+            self.transactions.append(entries[0])
+        else:
+            self.transactions.extend(entries)
+
+    def _notify(self, entries):
+        for listener in self._listeners:
+            listener(self, entries)
+
+    def _price_function(self, get_share_price):
+        if get_share_price is not None:
+            return get_share_price
+        if self.price_provider is None:
+            raise ValueError("A price function is required unless the account has a price provider.")
+        return self.price_provider
+
+    def track_valuation(self, get_share_price=None, ticker=None):
+        """Starts maintaining a running portfolio value, read in O(1) by get_portfolio_value()."""
+        from .valuation import IncrementalValuation
+        if self.valuation is not None:
+            self.valuation.close()
+        self.valuation = IncrementalValuation(self, self._price_function(get_share_price), ticker=ticker)
+        return self.valuation
+
+    def get_portfolio_value(self, get_share_price=None):
+        """Calculates the total value of the portfolio."""
+        if get_share_price is None:
+            if self.valuation is not None:
+                return self.valuation.value
+            if self.price_provider is None:
+                raise ValueError("A price function is required unless valuation is tracked.")
+            get_share_price = self.price_provider
+        # Positions are summed as floats and rounded to money units once.
+        scale = self.money_scale
+        market_value = 0.0
+        for symbol, quantity in self.holdings.items():
+            market_value += get_share_price(symbol) * quantity
+        return (self.balance_units + round(market_value * scale)) / scale
+
+    def get_profit_loss(self, initial_deposit, at=None):
+        """Calculates the profit or loss from the initial deposit, now or as of a past time."""
+        if at is not None:
+            return self._get_checkpoints().profit_loss_at(initial_deposit, at, self.price_provider or get_share_price)
+        return self.get_portfolio_value(self.price_provider or get_share_price) - initial_deposit
+
+    def get_holdings(self, at=None):
+        """Returns the current holdings, or the holdings as of a past time."""
+        if at is not None:
+            return self._get_checkpoints().holdings_at(at)
+        return self.holdings
+
+    def _get_checkpoints(self):
+        if self.checkpoints is None:
+            self.checkpoints = HoldingsCheckpoints(self)
+        return self.checkpoints
+
+    def get_transaction_history(self):
+        """Returns the transaction history."""
+        return self.transactions.view()
+
+    def query_transactions(self, start=None, end=None, symbol=None, transaction_type=None, limit=50, cursor=None):
+        """Returns one page of matching transactions and the cursor for the next page."""
+        if self.history_index is None or self.history_index.ledger is not self.transactions:
+            self.history_index = TransactionIndex(self.transactions)
+        return self.history_index.query(start, end, symbol, transaction_type, limit, cursor)
+
+    def to_dict(self):
+        """Serializes the object to a dictionary."""
+        return {
+            'user_id': self.user_id,
+            'username': self.username,
+            'password': self.password,
+            'email': self.email,
+            'balance': self.balance,
+            'holdings': self.holdings,
+            'transactions': [dict(entry) for entry in self.transactions]
+        }
+
+    @classmethod
+    def from_dict(cls, data, ledger=None):
+        """Deserializes the object from a dictionary."""
+        account = cls(
+            user_id=data['user_id'],
+            username=data['username'],
+            password=data['password'],
+            email=data['email'],
+            balance=data['balance'],
+            ledger=ledger
+        )
+        account.holdings = data['holdings']
+        account.transactions.extend(data['transactions'])
+        return account
+
+
+class Transaction:
+    """Represents a transaction.
+    Note: It's included for completeness, but transactions are also stored inside UserAccount for now."""
+    __slots__ = ('transaction_id', 'user_id', 'share_symbol', 'quantity', 'transaction_type', 'timestamp')
+
+    def __init__(self, transaction_id, user_id, share_symbol, quantity, transaction_type, timestamp=None):
+        self.transaction_id = transaction_id
+        self.user_id = user_id
+        self.share_symbol = intern_symbol(share_symbol)
+        self.quantity = quantity
+        self.transaction_type = transaction_type  # 'buy' or 'sell'
+        self.timestamp = timestamp or datetime.now().isoformat()
+
+    def to_dict(self):
+        return {
+            'transaction_id': self.transaction_id,
+            'user_id': self.user_id,
+            'share_symbol': self.share_symbol,
+            'quantity': self.quantity,
+            'transaction_type': self.transaction_type,
+            'timestamp': self.timestamp
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(
+            transaction_id=data['transaction_id'],
+            user_id=data['user_id'],
+            share_symbol=data['share_symbol'],
+            quantity=data['quantity'],
+            transaction_type=data['transaction_type'],
+            timestamp=data['timestamp']
+        )
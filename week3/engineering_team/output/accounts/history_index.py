@@ -0,0 +1,84 @@
+from bisect import bisect_left
+
+from .records import entry_epoch_ns, to_epoch_ns
+
+
+class TransactionIndex:
+    """Secondary indexes over an append-only transaction ledger.
+
+    Keeps each entry's epoch-ns timestamp by ledger position (bisectable while
+    the ledger is chronological, which UserAccount ledgers are), plus posting
+    lists of positions per symbol and per transaction type. Ledgers only grow,
+    so the index catches up on new entries lazily before each query.
+    """
+    def __init__(self, ledger):
+        self.ledger = ledger
+        self._timestamps = []
+        self._types = []
+        self._symbols = []
+        self._chronological = True
+        self._by_symbol = {}
+        self._by_type = {}
+
+    def refresh(self):
+        """Indexes any entries appended to the ledger since the last call."""
+        ledger = self.ledger
+        for position in range(len(self._timestamps), len(ledger)):
+            entry = ledger[position]
+            timestamp = entry_epoch_ns(entry)
+            if self._timestamps and timestamp < self._timestamps[-1]:
+                self._chronological = False
+            transaction_type = entry['transaction_type']
+            symbol = entry.get('symbol')
+            self._timestamps.append(timestamp)
+            self._types.append(transaction_type)
+            self._symbols.append(symbol)
+            self._by_type.setdefault(transaction_type, []).append(position)
+            if symbol is not None:
+                self._by_symbol.setdefault(symbol, []).append(position)
+
+    def query(self, start=None, end=None, symbol=None, transaction_type=None, limit=50, cursor=None):
+        """Returns (page, next_cursor) for entries matching every given filter.
+
+        start is inclusive and end exclusive; both take datetimes or ISO
+        strings. Results are in ledger order. next_cursor is None on the last
+        page; otherwise pass it back to get the following page.
+        """
+        if limit <= 0:
+            raise ValueError("Page size must be positive.")
+        self.refresh()
+        start_ns, end_ns = to_epoch_ns(start), to_epoch_ns(end)
+        timestamps = self._timestamps
+        low, high = 0, len(timestamps)
+        if self._chronological:
+            if start_ns is not None:
+                low = bisect_left(timestamps, start_ns)
+            if end_ns is not None:
+                high = bisect_left(timestamps, end_ns)
+        low = max(low, cursor or 0)
+
+        # Walk the narrowest candidate list; the other filters are checked per position.
+        positions, size = range(low, high), max(high - low, 0)
+        for postings in (
+            self._by_symbol.get(symbol, []) if symbol is not None else None,
+            self._by_type.get(transaction_type, []) if transaction_type is not None else None,
+        ):
+            if postings is not None:
+                first, last = bisect_left(postings, low), bisect_left(postings, high)
+                if last - first < size:
+                    positions, size = map(postings.__getitem__, range(first, last)), last - first
+
+        page = []
+        for position in positions:
+            if symbol is not None and self._symbols[position] != symbol:
+                continue
+            if transaction_type is not None and self._types[position] != transaction_type:
+                continue
+            if start_ns is not None and timestamps[position] < start_ns:
+                continue
+            if end_ns is not None and timestamps[position] >= end_ns:
+                continue
+            if len(page) == limit:
+                return page, position
+            page.append(self.ledger[position])
+        return page, None
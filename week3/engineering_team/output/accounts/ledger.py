@@ -0,0 +1,172 @@
+import mmap
+import os
+import struct
+
+from .records import TYPE_CODES, TransactionRecord
+
+# type code, symbol, quantity, price (or amount for cash movements), epoch-ns timestamp
+RECORD = struct.Struct('<B15sddq')
+SYMBOL_WIDTH = 15
+
+
+def pack_transaction(entry):
+    """Packs a TransactionRecord or transaction dict into a fixed-width binary record."""
+    entry = TransactionRecord.from_entry(entry)
+    symbol = (entry.symbol or '').encode('utf-8')
+    if len(symbol) > SYMBOL_WIDTH:
+        raise ValueError(f"Symbol too long for ledger record: {entry.symbol}")
+    if entry.is_trade:
+        quantity, price = entry.quantity, entry.price
+    else:
+        quantity, price = 0.0, entry.amount
+    return RECORD.pack(entry.transaction_type, symbol, quantity, price, entry.timestamp_ns)
+
+
+def make_transaction(code, symbol, quantity, price, epoch_ns):
+    """Builds a TransactionRecord from decoded fields; price holds the amount for cash movements.
+
+    Quantities are stored as doubles, so whole ones are turned back into ints here.
+    """
+    if code in (1, 2):
+        return TransactionRecord(code, amount=price, timestamp_ns=epoch_ns)
+    if quantity.is_integer():
+        quantity = int(quantity)
+    return TransactionRecord(code, symbol, quantity, price, timestamp_ns=epoch_ns)
+
+
+def unpack_transaction(buffer, offset=0):
+    """Unpacks a binary record into a TransactionRecord."""
+    code, symbol, quantity, price, epoch_ns = RECORD.unpack_from(buffer, offset)
+    return make_transaction(code, symbol.rstrip(b'\0').decode('utf-8'), quantity, price, epoch_ns)
+
+
+class ListLedger(list):
+    """In-memory ledger backend: a list of TransactionRecords.
+
+    Transaction dicts are converted on the way in, so histories loaded with
+    from_dict get the compact representation too.
+    """
+    def __init__(self, entries=()):
+        super().__init__(map(TransactionRecord.from_entry, entries))
+
+    def append(self, entry):
+        super().append(TransactionRecord.from_entry(entry))
+
+    def extend(self, entries):
+        super().extend(map(TransactionRecord.from_entry, entries))
+
+    def view(self):
+        return self
+
+
+class LedgerView:
+    """Lazy, sliceable read-only view over a range of ledger records."""
+    def __init__(self, ledger, start=0, stop=None, step=1):
+        self._ledger = ledger
+        self._range = range(start, len(ledger) if stop is None else stop, step)
+
+    def __len__(self):
+        return len(self._range)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            sub = self._range[index]
+            return LedgerView(self._ledger, sub.start, sub.stop, sub.step)
+        return self._ledger.read(self._range[index])
+
+    def __iter__(self):
+        for position in self._range:
+            yield self._ledger.read(position)
+
+    def __repr__(self):
+        return f"LedgerView({len(self)} transactions)"
+
+
+class MmapLedger:
+    """Append-only ledger of fixed-width binary records, memory-mapped for reads."""
+    def __init__(self, path):
+        self.path = path
+        self._file = open(path, 'a+b')
+        size = os.fstat(self._file.fileno()).st_size
+        if size % RECORD.size:
+            raise ValueError(f"Ledger file {path} is truncated or corrupt.")
+        self._count = size // RECORD.size
+        self._map = None
+        self._mapped_count = 0
+
+    def check(self, entry):
+        """Raises ValueError if the entry cannot be stored, e.g. its symbol is too long for a record."""
+        pack_transaction(entry)
+
+    def append(self, entry):
+        """Appends one transaction dict to the end of the ledger file."""
+        self._file.write(pack_transaction(entry))
+        self._file.flush()
+        self._count += 1
+
+    def extend(self, entries):
+        """Appends several transaction dicts with a single write."""
+        records = b''.join(pack_transaction(entry) for entry in entries)
+        self._file.write(records)
+        self._file.flush()
+        self._count += len(records) // RECORD.size
+
+    def read(self, position):
+        """Decodes the record at the given position."""
+        if position >= self._mapped_count:
+            self._remap()
+        return unpack_transaction(self._map, position * RECORD.size)
+
+    def truncate(self, count):
+        """Drops every record after the first count, e.g. ones a snapshot does not cover."""
+        if not 0 <= count <= self._count:
+            raise ValueError(f"Cannot truncate a ledger of {self._count} records to {count}.")
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+            self._mapped_count = 0
+        self._file.truncate(count * RECORD.size)
+        self._count = count
+
+    def sync(self):
+        """Forces the appended records to disk."""
+        os.fsync(self._file.fileno())
+
+    def _remap(self):
+        if self._map is not None:
+            self._map.close()
+        self._map = mmap.mmap(self._file.fileno(), self._count * RECORD.size, access=mmap.ACCESS_READ)
+        self._mapped_count = self._count
+
+    def view(self):
+        """Returns a lazy view over every record currently in the ledger."""
+        return LedgerView(self)
+
+    def __len__(self):
+        return self._count
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return self.view()[index]
+        if index < 0:
+            index += self._count
+        if not 0 <= index < self._count:
+            raise IndexError("ledger index out of range")
+        return self.read(index)
+
+    def __iter__(self):
+        return iter(self.view())
+
+    def close(self):
+        """Releases the memory map and closes the ledger file."""
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+            self._mapped_count = 0
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
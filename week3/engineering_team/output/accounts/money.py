@@ -0,0 +1,40 @@
+"""Fixed-point money: amounts held as integer multiples of 1 / scale.
+
+Balances and trade values are kept as Python ints in the hot paths, so
+repeated deposits, trades and valuations add and subtract exactly and never
+drift. Floats appear only at the edges, where amounts come in and where
+results are read back out.
+"""
+
+import math
+
+MONEY_SCALE = 100  # units per currency unit, i.e. cents
+
+
+def to_units(amount, scale=MONEY_SCALE):
+    """Converts a currency amount to integer units, rounding to the nearest unit."""
+    return round(amount * scale)
+
+
+def from_units(units, scale=MONEY_SCALE):
+    """Converts integer units back to a float currency amount."""
+    return units / scale
+
+
+def value_units(price, quantity, scale=MONEY_SCALE):
+    """Market value of quantity shares at price, rounded to the nearest unit."""
+    return round(price * quantity * scale)
+
+
+def cost_units(price, quantity, scale=MONEY_SCALE):
+    """What buying quantity shares at price costs: the value rounded up to a whole unit.
+
+    The product is first rounded to 1e-6 units so float noise such as
+    0.1 * 3 == 0.30000000000000004 does not add a unit.
+    """
+    return math.ceil(round(price * quantity * scale, 6))
+
+
+def proceeds_units(price, quantity, scale=MONEY_SCALE):
+    """What selling quantity shares at price pays out: the value rounded down to a whole unit."""
+    return math.floor(round(price * quantity * scale, 6))
@@ -0,0 +1,18 @@
+"""Price providers.
+
+A price provider is any callable get_share_price(symbol) -> float. It may
+also offer get_share_prices(symbols) -> {symbol: price} for batched lookups,
+which execute_orders and value_portfolios use when present.
+"""
+
+
+def get_share_price(symbol):
+    """Returns a fixed share price for testing purposes."""
+    if symbol == 'AAPL':
+        return 150.0
+    elif symbol == 'TSLA':
+        return 600.0
+    elif symbol == 'GOOGL':
+        return 2500.0
+    else:
+        return 100.0
@@ -0,0 +1,135 @@
+import enum
+from collections.abc import Mapping
+from datetime import datetime, timedelta
+
+EPOCH = datetime(1970, 1, 1)
+_MICROSECOND = timedelta(microseconds=1)
+
+
+class TransactionType(enum.IntEnum):
+    DEPOSIT = 1
+    WITHDRAWAL = 2
+    BUY = 3
+    SELL = 4
+
+    @property
+    def label(self):
+        """The name used for this type in transaction dicts, e.g. 'withdrawal'."""
+        return self.name.lower()
+
+
+TYPE_CODES = {t.label: t.value for t in TransactionType}
+TYPE_NAMES = {t.value: t.label for t in TransactionType}
+_TYPES_BY_LABEL = {t.label: t for t in TransactionType}
+
+# One shared string object per symbol, however many records refer to it.
+_symbols = {}
+
+
+def intern_symbol(symbol):
+    """Returns the shared instance of a symbol string."""
+    return _symbols.setdefault(symbol, symbol)
+
+
+def iso_to_epoch_ns(timestamp):
+    """Converts a naive ISO-8601 timestamp (as written by UserAccount) to epoch nanoseconds."""
+    return ((datetime.fromisoformat(timestamp) - EPOCH) // _MICROSECOND) * 1000
+
+
+def epoch_ns_to_iso(epoch_ns):
+    """Converts epoch nanoseconds back to the naive ISO-8601 form used in transaction dicts."""
+    return (EPOCH + timedelta(microseconds=epoch_ns // 1000)).isoformat()
+
+
+def to_epoch_ns(value):
+    """Converts a datetime or ISO-8601 string to epoch nanoseconds; None passes through."""
+    if value is None:
+        return None
+    if isinstance(value, datetime):
+        value = value.isoformat()
+    return iso_to_epoch_ns(value)
+
+
+def now_epoch_ns():
+    """The current local time as epoch nanoseconds, on the same clock as datetime.now()."""
+    return ((datetime.now() - EPOCH) // _MICROSECOND) * 1000
+
+
+def entry_epoch_ns(entry):
+    """Returns the epoch-ns timestamp of a TransactionRecord or transaction dict."""
+    if type(entry) is TransactionRecord:
+        return entry.timestamp_ns
+    return iso_to_epoch_ns(entry['timestamp'])
+
+
+_CASH_KEYS = ('transaction_type', 'amount', 'timestamp')
+_TRADE_KEYS = ('transaction_type', 'symbol', 'quantity', 'price', 'timestamp')
+
+
+class TransactionRecord(Mapping):
+    """Compact, immutable transaction record.
+
+    Stores an enum type, an interned symbol and an integer epoch-ns timestamp
+    in slots. It is also a read-only mapping with the same keys as the
+    original transaction dicts ('timestamp' is rendered as ISO-8601 on
+    access), so existing dict-style callers keep working; dict(record) gives
+    the plain dict.
+    """
+    __slots__ = ('transaction_type', 'symbol', 'quantity', 'price', 'amount', 'timestamp_ns')
+
+    def __init__(self, transaction_type, symbol=None, quantity=None, price=None, amount=None, timestamp_ns=None):
+        setattr_ = object.__setattr__
+        setattr_(self, 'transaction_type', TransactionType(transaction_type))
+        setattr_(self, 'symbol', intern_symbol(symbol) if symbol is not None else None)
+        setattr_(self, 'quantity', quantity)
+        setattr_(self, 'price', price)
+        setattr_(self, 'amount', amount)
+        setattr_(self, 'timestamp_ns', now_epoch_ns() if timestamp_ns is None else timestamp_ns)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("TransactionRecord is immutable")
+
+    def __delattr__(self, name):
+        raise AttributeError("TransactionRecord is immutable")
+
+    @classmethod
+    def from_entry(cls, entry):
+        """Builds a record from a transaction dict; records are returned unchanged."""
+        if type(entry) is cls:
+            return entry
+        transaction_type = _TYPES_BY_LABEL[entry['transaction_type']]
+        timestamp_ns = iso_to_epoch_ns(entry['timestamp'])
+        if transaction_type in (TransactionType.DEPOSIT, TransactionType.WITHDRAWAL):
+            return cls(transaction_type, amount=entry['amount'], timestamp_ns=timestamp_ns)
+        return cls(transaction_type, entry['symbol'], entry['quantity'], entry['price'], timestamp_ns=timestamp_ns)
+
+    @property
+    def is_trade(self):
+        return self.transaction_type >= TransactionType.BUY
+
+    def _keys(self):
+        return _TRADE_KEYS if self.transaction_type >= TransactionType.BUY else _CASH_KEYS
+
+    def __getitem__(self, key):
+        if key not in self._keys():
+            raise KeyError(key)
+        if key == 'transaction_type':
+            return self.transaction_type.label
+        if key == 'timestamp':
+            return epoch_ns_to_iso(self.timestamp_ns)
+        return getattr(self, key)
+
+    def __iter__(self):
+        return iter(self._keys())
+
+    def __len__(self):
+        return len(self._keys())
+
+    def __reduce__(self):
+        return (TransactionRecord, (self.transaction_type, self.symbol, self.quantity, self.price, self.amount, self.timestamp_ns))
+
+    def to_dict(self):
+        return dict(self)
+
+    def __repr__(self):
+        return f"TransactionRecord({dict(self)!r})"
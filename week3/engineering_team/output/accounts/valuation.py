@@ -0,0 +1,145 @@
+import numpy as np
+
+from .money import MONEY_SCALE, from_units, to_units, value_units
+
+
+def batch_price_provider(get_share_price):
+    """Adapts a single-symbol get_share_price(symbol) into get_share_prices(symbols) -> dict."""
+    def get_share_prices(symbols):
+        return {symbol: get_share_price(symbol) for symbol in symbols}
+    return get_share_prices
+
+
+def value_portfolios(accounts, get_share_prices):
+    """Values many portfolios with one batched price lookup.
+
+    Distinct symbols across all accounts are priced with a single call to
+    get_share_prices(symbols) -> {symbol: price}; every portfolio is then
+    summed in one vectorized pass and rounded to whole money units, so adding
+    the integer balances is exact. Each account is rounded at its own
+    money_scale. Returns the values in the same order as accounts, matching
+    what each account's get_portfolio_value would return.
+    """
+    accounts = list(accounts)
+    symbol_index = {}
+    owners, symbol_ids, quantities = [], [], []
+    for position, account in enumerate(accounts):
+        for symbol, quantity in account.holdings.items():
+            sid = symbol_index.get(symbol)
+            if sid is None:
+                sid = symbol_index[symbol] = len(symbol_index)
+            owners.append(position)
+            symbol_ids.append(sid)
+            quantities.append(quantity)
+
+    quotes = get_share_prices(list(symbol_index)) if symbol_index else {}
+    missing = symbol_index.keys() - quotes.keys()
+    if missing:
+        raise KeyError(f"No price returned for: {', '.join(sorted(missing))}")
+    prices = np.fromiter((quotes[symbol] for symbol in symbol_index), dtype=np.float64, count=len(symbol_index))
+
+    market_value = np.bincount(
+        np.asarray(owners, dtype=np.intp),
+        weights=prices[np.asarray(symbol_ids, dtype=np.intp)] * np.asarray(quantities, dtype=np.float64),
+        minlength=len(accounts)
+    )
+    scales = np.fromiter((getattr(account, 'money_scale', MONEY_SCALE) for account in accounts), dtype=np.int64, count=len(accounts))
+    balances = np.fromiter(
+        (to_units(account.balance, scale) for account, scale in zip(accounts, scales.tolist())), dtype=np.int64, count=len(accounts)
+    )
+    return ((balances + np.rint(market_value * scales).astype(np.int64)) / scales).tolist()
+
+
+class PriceTicker:
+    """Fans out per-symbol price ticks to the callbacks subscribed to that symbol."""
+    def __init__(self):
+        self._subscribers = {}
+
+    def subscribe(self, symbol, callback):
+        self._subscribers.setdefault(symbol, set()).add(callback)
+
+    def unsubscribe(self, symbol, callback):
+        callbacks = self._subscribers.get(symbol)
+        if callbacks is not None:
+            callbacks.discard(callback)
+            if not callbacks:
+                del self._subscribers[symbol]
+
+    def publish(self, symbol, price):
+        for callback in list(self._subscribers.get(symbol, ())):
+            callback(symbol, price)
+
+
+class IncrementalValuation:
+    """Running portfolio value for one account, kept current in O(1) per change.
+
+    The value is cached as one term per held symbol plus their sum. A trade
+    or a price tick recomputes only the affected symbol's term and adjusts
+    the sum by the difference, so reading the value never walks the holdings.
+    Terms and the sum are integer money units, so the running sum is exact
+    however many updates it absorbs.
+    """
+    def __init__(self, account, get_share_price, ticker=None):
+        self.account = account
+        self.ticker = ticker
+        self.scale = getattr(account, 'money_scale', MONEY_SCALE)
+        self._marks = {}
+        self._terms = {}
+        self._market_units = 0
+        for symbol, quantity in account.holdings.items():
+            self._track(symbol, get_share_price(symbol))
+            self._terms[symbol] = value_units(self._marks[symbol], quantity, self.scale)
+        self._market_units = sum(self._terms.values())
+        account.add_listener(self._on_transaction)
+
+    @property
+    def value(self):
+        """Cash balance plus the market value of all holdings."""
+        return from_units(to_units(self.account.balance, self.scale) + self._market_units, self.scale)
+
+    @property
+    def market_value(self):
+        return from_units(self._market_units, self.scale)
+
+    def on_price(self, symbol, price):
+        """Applies a price tick; ticks for symbols not held are ignored."""
+        if symbol in self._marks:
+            self._marks[symbol] = price
+            self._update_term(symbol)
+
+    def _on_transaction(self, account, entries):
+        for entry in entries:
+            symbol = entry.get('symbol')
+            if symbol is not None:  # cash movements change the balance, which value reads live
+                self._on_trade(account, symbol, entry['price'])
+
+    def _on_trade(self, account, symbol, price):
+        if symbol in account.holdings:
+            if symbol not in self._marks:
+                self._track(symbol, price)
+            else:
+                self._marks[symbol] = price
+            self._update_term(symbol)
+        elif symbol in self._marks:
+            self._market_units -= self._terms.pop(symbol)
+            del self._marks[symbol]
+            if self.ticker is not None:
+                self.ticker.unsubscribe(symbol, self.on_price)
+
+    def _track(self, symbol, price):
+        self._marks[symbol] = price
+        self._terms[symbol] = 0
+        if self.ticker is not None:
+            self.ticker.subscribe(symbol, self.on_price)
+
+    def _update_term(self, symbol):
+        term = value_units(self._marks[symbol], self.account.holdings[symbol], self.scale)
+        self._market_units += term - self._terms[symbol]
+        self._terms[symbol] = term
+
+    def close(self):
+        """Stops following the account and the ticker."""
+        self.account.remove_listener(self._on_transaction)
+        if self.ticker is not None:
+            for symbol in self._marks:
+                self.ticker.unsubscribe(symbol, self.on_price)
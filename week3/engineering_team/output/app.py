@@ -1,180 +1,59 @@
 
 import gradio as gr
-import json
-from datetime import datetime
-
-class UserAccount:
-    """Represents a user account with balance, holdings, and transaction history."""
-    def __init__(self, user_id, username, password, email, balance=0.0):
-        self.user_id = user_id
-        self.username = username
-        self.password = password  # In real-world, hash the password
-        self.email = email
-        self.balance = balance
-        self.holdings = {}
-        self.transactions = []
-
-    def deposit(self, amount):
-        """Deposits funds into the account."""
-        if amount <= 0:
-            raise ValueError("Deposit amount must be positive.")
-        self.balance += amount
-        self.transactions.append({
-            'transaction_type': 'deposit',
-            'amount': amount,
-            'timestamp': datetime.now().isoformat()
-        })
-
-    def withdraw(self, amount):
-        """Withdraws funds from the account."""
-        if amount <= 0:
-            raise ValueError("Withdrawal amount must be positive.")
-        if self.balance < amount:
-            raise ValueError("Insufficient funds.")
-        self.balance -= amount
-        self.transactions.append({
-            'transaction_type': 'withdrawal',
-            'amount': amount,
-            'timestamp': datetime.now().isoformat()
-        })
-
-    def buy_shares(self, symbol, quantity, get_share_price):
-        """Buys shares of a given symbol."""
-        if quantity <= 0:
-            raise ValueError("Quantity must be positive.")
-        share_price = get_share_price(symbol)
-        cost = share_price * quantity
-        if self.balance < cost:
-            raise ValueError("Insufficient funds to buy shares.")
-
-        self.balance -= cost
-        if symbol in self.holdings:
-            self.holdings[symbol] += quantity
-        else:
-            self.holdings[symbol] = quantity
-        self.transactions.append({
-            'transaction_type': 'buy',
-            'symbol': symbol,
-            'quantity': quantity,
-            'price': share_price,
-            'timestamp': datetime.now().isoformat()
-        })
-
-    def sell_shares(self, symbol, quantity, get_share_price):
-        """Sells shares of a given symbol."""
-        if quantity <= 0:
-            raise ValueError("Quantity must be positive.")
-        if symbol not in self.holdings or self.holdings[symbol] < quantity:
-            raise ValueError("Insufficient shares to sell.")
-
-        share_price = get_share_price(symbol)
-        proceeds = share_price * quantity
-        self.balance += proceeds
-        self.holdings[symbol] -= quantity
-        if self.holdings[symbol] == 0:
-            del self.holdings[symbol]
-        self.transactions.append({
-            'transaction_type': 'sell',
-            'symbol': symbol,
-            'quantity': quantity,
-            'price': share_price,
-            'timestamp': datetime.now().isoformat()
-        })
-
-    def get_portfolio_value(self, get_share_price):
-        """Calculates the total value of the portfolio."""
-        total_value = self.balance
-        for symbol, quantity in self.holdings.items():
-            total_value += get_share_price(symbol) * quantity
-        return total_value
-
-    def get_profit_loss(self, initial_deposit):
-        """Calculates the profit or loss from the initial deposit."""
-        return self.get_portfolio_value(get_share_price) - initial_deposit
-
-    def get_holdings(self):
-        """Returns the current holdings."""
-        return self.holdings
-
-    def get_transaction_history(self):
-        """Returns the transaction history."""
-        return self.transactions
-
-    def to_dict(self):
-        """Serializes the object to a dictionary."""
-        return {
-            'user_id': self.user_id,
-            'username': self.username,
-            'password': self.password,
-            'email': self.email,
-            'balance': self.balance,
-            'holdings': self.holdings,
-            'transactions': self.transactions
-        }
-
-    @classmethod
-    def from_dict(cls, data):
-        """Deserializes the object from a dictionary."""
-        account = cls(
-            user_id=data['user_id'],
-            username=data['username'],
-            password=data['password'],
-            email=data['email'],
-            balance=data['balance']
-        )
-        account.holdings = data['holdings']
-        account.transactions = data['transactions']
-        return account
-
-
-def get_share_price(symbol):
-    """Returns a fixed share price for testing purposes."""
-    if symbol == 'AAPL':
-        return 150.0
-    elif symbol == 'TSLA':
-        return 600.0
-    elif symbol == 'GOOGL':
-        return 2500.0
-    else:
-        return 100.0
+
+from account_registry import AccountRegistry
+from accounts import UserAccount
+from accounts_api import price_cache
+from async_service import AsyncAccountService
+
 
 # Gradio Interface Components
-def create_account(username, password, email):
-    account = UserAccount(user_id=len(accounts) + 1, username=username, password=password, email=email)
-    accounts.append(account)
-    return f"Account created for {username}."
-
-def deposit_funds(user_id, amount):
-    account = accounts[user_id - 1]
-    account.deposit(amount)
-    return f"New balance: {account.balance}"
-
-def withdraw_funds(user_id, amount):
-    account = accounts[user_id - 1]
-    account.withdraw(amount)
-    return f"New balance: {account.balance}"
-
-def buy_shares(user_id, symbol, quantity):
-    account = accounts[user_id - 1]
-    account.buy_shares(symbol, quantity, get_share_price)
-    return f"Bought {quantity} shares of {symbol}. Your holdings: {account.holdings}"
-
-def sell_shares(user_id, symbol, quantity):
-    account = accounts[user_id - 1]
-    account.sell_shares(symbol, quantity, get_share_price)
-    return f"Sold {quantity} shares of {symbol}. Your holdings: {account.holdings}"
-
-def view_portfolio(user_id):
-    account = accounts[user_id - 1]
-    return f"Current holdings: {account.get_holdings()}. Total portfolio value: {account.get_portfolio_value(get_share_price)}"
-
-def view_transactions(user_id):
-    account = accounts[user_id - 1]
-    transaction_history = account.get_transaction_history()
-    return json.dumps(transaction_history, indent=4)
+async def create_account(username, password, email):
+    account = await service.create_account(username, password, email)
+    return f"Account created for {username} with user ID {account.user_id}."
+
+async def deposit_funds(user_id, amount):
+    balance = await service.deposit(user_id, amount)
+    return f"New balance: {balance}"
+
+async def withdraw_funds(user_id, amount):
+    balance = await service.withdraw(user_id, amount)
+    return f"New balance: {balance}"
+
+async def buy_shares(user_id, symbol, quantity):
+    holdings = await service.buy_shares(user_id, symbol, quantity)
+    return f"Bought {quantity} shares of {symbol}. Your holdings: {holdings}"
+
+async def sell_shares(user_id, symbol, quantity):
+    holdings = await service.sell_shares(user_id, symbol, quantity)
+    return f"Sold {quantity} shares of {symbol}. Your holdings: {holdings}"
+
+async def view_portfolio(user_id):
+    holdings, total_value = await service.get_portfolio_value(user_id)
+    return f"Current holdings: {holdings}. Total portfolio value: {total_value}"
+
+TRANSACTIONS_PAGE_SIZE = 25
+
+async def view_transactions(user_id, symbol, transaction_type, cursor):
+    page, next_cursor = await service.query_transactions(
+        user_id,
+        symbol=symbol or None,
+        transaction_type=None if transaction_type == 'all' else transaction_type,
+        limit=TRANSACTIONS_PAGE_SIZE,
+        cursor=int(cursor or 0)
+    )
+    rows = ["| Time | Type | Symbol | Quantity | Price / Amount |", "|---|---|---|---|---|"]
+    for t in page:
+        rows.append(f"| {t['timestamp']} | {t['transaction_type']} | {t.get('symbol', '')} | {t.get('quantity', '')} | {t.get('price', t.get('amount'))} |")
+    if not page:
+        rows.append("| No transactions found. | | | | |")
+    elif next_cursor is None:
+        rows.append("| End of history. | | | | |")
+    return "\n".join(rows), next_cursor
 
 # Global account storage
-accounts = []
+registry = AccountRegistry(UserAccount)
+service = AsyncAccountService(registry, price_cache)
 
 # Gradio Interface layout
 with gr.Blocks() as app:
@@ -226,8 +105,11 @@ with gr.Blocks() as app:
 
     with gr.Tab("View Transactions"):
         user_id_trans = gr.Number(label="User ID")
+        symbol_trans = gr.Textbox(label="Stock Symbol (optional)")
+        type_trans = gr.Dropdown(["all", "deposit", "withdrawal", "buy", "sell"], value="all", label="Transaction Type")
+        cursor_trans = gr.Number(label="Page Cursor (empty for the first page, cleared after the last one)", value=None)
         transactions_btn = gr.Button("View Transactions")
         transactions_output = gr.Markdown("")
-        transactions_btn.click(view_transactions, inputs=[user_id_trans], outputs=transactions_output)
+        transactions_btn.click(view_transactions, inputs=[user_id_trans, symbol_trans, type_trans, cursor_trans], outputs=[transactions_output, cursor_trans])
 
 app.launch()
@@ -0,0 +1,141 @@
+import asyncio
+import inspect
+
+from account_registry import AccountRegistry
+from accounts import get_share_price
+
+
+def async_price_provider(get_share_price):
+    """Returns an awaitable get_share_price(symbol).
+
+    Coroutine functions are used as they are; blocking callables run in the
+    default executor so a slow quote source never stalls the event loop.
+    """
+    if inspect.iscoroutinefunction(get_share_price) or inspect.iscoroutinefunction(getattr(get_share_price, '__call__', None)):
+        return get_share_price
+
+    async def get_share_price_async(symbol):
+        return await asyncio.to_thread(get_share_price, symbol)
+    return get_share_price_async
+
+
+class AsyncAccountService:
+    """Awaitable account operations over an AccountRegistry.
+
+    Each account has its own asyncio.Lock, held across the price lookup and
+    the update, so operations on one account stay ordered while operations on
+    other accounts interleave freely. The account update itself runs under the
+    registry's per-account lock, which keeps sync callers safe and feeds the
+    registry's latency counters. That lock is a threading.RLock: when it is
+    free it is taken on the event loop, where the update is a short in-memory
+    change; when a sync caller holds it, the whole update runs in a worker
+    thread instead, so the loop never blocks waiting for another thread.
+    Reads of account state take the account's lock the same way. Creating an
+    account takes the registry-wide lock and hashes the password, so it
+    always runs in a worker thread; looking an account or its lock up by id
+    is a plain dict read and takes no lock.
+    """
+    def __init__(self, registry=None, get_share_price=get_share_price):
+        self.registry = registry if registry is not None else AccountRegistry()
+        self.get_share_price = async_price_provider(get_share_price)
+        self._locks = {}
+
+    def _lock(self, user_id):
+        user_id = self.registry.get(user_id).user_id
+        lock = self._locks.get(user_id)
+        if lock is None:
+            lock = self._locks[user_id] = asyncio.Lock()
+        return lock
+
+    async def _update(self, user_id, operation, update):
+        """Returns update(account), run under the registry's lock for the account."""
+        lock = self.registry.lock_for(user_id)
+        if lock.acquire(blocking=False):
+            try:
+                return self._locked_update(user_id, operation, update)
+            finally:
+                lock.release()
+        return await asyncio.to_thread(self._locked_update, user_id, operation, update)
+
+    def _locked_update(self, user_id, operation, update):
+        with self.registry.locked(user_id, operation) as account:
+            return update(account)
+
+    async def _read(self, user_id, read):
+        """Returns read(account) under the account's registry lock, without counting it as an operation."""
+        account = self.registry.get(user_id)
+        lock = self.registry.lock_for(user_id)
+        if lock.acquire(blocking=False):
+            try:
+                return read(account)
+            finally:
+                lock.release()
+
+        def locked_read():
+            with lock:
+                return read(account)
+        return await asyncio.to_thread(locked_read)
+
+    async def create_account(self, username, password, email, balance=0.0):
+        return await asyncio.to_thread(self.registry.create, username, password, email, balance)
+
+    async def deposit(self, user_id, amount):
+        def deposit(account):
+            account.deposit(amount)
+            return account.balance
+        async with self._lock(user_id):
+            return await self._update(user_id, 'deposit', deposit)
+
+    async def withdraw(self, user_id, amount):
+        def withdraw(account):
+            account.withdraw(amount)
+            return account.balance
+        async with self._lock(user_id):
+            return await self._update(user_id, 'withdraw', withdraw)
+
+    async def buy_shares(self, user_id, symbol, quantity):
+        async with self._lock(user_id):
+            price = await self.get_share_price(symbol)
+
+            def buy(account):
+                account.buy_shares(symbol, quantity, lambda _: price)
+                return dict(account.holdings)
+            return await self._update(user_id, 'buy_shares', buy)
+
+    async def sell_shares(self, user_id, symbol, quantity):
+        async with self._lock(user_id):
+            price = await self.get_share_price(symbol)
+
+            def sell(account):
+                account.sell_shares(symbol, quantity, lambda _: price)
+                return dict(account.holdings)
+            return await self._update(user_id, 'sell_shares', sell)
+
+    async def get_portfolio_value(self, user_id):
+        """Values the portfolio.
+
+        Accounts that track valuation are read in O(1) at their last known
+        prices; otherwise every held symbol is priced concurrently.
+        """
+        async with self._lock(user_id):
+            tracked, symbols = await self._read(user_id, lambda account: (account.valuation is not None, list(account.holdings)))
+            if tracked:
+                return await self._update(
+                    user_id, 'view_portfolio', lambda account: (dict(account.holdings), account.get_portfolio_value())
+                )
+            prices = dict(zip(symbols, await asyncio.gather(*(self.get_share_price(symbol) for symbol in symbols))))
+            return await self._update(
+                user_id, 'view_portfolio', lambda account: (dict(account.holdings), account.get_portfolio_value(prices.__getitem__))
+            )
+
+    async def get_transaction_history(self, user_id):
+        async with self._lock(user_id):
+            return await self._update(user_id, 'view_transactions', lambda account: list(account.get_transaction_history()))
+
+    async def query_transactions(self, user_id, start=None, end=None, symbol=None, transaction_type=None, limit=50, cursor=None):
+        """Returns one page of the account's history and the cursor for the next one (None on the last page)."""
+        async with self._lock(user_id):
+            return await self._update(
+                user_id, 'view_transactions',
+                lambda account: account.query_transactions(start, end, symbol, transaction_type, limit, cursor)
+            )
@@ -0,0 +1,233 @@
+"""Benchmark suite for UserAccount with JSON baselines and regression checks.
+
+Each benchmark is timed best-of-N and recorded as seconds per operation;
+the memory benchmarks record bytes per transaction instead. Results are compared against a baseline file and the run fails (exit status
+1) when any benchmark is slower than its baseline by more than the threshold.
+Baselines are machine-specific: regenerate them with --update on the machine
+that runs the check. A baseline also records the Python version it was taken
+on; against a different major.minor version the check is skipped with a
+warning, since interpreter releases shift these timings on their own.
+
+    python benchmarks.py                    # compare against benchmark_baseline.json
+    python benchmarks.py --update           # record a new baseline, replacing the old one
+    python benchmarks.py --full             # include 1M and 10M transaction round trips
+"""
+import argparse
+import json
+import os
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+
+from accounts import UserAccount
+from accounts.records import TransactionRecord, TransactionType, iso_to_epoch_ns
+from codec import decode_account, encode_account
+
+BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'benchmark_baseline.json')
+HISTORY_SIZES = (0, 10000, 100000)
+SYMBOL_COUNTS = (1, 10, 100, 1000, 10000)
+ROUND_TRIP_SIZES = (1000, 10000, 100000)
+FULL_ROUND_TRIP_SIZES = ROUND_TRIP_SIZES + (1000000, 10000000)
+MEMORY_PREFIX = 'memory_per_transaction'
+
+
+def _account(balance=1e12):
+    return UserAccount(1, 'bench', 'pw', 'bench@example.com', balance)
+
+
+def _history(account, size):
+    """Fills the account's ledger with size synthetic transactions, alternating deposits and buys."""
+    timestamp_ns = 1700000000000000000
+    account.transactions.extend(
+        TransactionRecord(TransactionType.BUY, 'AAPL', 1, 150.0, timestamp_ns=timestamp_ns + i) if i % 2
+        else TransactionRecord(TransactionType.DEPOSIT, amount=150.0, timestamp_ns=timestamp_ns + i)
+        for i in range(size)
+    )
+    account.holdings['AAPL'] = size // 2
+    return account
+
+
+def _best(run, repeat):
+    """Best-of-repeat wall time of run(), which does its own setup outside the timed region."""
+    best = float('inf')
+    for _ in range(repeat):
+        best = min(best, run())
+    return best
+
+
+def bench_deposit_withdraw(operations=50000, repeat=5):
+    def run():
+        account = _account()
+        started = time.perf_counter()
+        for _ in range(operations // 2):
+            account.deposit(10.0)
+            account.withdraw(10.0)
+        return time.perf_counter() - started
+    return _best(run, repeat) / operations
+
+
+def bench_buy_sell(history, operations=2000, repeat=5):
+    price = lambda symbol: 150.0
+
+    def run():
+        account = _history(_account(), history)
+        started = time.perf_counter()
+        for _ in range(operations // 2):
+            account.buy_shares('AAPL', 1, price)
+            account.sell_shares('AAPL', 1, price)
+        return time.perf_counter() - started
+    return _best(run, repeat) / operations
+
+
+def bench_portfolio_value(symbols, repeat=5):
+    account = _account()
+    quotes = {f'SYM{i}': 100.0 + i for i in range(symbols)}
+    account.holdings = {symbol: 10 for symbol in quotes}
+    calls = max(1, 100000 // symbols)
+
+    def run():
+        started = time.perf_counter()
+        for _ in range(calls):
+            account.get_portfolio_value(quotes.__getitem__)
+        return time.perf_counter() - started
+    return _best(run, repeat) / calls
+
+
+def bench_round_trip(transactions, repeat=3):
+    account = _history(_account(), transactions)
+    repeat = repeat if transactions <= 100000 else 1
+
+    def run():
+        started = time.perf_counter()
+        UserAccount.from_dict(account.to_dict())
+        return time.perf_counter() - started
+    return _best(run, repeat)
+
+
+def bench_codec_round_trip(transactions, repeat=3):
+    account = _history(_account(), transactions)
+    repeat = repeat if transactions <= 100000 else 1
+
+    def run():
+        started = time.perf_counter()
+        decode_account(encode_account(account))
+        return time.perf_counter() - started
+    return _best(run, repeat)
+
+
+def bench_memory_per_transaction(kind, transactions=20000):
+    """Bytes allocated per ledger entry, as the old transaction dicts ('dict') or as TransactionRecords ('record')."""
+    base_ns = iso_to_epoch_ns('2024-01-02T03:04:05')
+    if kind == 'dict':
+        build = lambda i: {
+            'transaction_type': 'buy', 'symbol': 'AAPL', 'quantity': i, 'price': 150.0 + i,
+            'timestamp': datetime.fromtimestamp(i).isoformat()
+        }
+    else:
+        build = lambda i: TransactionRecord(TransactionType.BUY, 'AAPL', i, 150.0 + i, timestamp_ns=base_ns + i)
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        entries = [build(i) for i in range(transactions)]
+        size = tracemalloc.get_traced_memory()[0] - before
+    finally:
+        tracemalloc.stop()
+    del entries
+    return size / transactions
+
+
+def _format(name, value):
+    if name.startswith(MEMORY_PREFIX):
+        return f"{value:14.1f} B "
+    return f"{value * 1e6:14.3f} us"
+
+
+def run_suite(full=False, only=None):
+    """Runs every benchmark (or those whose name contains only) and returns {name: seconds or bytes}."""
+    suite = [('deposit_withdraw', bench_deposit_withdraw)]
+    suite += [(f'buy_sell[history={size}]', lambda size=size: bench_buy_sell(size)) for size in HISTORY_SIZES]
+    suite += [(f'portfolio_value[symbols={count}]', lambda count=count: bench_portfolio_value(count)) for count in SYMBOL_COUNTS]
+    suite += [
+        (f'round_trip[transactions={size}]', lambda size=size: bench_round_trip(size))
+        for size in (FULL_ROUND_TRIP_SIZES if full else ROUND_TRIP_SIZES)
+    ]
+    suite += [
+        (f'codec_round_trip[transactions={size}]', lambda size=size: bench_codec_round_trip(size))
+        for size in (FULL_ROUND_TRIP_SIZES if full else ROUND_TRIP_SIZES)
+    ]
+    suite += [(f'{MEMORY_PREFIX}[{kind}]', lambda kind=kind: bench_memory_per_transaction(kind)) for kind in ('dict', 'record')]
+    results = {}
+    for name, bench in suite:
+        if only is None or only in name:
+            results[name] = bench()
+    return results
+
+
+def compare(results, baseline, threshold):
+    """Returns (name, baseline, current, ratio) for every benchmark slower than baseline * (1 + threshold)."""
+    regressions = []
+    for name, seconds in results.items():
+        reference = baseline.get(name)
+        if reference and seconds > reference * (1 + threshold):
+            regressions.append((name, reference, seconds, seconds / reference))
+    return regressions
+
+
+def load_baseline(path):
+    with open(path) as f:
+        return json.load(f)['results']
+
+
+def baseline_python(path):
+    """Returns the Python version the baseline was recorded with, e.g. '3.11.7'."""
+    with open(path) as f:
+        return json.load(f).get('python')
+
+
+def same_python(version):
+    """Whether a baseline recorded on the given Python version is comparable with this interpreter."""
+    return version is not None and version.split('.')[:2] == [str(part) for part in sys.version_info[:2]]
+
+
+def save_baseline(path, results):
+    with open(path, 'w') as f:
+        json.dump({'python': sys.version.split()[0], 'results': results}, f, indent=2, sort_keys=True)
+        f.write('\n')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--baseline', default=BASELINE)
+    parser.add_argument('--threshold', type=float, default=0.25, help="allowed slowdown before failing, e.g. 0.25 = 25%%")
+    parser.add_argument('--update', action='store_true', help="write the results as the new baseline")
+    parser.add_argument('--full', action='store_true', help="include the 1M and 10M transaction round trips")
+    parser.add_argument('--only', help="run only benchmarks whose name contains this string")
+    args = parser.parse_args()
+    if args.update and args.only:
+        parser.error("--update records a whole baseline from one run and cannot be combined with --only")
+
+    results = run_suite(args.full, args.only)
+    baseline = load_baseline(args.baseline) if os.path.exists(args.baseline) else {}
+    for name, seconds in results.items():
+        reference = baseline.get(name)
+        change = f"{(seconds / reference - 1) * 100:+7.1f}%" if reference else "     new"
+        print(f"{name:40s} {_format(name, seconds)}  {change}")
+
+    if args.update:
+        save_baseline(args.baseline, results)
+        print(f"baseline written to {args.baseline}")
+        return 0
+    recorded = baseline_python(args.baseline) if baseline else None
+    if baseline and not same_python(recorded):
+        print(f"WARNING: the baseline was recorded on Python {recorded}, this is Python {sys.version.split()[0]}; "
+              f"skipping the regression check (re-record it with --update)")
+        return 0
+    regressions = compare(results, baseline, args.threshold)
+    for name, reference, seconds, ratio in regressions:
+        print(f"REGRESSION {name}: {_format(name, reference).strip()} -> {_format(name, seconds).strip()} ({ratio:.2f}x)")
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
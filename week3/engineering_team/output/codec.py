@@ -0,0 +1,277 @@
+"""Versioned binary codec for UserAccount and Transaction.
+
+Layout, all integers as LEB128 varints (signed ones zigzag-encoded):
+
+    account:     b'UACC' version user_id username password email balance_units
+                 symbol-count symbols... holding-count holdings...
+                 entry-count entries...
+    entry:       type-byte (symbol-index quantity price | amount) timestamp-delta
+    transaction: b'UTXN' version type-byte id-tag transaction_id user_id
+                 share_symbol quantity timestamp
+
+The balance is stored as the account's integer balance_units (cents), so
+it round-trips exactly. Transaction amounts and prices are fixed-point at
+PRICE_SCALE, timestamps
+are epoch microseconds delta-encoded against the previous transaction, and
+symbols are interned into a per-account table. Quantities are plain varints;
+a fractional quantity sets FRACTIONAL_FLAG on the type byte and is stored
+fixed-point instead.
+
+Fixed point means amounts, prices and fractional quantities round-trip only
+to 1e-8: a quote of 100 / 3 decodes as 33.33333333. That is far below any
+exchange tick or the accounts' cent money unit, but a price computed to
+full double precision does not come back bit for bit.
+"""
+from datetime import datetime, timedelta
+
+from accounts import Transaction, UserAccount
+from accounts.records import EPOCH, TYPE_CODES, TransactionRecord
+
+ACCOUNT_MAGIC = b'UACC'
+TRANSACTION_MAGIC = b'UTXN'
+VERSION = 2
+PRICE_SCALE = 10 ** 8
+QUANTITY_SCALE = 10 ** 8
+FRACTIONAL_FLAG = 0x80
+BATCH_SIZE = 1024
+_MICROSECOND = timedelta(microseconds=1)
+_SECOND = timedelta(seconds=1)
+
+
+def _write_uvarint(out, value):
+    while value > 0x7F:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def _write_varint(out, value):
+    _write_uvarint(out, (value << 1) if value >= 0 else ((-value << 1) - 1))
+
+
+def _write_str(out, value):
+    data = value.encode('utf-8')
+    _write_uvarint(out, len(data))
+    out += data
+
+
+def _write_money(out, value):
+    _write_varint(out, round(value * PRICE_SCALE))
+
+
+class _Reader:
+    __slots__ = ('data', 'pos')
+
+    def __init__(self, data, pos=0):
+        self.data = data
+        self.pos = pos
+
+    def uvarint(self):
+        data, pos = self.data, self.pos
+        result = shift = 0
+        while True:
+            byte = data[pos]
+            pos += 1
+            result |= (byte & 0x7F) << shift
+            if byte < 0x80:
+                self.pos = pos
+                return result
+            shift += 7
+
+    def varint(self):
+        value = self.uvarint()
+        return (value >> 1) if not value & 1 else -((value + 1) >> 1)
+
+    def str(self):
+        length = self.uvarint()
+        start = self.pos
+        self.pos += length
+        return self.data[start:self.pos].decode('utf-8')
+
+    def money(self):
+        return self.varint() / PRICE_SCALE
+
+    def expect(self, magic):
+        if self.data[self.pos:self.pos + len(magic)] != magic:
+            raise ValueError("Not an encoded account or transaction.")
+        self.pos += len(magic)
+        version = self.data[self.pos]
+        self.pos += 1
+        if version != VERSION:
+            raise ValueError(f"Unsupported codec version: {version}")
+
+
+class _TimestampCodec:
+    """Converts naive ISO-8601 timestamps to epoch microseconds and back.
+
+    Consecutive transactions usually share the same second, so the
+    date-and-time part is cached and only the microseconds are re-formatted.
+    """
+    __slots__ = ('prefix', 'seconds')
+
+    def __init__(self):
+        self.prefix = None
+        self.seconds = None
+
+    def to_epoch_us(self, timestamp):
+        if len(timestamp) not in (19, 26):
+            return (datetime.fromisoformat(timestamp) - EPOCH) // _MICROSECOND
+        prefix = timestamp[:19]
+        if prefix != self.prefix:
+            self.prefix = prefix
+            self.seconds = (datetime.fromisoformat(prefix) - EPOCH) // _SECOND
+        return self.seconds * 1000000 + (int(timestamp[20:]) if len(timestamp) == 26 else 0)
+
+    def to_iso(self, epoch_us):
+        seconds, micros = divmod(epoch_us, 1000000)
+        if seconds != self.seconds:
+            self.seconds = seconds
+            self.prefix = (EPOCH + timedelta(seconds=seconds)).isoformat()
+        return f'{self.prefix}.{micros:06d}' if micros else self.prefix
+
+
+def _write_quantity(out, quantity, flag_position):
+    if quantity == int(quantity):
+        _write_varint(out, int(quantity))
+    else:
+        out[flag_position] |= FRACTIONAL_FLAG
+        _write_varint(out, round(quantity * QUANTITY_SCALE))
+
+
+def _read_quantity(reader, fractional):
+    value = reader.varint()
+    return value / QUANTITY_SCALE if fractional else value
+
+
+def encode_account(account):
+    """Encodes a UserAccount, including its full history, to bytes."""
+    out = bytearray(ACCOUNT_MAGIC)
+    out.append(VERSION)
+    _write_varint(out, account.user_id)
+    _write_str(out, account.username)
+    _write_str(out, account.password)
+    _write_str(out, account.email)
+    _write_varint(out, account.balance_units)
+
+    symbols = {}
+    body = bytearray()
+    for symbol, quantity in account.holdings.items():
+        _write_uvarint(body, symbols.setdefault(symbol, len(symbols)))
+        flag_at = len(body)
+        body.append(0)
+        _write_quantity(body, quantity, flag_at)
+    history = account.get_transaction_history()
+    _write_uvarint(body, len(history))
+    previous_us = 0
+    timestamps = _TimestampCodec()
+    for entry in history:
+        flag_at = len(body)
+        if type(entry) is TransactionRecord:
+            body.append(entry.transaction_type)
+            if entry.is_trade:
+                _write_uvarint(body, symbols.setdefault(entry.symbol, len(symbols)))
+                _write_quantity(body, entry.quantity, flag_at)
+                _write_money(body, entry.price)
+            else:
+                _write_money(body, entry.amount)
+            epoch_us = entry.timestamp_ns // 1000
+        else:
+            body.append(TYPE_CODES[entry['transaction_type']])
+            if 'symbol' in entry:
+                _write_uvarint(body, symbols.setdefault(entry['symbol'], len(symbols)))
+                _write_quantity(body, entry['quantity'], flag_at)
+                _write_money(body, entry['price'])
+            else:
+                _write_money(body, entry['amount'])
+            epoch_us = timestamps.to_epoch_us(entry['timestamp'])
+        _write_varint(body, epoch_us - previous_us)
+        previous_us = epoch_us
+
+    _write_uvarint(out, len(symbols))
+    for symbol in symbols:
+        _write_str(out, symbol)
+    _write_uvarint(out, len(account.holdings))
+    out += body
+    return bytes(out)
+
+
+def decode_account(data, ledger=None):
+    """Decodes bytes from encode_account back into a UserAccount."""
+    reader = _Reader(bytes(data))
+    reader.expect(ACCOUNT_MAGIC)
+    account = UserAccount(
+        user_id=reader.varint(),
+        username=reader.str(),
+        password=reader.str(),
+        email=reader.str(),
+        ledger=ledger
+    )
+    account.balance_units = reader.varint()
+    symbols = [reader.str() for _ in range(reader.uvarint())]
+    for _ in range(reader.uvarint()):
+        symbol = symbols[reader.uvarint()]
+        flags = reader.data[reader.pos]
+        reader.pos += 1
+        account.holdings[symbol] = _read_quantity(reader, flags & FRACTIONAL_FLAG)
+
+    remaining = reader.uvarint()
+    epoch_us = 0
+    batch = []
+    while remaining:
+        remaining -= 1
+        code = reader.data[reader.pos]
+        reader.pos += 1
+        if code & ~FRACTIONAL_FLAG >= TYPE_CODES['buy']:
+            symbol = symbols[reader.uvarint()]
+            quantity = _read_quantity(reader, code & FRACTIONAL_FLAG)
+            price = reader.money()
+            epoch_us += reader.varint()
+            batch.append(TransactionRecord(code & ~FRACTIONAL_FLAG, symbol, quantity, price, timestamp_ns=epoch_us * 1000))
+        else:
+            amount = reader.money()
+            epoch_us += reader.varint()
+            batch.append(TransactionRecord(code, amount=amount, timestamp_ns=epoch_us * 1000))
+        if len(batch) >= BATCH_SIZE:
+            account.transactions.extend(batch)
+            batch = []
+    account.transactions.extend(batch)
+    return account
+
+
+TRANSACTION_TYPES = {'buy': 0, 'sell': 1}
+_TRANSACTION_TYPE_NAMES = {code: name for name, code in TRANSACTION_TYPES.items()}
+
+
+def encode_transaction(transaction):
+    """Encodes a standalone Transaction record to bytes."""
+    out = bytearray(TRANSACTION_MAGIC)
+    out.append(VERSION)
+    flag_at = len(out)
+    out.append(TRANSACTION_TYPES[transaction.transaction_type])
+    if isinstance(transaction.transaction_id, int):
+        out.append(0)
+        _write_varint(out, transaction.transaction_id)
+    else:
+        out.append(1)
+        _write_str(out, str(transaction.transaction_id))
+    _write_varint(out, transaction.user_id)
+    _write_str(out, transaction.share_symbol)
+    _write_quantity(out, transaction.quantity, flag_at)
+    _write_varint(out, _TimestampCodec().to_epoch_us(transaction.timestamp))
+    return bytes(out)
+
+
+def decode_transaction(data, cls=Transaction):
+    """Decodes bytes from encode_transaction; cls lets callers rebuild their own Transaction type."""
+    reader = _Reader(bytes(data))
+    reader.expect(TRANSACTION_MAGIC)
+    code, id_tag = reader.data[reader.pos], reader.data[reader.pos + 1]
+    reader.pos += 2
+    return cls(
+        transaction_id=reader.varint() if id_tag == 0 else reader.str(),
+        user_id=reader.varint(),
+        share_symbol=reader.str(),
+        quantity=_read_quantity(reader, code & FRACTIONAL_FLAG),
+        transaction_type=_TRANSACTION_TYPE_NAMES[code & ~FRACTIONAL_FLAG],
+        timestamp=_TimestampCodec().to_iso(reader.varint())
+    )
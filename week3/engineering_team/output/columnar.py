@@ -0,0 +1,165 @@
+from array import array
+
+import numpy as np
+
+from accounts.ledger import LedgerView, TYPE_CODES, make_transaction
+from accounts.records import TransactionRecord
+
+DEPOSIT, WITHDRAWAL, BUY, SELL = (TYPE_CODES[name] for name in ('deposit', 'withdrawal', 'buy', 'sell'))
+
+
+class ColumnarLedger:
+    """Ledger backend keeping transactions as parallel typed arrays.
+
+    Cash movements store their amount in the price column with a zero quantity
+    and symbol id -1. Analytics are NumPy reductions over zero-copy views of the
+    columns; views are dropped before returning so appends can keep growing the
+    underlying arrays.
+    """
+    def __init__(self):
+        self.type_codes = array('b')
+        self.symbol_ids = array('i')
+        self.quantities = array('d')
+        self.prices = array('d')
+        self.timestamps = array('q')
+        self.symbols = []
+        self._symbol_index = {}
+
+    def symbol_id(self, symbol):
+        """Returns the interned id for a symbol, assigning one on first use."""
+        sid = self._symbol_index.get(symbol)
+        if sid is None:
+            sid = self._symbol_index[symbol] = len(self.symbols)
+            self.symbols.append(symbol)
+        return sid
+
+    def append(self, entry):
+        """Appends one TransactionRecord or transaction dict as a row across the columns."""
+        entry = TransactionRecord.from_entry(entry)
+        if entry.is_trade:
+            sid, quantity, price = self.symbol_id(entry.symbol), entry.quantity, entry.price
+        else:
+            sid, quantity, price = -1, 0.0, entry.amount
+        self.type_codes.append(entry.transaction_type)
+        self.symbol_ids.append(sid)
+        self.quantities.append(quantity)
+        self.prices.append(price)
+        self.timestamps.append(entry.timestamp_ns)
+
+    def extend(self, entries):
+        for entry in entries:
+            self.append(entry)
+
+    def read(self, position):
+        """Rebuilds the TransactionRecord for one row."""
+        sid = self.symbol_ids[position]
+        return make_transaction(
+            self.type_codes[position],
+            self.symbols[sid] if sid >= 0 else '',
+            self.quantities[position],
+            self.prices[position],
+            self.timestamps[position]
+        )
+
+    def view(self):
+        return LedgerView(self)
+
+    def __len__(self):
+        return len(self.type_codes)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return self.view()[index]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("ledger index out of range")
+        return self.read(index)
+
+    def __iter__(self):
+        return iter(self.view())
+
+    def _columns(self):
+        return (
+            np.frombuffer(self.type_codes, dtype=np.int8),
+            np.frombuffer(self.symbol_ids, dtype=np.int32),
+            np.frombuffer(self.quantities, dtype=np.float64),
+            np.frombuffer(self.prices, dtype=np.float64),
+        )
+
+    def cash_flow(self):
+        """Returns total cash moved per transaction type and the net external deposit."""
+        codes, _, quantities, prices = self._columns()
+        trade_value = quantities * prices
+        totals = {
+            'deposits': float(prices[codes == DEPOSIT].sum()),
+            'withdrawals': float(prices[codes == WITHDRAWAL].sum()),
+            'buys': float(trade_value[codes == BUY].sum()),
+            'sells': float(trade_value[codes == SELL].sum()),
+        }
+        totals['net_deposits'] = totals['deposits'] - totals['withdrawals']
+        return totals
+
+    def turnover(self, symbol=None):
+        """Returns the traded notional, optionally restricted to one symbol."""
+        codes, sids, quantities, prices = self._columns()
+        mask = (codes == BUY) | (codes == SELL)
+        if symbol is not None:
+            if symbol not in self._symbol_index:
+                return 0.0
+            mask &= sids == self._symbol_index[symbol]
+        return float(np.dot(quantities[mask], prices[mask]))
+
+    def _trade_totals(self):
+        """Per-symbol buy cost, sell proceeds and average-cost basis of open positions."""
+        codes, sids, quantities, prices = self._columns()
+        trades = (codes == BUY) | (codes == SELL)
+        n_symbols = len(self.symbols)
+        sid = sids[trades]
+        is_buy = codes[trades] == BUY
+        quantity = quantities[trades]
+        value = quantity * prices[trades]
+        buy_cost = np.bincount(sid, weights=np.where(is_buy, value, 0.0), minlength=n_symbols)
+        proceeds = np.bincount(sid, weights=np.where(is_buy, 0.0, value), minlength=n_symbols)
+        if not len(sid):
+            return buy_cost, proceeds, np.zeros(n_symbols)
+
+        # Group trades by symbol, keeping chronological order inside each group.
+        order = np.argsort(sid, kind='stable')
+        sid, is_buy, quantity, value = sid[order], is_buy[order], quantity[order], value[order]
+        starts = np.flatnonzero(np.r_[True, sid[1:] != sid[:-1]])
+        group = np.repeat(np.arange(len(starts)), np.diff(np.r_[starts, len(sid)]))
+
+        def grouped_suffix(values):
+            # Sum of values strictly after each row within its own group.
+            running = np.cumsum(values)
+            group_total = running[np.r_[starts[1:] - 1, len(values) - 1]]
+            return group_total[group] - running
+
+        position = np.cumsum(np.where(is_buy, quantity, -quantity))
+        position -= np.r_[0.0, position[starts[1:] - 1]][group]
+        closed = np.isclose(position, 0.0)
+        # Average cost: a buy adds its cost, a sell scales the remaining basis by
+        # position_after / position_before. Only buys after the position last
+        # went flat still contribute, scaled by every later sell.
+        previous = position + np.where(is_buy, -quantity, quantity)
+        shrink = np.where(is_buy | closed, 0.0, np.log(np.where(closed, 1.0, position) / np.where(previous > 0, previous, 1.0)))
+        live = is_buy & (grouped_suffix(closed.astype(np.float64)) == 0)
+        contribution = np.where(live, value * np.exp(grouped_suffix(shrink)), 0.0)
+        basis = np.bincount(sid, weights=contribution, minlength=n_symbols)
+        return buy_cost, proceeds, basis
+
+    def cost_basis(self):
+        """Returns the average-cost basis of each open position, keyed by symbol."""
+        _, _, basis = self._trade_totals()
+        return {symbol: float(basis[sid]) for sid, symbol in enumerate(self.symbols) if basis[sid] > 0}
+
+    def realized_pnl(self, symbol=None):
+        """Returns realized profit/loss under the average-cost method."""
+        buy_cost, proceeds, basis = self._trade_totals()
+        realized = proceeds - (buy_cost - basis)
+        if symbol is None:
+            return float(realized.sum())
+        if symbol not in self._symbol_index:
+            return 0.0
+        return float(realized[self._symbol_index[symbol]])
@@ -0,0 +1,117 @@
+import heapq
+from operator import itemgetter
+
+
+class ExposureIndex:
+    """Reverse index from symbol to the accounts holding it and how much.
+
+    Tracked accounts report every transaction through their listener hook,
+    and only the traded symbol's entry for that account is touched, so the
+    index stays current in O(1) per trade. Total exposure per symbol is kept
+    alongside the per-account quantities and read without scanning holders.
+
+    Symbols are marked at their last traded or revalued price. Holdings an
+    account already has when it is tracked are marked with get_share_price,
+    or the account's price_provider without one; with neither they stay
+    unmarked, and valued at 0, until they trade or are revalued.
+    """
+    def __init__(self, accounts=(), get_share_price=None):
+        self.get_share_price = get_share_price
+        self._accounts = {}
+        self._holders = {}
+        self._totals = {}
+        self._marks = {}
+        for account in accounts:
+            self.track(account)
+
+    def track(self, account):
+        """Indexes the account's current holdings and follows its future trades."""
+        if account.user_id in self._accounts:
+            raise ValueError("Account already tracked.")
+        self._accounts[account.user_id] = account
+        get_share_price = self.get_share_price or account.price_provider
+        for symbol, quantity in account.holdings.items():
+            self._set(account.user_id, symbol, quantity)
+            if get_share_price is not None and symbol not in self._marks:
+                self._marks[symbol] = get_share_price(symbol)
+        account.add_listener(self._on_transaction)
+
+    def untrack(self, account):
+        """Removes the account from the index and stops following it."""
+        if self._accounts.pop(account.user_id, None) is None:
+            return
+        account.remove_listener(self._on_transaction)
+        for symbol in list(self._holders):
+            self._set(account.user_id, symbol, 0)
+
+    def _on_transaction(self, account, entries):
+        for entry in entries:
+            symbol = entry.get('symbol')
+            if symbol is not None:
+                self._marks[symbol] = entry['price']
+                self._set(account.user_id, symbol, account.holdings.get(symbol, 0))
+
+    def _set(self, user_id, symbol, quantity):
+        holders = self._holders.get(symbol)
+        held = holders.get(user_id, 0) if holders is not None else 0
+        if quantity == held:
+            return
+        if quantity:
+            if holders is None:
+                holders = self._holders[symbol] = {}
+            holders[user_id] = quantity
+        else:
+            del holders[user_id]
+        total = self._totals.get(symbol, 0) + quantity - held
+        if holders:
+            self._totals[symbol] = total
+        else:
+            del self._holders[symbol]
+            del self._totals[symbol]
+
+    def total_exposure(self, symbol):
+        """Total quantity of the symbol held across all tracked accounts."""
+        return self._totals.get(symbol, 0)
+
+    def exposure_value(self, symbol, price=None):
+        """Market value of the total exposure, at price or the last traded/revalued price."""
+        if price is None:
+            price = self._marks.get(symbol, 0.0)
+        return self.total_exposure(symbol) * price
+
+    def holders(self, symbol):
+        """Returns {user_id: quantity} for every account holding the symbol."""
+        return dict(self._holders.get(symbol, {}))
+
+    def top_holders(self, symbol, n=10):
+        """Returns the n largest (user_id, quantity) positions in the symbol, largest first."""
+        return heapq.nlargest(n, self._holders.get(symbol, {}).items(), key=itemgetter(1))
+
+    def symbols(self):
+        return list(self._holders)
+
+    def revalue(self, symbol, price):
+        """Applies a price move to every holder of the symbol.
+
+        Returns {user_id: change in market value} since the previous mark.
+        Holders with a tracked IncrementalValuation get the tick directly, so
+        their get_portfolio_value() reflects it immediately. Usable as a
+        PriceTicker callback.
+        """
+        previous = self._marks.get(symbol)
+        self._marks[symbol] = price
+        changes = {}
+        for user_id, quantity in self._holders.get(symbol, {}).items():
+            changes[user_id] = quantity * (price - previous) if previous is not None else 0.0
+            valuation = self._accounts[user_id].valuation
+            if valuation is not None:
+                valuation.on_price(symbol, price)
+        return changes
+
+    def close(self):
+        """Stops following every tracked account."""
+        for account in list(self._accounts.values()):
+            account.remove_listener(self._on_transaction)
+        self._accounts.clear()
+        self._holders.clear()
+        self._totals.clear()
@@ -0,0 +1,84 @@
+"""Compares throughput of the sync (thread pool) and async request paths.
+
+Each simulated session deposits, buys, sells and views its portfolio against
+a price source with a fixed artificial latency, which is where a real quote
+service would spend its time. The sync mode mimics Gradio's default worker
+thread pool; the async mode runs every session on one event loop.
+
+    python load_test.py --sessions 2000 --latency-ms 20
+"""
+import argparse
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from account_registry import AccountRegistry
+from accounts import get_share_price
+from async_service import AsyncAccountService
+
+SYMBOLS = ('AAPL', 'TSLA', 'GOOGL', 'MSFT')
+
+
+def run_sync(sessions, latency, workers):
+    registry = AccountRegistry()
+
+    def slow_price(symbol):
+        time.sleep(latency)
+        return get_share_price(symbol)
+
+    def session(i):
+        account = registry.create(f'user{i}', 'pw', f'user{i}@example.com')
+        symbol = SYMBOLS[i % len(SYMBOLS)]
+        with registry.locked(account.user_id, 'deposit') as locked:
+            locked.deposit(10000.0)
+        with registry.locked(account.user_id, 'buy_shares') as locked:
+            locked.buy_shares(symbol, 2, slow_price)
+        with registry.locked(account.user_id, 'sell_shares') as locked:
+            locked.sell_shares(symbol, 1, slow_price)
+        with registry.locked(account.user_id, 'view_portfolio') as locked:
+            locked.get_portfolio_value(slow_price)
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        list(pool.map(session, range(sessions)))
+    return time.perf_counter() - started
+
+
+async def run_async(sessions, latency):
+    async def slow_price(symbol):
+        await asyncio.sleep(latency)
+        return get_share_price(symbol)
+
+    service = AsyncAccountService(get_share_price=slow_price)
+
+    async def session(i):
+        account = await service.create_account(f'user{i}', 'pw', f'user{i}@example.com')
+        symbol = SYMBOLS[i % len(SYMBOLS)]
+        await service.deposit(account.user_id, 10000.0)
+        await service.buy_shares(account.user_id, symbol, 2)
+        await service.sell_shares(account.user_id, symbol, 1)
+        await service.get_portfolio_value(account.user_id)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(session(i) for i in range(sessions)))
+    return time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sessions', type=int, default=1000)
+    parser.add_argument('--latency-ms', type=float, default=20.0, help="artificial price lookup latency")
+    parser.add_argument('--workers', type=int, default=40, help="sync thread pool size (Gradio's default is 40)")
+    args = parser.parse_args()
+    latency = args.latency_ms / 1000
+    operations = args.sessions * 5
+
+    sync_elapsed = run_sync(args.sessions, latency, args.workers)
+    async_elapsed = asyncio.run(run_async(args.sessions, latency))
+    print(f"{args.sessions} sessions, {operations} operations, {args.latency_ms:g} ms price latency")
+    print(f"sync  ({args.workers} threads): {sync_elapsed:8.3f} s  {operations / sync_elapsed:10.0f} ops/s")
+    print(f"async (event loop):  {async_elapsed:8.3f} s  {operations / async_elapsed:10.0f} ops/s")
+
+
+if __name__ == '__main__':
+    main()
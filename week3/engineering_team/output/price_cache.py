@@ -0,0 +1,104 @@
+import threading
+import time
+from collections import OrderedDict
+
+
+class _Flight:
+    """A price lookup in progress that concurrent callers for the same symbol wait on."""
+    __slots__ = ('done', 'price', 'error')
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.price = None
+        self.error = None
+
+
+class CachingPriceProvider:
+    """TTL + LRU cache in front of any get_share_price(symbol) callable.
+
+    Instances are themselves get_share_price callables, so they can be passed
+    straight to buy_shares, sell_shares and get_portfolio_value. Concurrent
+    misses for the same symbol are collapsed into a single upstream call.
+    """
+    def __init__(self, get_share_price, ttl=5.0, maxsize=1024, clock=time.monotonic):
+        if maxsize <= 0:
+            raise ValueError("Cache size must be positive.")
+        self.get_share_price = get_share_price
+        self.ttl = ttl  # seconds, or a callable returning the TTL for a symbol
+        self.maxsize = maxsize
+        self.clock = clock
+        self._entries = OrderedDict()  # symbol -> (price, expires_at)
+        self._inflight = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.coalesced = 0
+
+    def _ttl_for(self, symbol):
+        return self.ttl(symbol) if callable(self.ttl) else self.ttl
+
+    def __call__(self, symbol):
+        with self._lock:
+            entry = self._entries.get(symbol)
+            if entry is not None and entry[1] > self.clock():
+                self._entries.move_to_end(symbol)
+                self.hits += 1
+                return entry[0]
+            flight = self._inflight.get(symbol)
+            leader = flight is None
+            if leader:
+                flight = self._inflight[symbol] = _Flight()
+                self.misses += 1
+            else:
+                self.coalesced += 1
+
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.price
+
+        try:
+            flight.price = self.get_share_price(symbol)
+        except Exception as exc:
+            flight.error = exc
+            raise
+        else:
+            self._store(symbol, flight.price)
+            return flight.price
+        finally:
+            with self._lock:
+                del self._inflight[symbol]
+            flight.done.set()
+
+    def _store(self, symbol, price):
+        with self._lock:
+            self._entries[symbol] = (price, self.clock() + self._ttl_for(symbol))
+            self._entries.move_to_end(symbol)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def get_share_prices(self, symbols):
+        """Batch form, usable as the price provider for valuation.value_portfolios."""
+        return {symbol: self(symbol) for symbol in symbols}
+
+    def invalidate(self, symbol=None):
+        """Drops one cached symbol, or the whole cache when no symbol is given."""
+        with self._lock:
+            if symbol is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(symbol, None)
+
+    def stats(self):
+        """Returns the hit/miss/eviction counters and current cache size."""
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'coalesced': self.coalesced,
+                'evictions': self.evictions,
+                'size': len(self._entries)
+            }
@@ -0,0 +1,118 @@
+import csv
+import math
+import random
+import time
+from datetime import datetime, timedelta
+
+from accounts import get_share_price
+
+DEFAULT_SYMBOLS = ('AAPL', 'TSLA', 'GOOGL')
+
+
+def random_walk(symbols=DEFAULT_SYMBOLS, steps=1000, start_prices=None, volatility=0.01, drift=0.0,
+                interval=timedelta(seconds=1), start=datetime(2024, 1, 1), seed=None):
+    """Yields (timestamp, {symbol: price}) bars from a geometric random walk.
+
+    Prices start at start_prices (default: the fixed get_share_price quotes)
+    and move by exp(drift + volatility * N(0, 1)) each step. A seed makes
+    the stream reproducible.
+    """
+    rng = random.Random(seed)
+    prices = dict(start_prices) if start_prices is not None else {symbol: get_share_price(symbol) for symbol in symbols}
+    timestamp = start
+    for _ in range(steps):
+        prices = {symbol: round(price * math.exp(drift + volatility * rng.gauss(0.0, 1.0)), 4) for symbol, price in prices.items()}
+        yield timestamp, prices
+        timestamp += interval
+
+
+def read_csv(path):
+    """Yields bars from a CSV with timestamp, symbol and price (or close) columns.
+
+    Consecutive rows sharing a timestamp form one bar; timestamps are ISO-8601.
+    """
+    with open(path, newline='') as f:
+        reader = csv.DictReader(f)
+        price_column = 'price' if 'price' in reader.fieldnames else 'close'
+        timestamp, prices = None, {}
+        for row in reader:
+            if row['timestamp'] != timestamp:
+                if prices:
+                    yield datetime.fromisoformat(timestamp), prices
+                timestamp, prices = row['timestamp'], {}
+            prices[row['symbol']] = float(row[price_column])
+        if prices:
+            yield datetime.fromisoformat(timestamp), prices
+
+
+def write_csv(bars, path):
+    """Writes bars in the long timestamp,symbol,price layout read_csv expects."""
+    with open(path, 'w', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(('timestamp', 'symbol', 'price'))
+        for timestamp, prices in bars:
+            for symbol, price in prices.items():
+                writer.writerow((timestamp.isoformat(), symbol, price))
+
+
+def read_parquet(path):
+    """Yields bars from a Parquet file with the same columns as read_csv. Requires pyarrow."""
+    try:
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise ImportError("read_parquet requires pyarrow (pip install pyarrow)") from None
+    table = pq.read_table(path)
+    price_column = 'price' if 'price' in table.column_names else 'close'
+    columns = zip(*(table.column(name).to_pylist() for name in ('timestamp', 'symbol', price_column)))
+    timestamp, prices = None, {}
+    for row_timestamp, symbol, price in columns:
+        if row_timestamp != timestamp:
+            if prices:
+                yield _as_datetime(timestamp), prices
+            timestamp, prices = row_timestamp, {}
+        prices[symbol] = float(price)
+    if prices:
+        yield _as_datetime(timestamp), prices
+
+
+def _as_datetime(value):
+    return datetime.fromisoformat(value) if isinstance(value, str) else value
+
+
+class PriceFeed:
+    """Replays a stream of bars, optionally paced, and quotes the latest prices.
+
+    Iterating advances the feed one bar at a time. rate is the number of bars
+    per second to replay at; None replays as fast as the consumer pulls.
+    get_share_price / get_share_prices return the most recent bar's prices,
+    so the feed can be passed anywhere a price provider is expected.
+    """
+    def __init__(self, bars, rate=None):
+        self._bars = iter(bars)
+        self.rate = rate
+        self.prices = {}
+        self.timestamp = None
+        self.bars = 0
+
+    def __iter__(self):
+        started = time.perf_counter()
+        for timestamp, prices in self._bars:
+            if self.rate:
+                delay = started + self.bars / self.rate - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+            self.timestamp = timestamp
+            self.prices.update(prices)
+            self.bars += 1
+            yield timestamp, prices
+
+    def get_share_price(self, symbol):
+        try:
+            return self.prices[symbol]
+        except KeyError:
+            raise ValueError(f"No price for {symbol} yet.") from None
+
+    __call__ = get_share_price
+
+    def get_share_prices(self, symbols):
+        return {symbol: self.get_share_price(symbol) for symbol in symbols}
@@ -0,0 +1,246 @@
+import itertools
+import math
+import multiprocessing
+import os
+import threading
+
+from account_registry import AccountRegistry
+from accounts import UserAccount, get_share_price
+from accounts.valuation import batch_price_provider, value_portfolios
+
+
+class _Shard:
+    """The accounts owned by one worker process."""
+    def __init__(self, get_share_price, account_class):
+        self.get_share_price = get_share_price
+        self.get_share_prices = batch_price_provider(get_share_price)
+        self.registry = AccountRegistry(account_class)
+
+    def create(self, user_id, username, password, email, balance):
+        self.registry.add(self.registry.account_class(user_id, username, password, email, balance))
+        return user_id
+
+    def deposit(self, user_id, amount):
+        account = self.registry.get(user_id)
+        account.deposit(amount)
+        return account.balance
+
+    def withdraw(self, user_id, amount):
+        account = self.registry.get(user_id)
+        account.withdraw(amount)
+        return account.balance
+
+    def buy_shares(self, user_id, symbol, quantity):
+        account = self.registry.get(user_id)
+        account.buy_shares(symbol, quantity, self.get_share_price)
+        return dict(account.holdings)
+
+    def sell_shares(self, user_id, symbol, quantity):
+        account = self.registry.get(user_id)
+        account.sell_shares(symbol, quantity, self.get_share_price)
+        return dict(account.holdings)
+
+    def get_portfolio_value(self, user_id):
+        return self.registry.get(user_id).get_portfolio_value(self.get_share_price)
+
+    def get_account(self, user_id):
+        return self.registry.get(user_id).to_dict()
+
+    def aum(self):
+        return math.fsum(value_portfolios(self.registry, self.get_share_prices))
+
+    def exposure(self):
+        quantities = {}
+        for account in self.registry:
+            for symbol, quantity in account.holdings.items():
+                quantities[symbol] = quantities.get(symbol, 0) + quantity
+        prices = self.get_share_prices(list(quantities))
+        return {symbol: (quantity, quantity * prices[symbol]) for symbol, quantity in quantities.items()}
+
+    def count(self):
+        return len(self.registry)
+
+
+def _serve(connection, get_share_price, account_class):
+    """Worker loop: runs (method, args) requests against the shard until told to stop."""
+    shard = _Shard(get_share_price, account_class)
+    while True:
+        try:
+            request = connection.recv()
+        except EOFError:
+            break
+        if request is None:
+            break
+        method, args = request
+        try:
+            result = getattr(shard, method)(*args)
+        except Exception as exc:
+            connection.send((False, exc))
+        else:
+            connection.send((True, result))
+    connection.close()
+
+
+def _not_running(shard):
+    return ConnectionError(f"Shard {shard} is not running.")
+
+
+class ShardedEngine:
+    """Accounts partitioned by user_id across worker processes.
+
+    Each shard is a process owning its accounts outright and serving
+    requests over a Pipe. Single-account calls go to shard user_id % shards;
+    aggregate queries are scattered to every shard first and gathered
+    afterwards, so the shards compute in parallel on separate cores.
+    Exceptions raised in a shard are re-raised in the caller; a shard whose
+    process has died raises ConnectionError.
+
+    get_share_price and account_class must be picklable (module-level) when
+    the start method is not fork.
+    """
+    def __init__(self, shards=None, get_share_price=get_share_price, account_class=UserAccount, start_method=None):
+        context = multiprocessing.get_context(start_method)
+        self._connections = []
+        self._processes = []
+        self._locks = []
+        for _ in range(shards or os.cpu_count() or 1):
+            connection, child = context.Pipe()
+            process = context.Process(target=_serve, args=(child, get_share_price, account_class), daemon=True)
+            process.start()
+            child.close()
+            self._connections.append(connection)
+            self._processes.append(process)
+            self._locks.append(threading.Lock())
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+        self._usernames = set()
+        self._emails = set()
+
+    @property
+    def shards(self):
+        return len(self._connections)
+
+    def shard_for(self, user_id):
+        """Returns the index of the shard owning the given account."""
+        try:
+            return int(user_id) % len(self._connections)
+        except (TypeError, ValueError):
+            raise ValueError("Account not found.") from None
+
+    def _call(self, shard, method, *args):
+        with self._locks[shard]:
+            try:
+                self._connections[shard].send((method, args))
+                ok, result = self._connections[shard].recv()
+            except (EOFError, OSError) as exc:
+                raise _not_running(shard) from exc
+        if not ok:
+            raise result
+        return result
+
+    def _scatter(self, method, *args):
+        """Sends one request to every shard, then collects the replies in shard order.
+
+        Every live shard's reply is read even when another shard has died,
+        so no stale reply is left in a pipe for the next request.
+        """
+        for lock in self._locks:
+            lock.acquire()
+        try:
+            replies, sent = [None] * len(self._connections), []
+            for shard, connection in enumerate(self._connections):
+                try:
+                    connection.send((method, args))
+                    sent.append(shard)
+                except OSError:
+                    replies[shard] = (False, _not_running(shard))
+            for shard in sent:
+                try:
+                    replies[shard] = self._connections[shard].recv()
+                except (EOFError, OSError):
+                    replies[shard] = (False, _not_running(shard))
+        finally:
+            for lock in self._locks:
+                lock.release()
+        for ok, result in replies:
+            if not ok:
+                raise result
+        return [result for _, result in replies]
+
+    def create_account(self, username, password, email, balance=0.0):
+        """Creates an account on its shard and returns the new user id.
+
+        The username and email are reserved up front and released again if
+        the shard fails to create the account.
+        """
+        with self._lock:
+            if username in self._usernames:
+                raise ValueError("Username already taken.")
+            if email in self._emails:
+                raise ValueError("Email already registered.")
+            user_id = next(self._ids)
+            self._usernames.add(username)
+            self._emails.add(email)
+        try:
+            return self._call(self.shard_for(user_id), 'create', user_id, username, password, email, balance)
+        except Exception:
+            with self._lock:
+                self._usernames.discard(username)
+                self._emails.discard(email)
+            raise
+
+    def deposit(self, user_id, amount):
+        return self._call(self.shard_for(user_id), 'deposit', user_id, amount)
+
+    def withdraw(self, user_id, amount):
+        return self._call(self.shard_for(user_id), 'withdraw', user_id, amount)
+
+    def buy_shares(self, user_id, symbol, quantity):
+        return self._call(self.shard_for(user_id), 'buy_shares', user_id, symbol, quantity)
+
+    def sell_shares(self, user_id, symbol, quantity):
+        return self._call(self.shard_for(user_id), 'sell_shares', user_id, symbol, quantity)
+
+    def get_portfolio_value(self, user_id):
+        return self._call(self.shard_for(user_id), 'get_portfolio_value', user_id)
+
+    def get_account(self, user_id):
+        """Returns a to_dict() snapshot of the account."""
+        return self._call(self.shard_for(user_id), 'get_account', user_id)
+
+    def total_aum(self):
+        """Total assets under management: cash plus market value across every shard."""
+        return math.fsum(self._scatter('aum'))
+
+    def exposure(self):
+        """Returns {symbol: (total quantity held, market value)} across every shard."""
+        totals = {}
+        for shard_exposure in self._scatter('exposure'):
+            for symbol, (quantity, value) in shard_exposure.items():
+                held, worth = totals.get(symbol, (0, 0.0))
+                totals[symbol] = (held + quantity, worth + value)
+        return totals
+
+    def __len__(self):
+        return sum(self._scatter('count'))
+
+    def close(self):
+        """Stops the worker processes."""
+        for lock, connection in zip(self._locks, self._connections):
+            with lock:
+                try:
+                    connection.send(None)
+                except (BrokenPipeError, OSError):
+                    pass
+                connection.close()
+        for process in self._processes:
+            process.join(timeout=5)
+            if process.is_alive():
+                process.terminate()
+        self._connections, self._processes, self._locks = [], [], []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
@@ -0,0 +1,316 @@
+import json
+import os
+import threading
+import time
+
+from accounts import MmapLedger, UserAccount
+from accounts.checkpoints import HoldingsCheckpoints
+
+SNAPSHOT_FILE = 'snapshot.json'
+WAL_PREFIX = 'wal-'
+WAL_SUFFIX = '.log'
+LEDGER_PREFIX = 'account-'
+LEDGER_SUFFIX = '.ledger'
+
+
+def _wal_segments(directory):
+    """Returns (first_lsn, path) for every WAL segment in the directory, oldest first."""
+    segments = []
+    for name in os.listdir(directory):
+        if name.startswith(WAL_PREFIX) and name.endswith(WAL_SUFFIX):
+            segments.append((int(name[len(WAL_PREFIX):-len(WAL_SUFFIX)]), os.path.join(directory, name)))
+    return sorted(segments)
+
+
+def _read_records(path):
+    """Reads a WAL segment, truncating a torn final write left behind by a crash."""
+    records = []
+    valid = 0
+    with open(path, 'rb') as f:
+        for line in f:
+            if not line.endswith(b'\n'):
+                break
+            records.append(json.loads(line))
+            valid += len(line)
+    if os.path.getsize(path) > valid:
+        os.truncate(path, valid)
+    return records
+
+
+def _fold_record(states, record):
+    """Applies a WAL record to the snapshot states: identity and holdings checkpoints per account."""
+    if record['op'] == 'open':
+        data = record['account']
+        checkpoints = HoldingsCheckpoints(UserAccount.from_dict(data))
+        states[data['user_id']] = {
+            'user_id': data['user_id'],
+            'username': data['username'],
+            'password': data['password'],
+            'email': data['email'],
+            'checkpoints': HoldingsCheckpoints.from_dict(checkpoints.to_dict()),  # detached from the account
+        }
+        return
+    checkpoints = states[record['user_id']]['checkpoints']
+    for entry in record['entries']:
+        checkpoints.append(entry)
+
+
+def _fsync_dir(directory):
+    if hasattr(os, 'O_DIRECTORY'):
+        fd = os.open(directory, os.O_RDONLY | os.O_DIRECTORY)
+        try:
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+
+
+class AccountStore:
+    """Durable account storage: a write-ahead log plus periodic compact snapshots.
+
+    Every transaction of a registered account is appended to the WAL as one
+    JSON line through the account's journal hook, before the account changes,
+    so persisting a trade costs O(1) regardless of history and a failed write
+    leaves the account untouched. An execute_orders batch is one line too, so
+    it is replayed all or nothing. Concurrent writers are group-committed:
+    whichever thread reaches the commit first writes and fsyncs everything
+    pending, and the others return once their record is covered. If a WAL
+    write fails, the store is marked failed: every writer whose record was
+    not yet durable gets an OSError, and so does every later write, since
+    what reached the file is unknown; reopen the store to recover.
+
+    Each account's history lives in its own MmapLedger file in the store
+    directory. A checkpoint seals the current WAL segment and folds it into
+    the in-memory snapshot states, then writes them out. A state is the
+    account's HoldingsCheckpoints, built from the log itself so it never
+    races with live accounts: its latest entry is the balance, holdings and
+    ledger length, and the periodic ones answer point-in-time queries.
+    Recovery loads the snapshot, truncates each ledger to the snapshotted
+    length, hands the account its checkpoints and replays only the WAL tail.
+    """
+    def __init__(self, directory, snapshot_every=10000, fsync=True):
+        self.directory = directory
+        self.snapshot_every = snapshot_every
+        self.fsync = fsync
+        os.makedirs(directory, exist_ok=True)
+        self._append_lock = threading.Lock()
+        self._commit_lock = threading.Lock()
+        self._checkpoint_lock = threading.Lock()
+        self._pending = []
+        self._next_lsn = 0
+        self._durable_lsn = 0
+        self._failure = None
+        self._since_checkpoint = 0
+        self._checkpoint_thread = None
+        self.accounts = self._recover()
+        for account in self.accounts.values():
+            account.journal = self._log
+        self._segment_start = self._next_lsn + 1
+        self._wal = open(self._segment_path(self._segment_start), 'ab')
+
+    def _segment_path(self, first_lsn):
+        return os.path.join(self.directory, f'{WAL_PREFIX}{first_lsn:020d}{WAL_SUFFIX}')
+
+    def _ledger_path(self, user_id):
+        return os.path.join(self.directory, f'{LEDGER_PREFIX}{user_id}{LEDGER_SUFFIX}')
+
+    def _open_ledger(self, user_id, length):
+        """Opens an account's ledger file, dropping records past the given length."""
+        ledger = MmapLedger(self._ledger_path(user_id))
+        if len(ledger) < length:
+            ledger.close()
+            raise ValueError(f"Ledger of account {user_id} is shorter than the snapshot says.")
+        ledger.truncate(length)
+        return ledger
+
+    def _recover(self):
+        snapshot, self._folded_lsn = self._load_snapshot()
+        self._states = {}
+        accounts = {}
+        for user_id, data in snapshot.items():
+            checkpoints = HoldingsCheckpoints.from_dict(data['checkpoints'])
+            self._states[user_id] = {**data, 'checkpoints': checkpoints}
+            account = UserAccount(
+                user_id=user_id,
+                username=data['username'],
+                password=data['password'],
+                email=data['email'],
+                ledger=self._open_ledger(user_id, checkpoints.position),
+            )
+            account.balance_units, account.holdings, _ = checkpoints.latest()
+            account.checkpoints = HoldingsCheckpoints.from_dict(data['checkpoints'], account)
+            accounts[user_id] = account
+        self._next_lsn = self._folded_lsn
+        for _, path in _wal_segments(self.directory):
+            for record in _read_records(path):
+                if record['lsn'] > self._folded_lsn:
+                    self._replay(accounts, record)
+                    self._next_lsn = record['lsn']
+        self._durable_lsn = self._next_lsn
+        return accounts
+
+    def _replay(self, accounts, record):
+        if record['op'] == 'open':
+            data = record['account']
+            accounts[data['user_id']] = UserAccount.from_dict(data, ledger=self._open_ledger(data['user_id'], 0))
+        else:
+            account = accounts[record['user_id']]
+            for entry in record['entries']:
+                account.apply_transaction(entry)
+
+    def _load_snapshot(self):
+        path = os.path.join(self.directory, SNAPSHOT_FILE)
+        if not os.path.exists(path):
+            return {}, 0
+        with open(path, 'r') as f:
+            snapshot = json.load(f)
+        return {state['user_id']: state for state in snapshot['accounts']}, snapshot['lsn']
+
+    def register(self, account):
+        """Starts persisting an account; its current state is logged as the opening record.
+
+        The account's history moves to a ledger file owned by the store.
+        """
+        if account.user_id in self.accounts:
+            raise ValueError("User id already registered.")
+        if account.journal is not None:
+            raise ValueError("Account is already journaled elsewhere.")
+        ledger = self._open_ledger(account.user_id, 0)
+        ledger.extend(account.transactions)
+        account.transactions = ledger
+        account.history_index = None
+        self.accounts[account.user_id] = account
+        self._commit(self._append({'op': 'open', 'account': account.to_dict()}))
+        account.journal = self._log
+        return account
+
+    def _log(self, account, entries):
+        self._commit(self._append({'op': 'txn', 'user_id': account.user_id, 'entries': [dict(entry) for entry in entries]}))
+
+    def _append(self, record):
+        with self._append_lock:
+            self._next_lsn += 1
+            record['lsn'] = self._next_lsn
+            self._pending.append(json.dumps(record, separators=(',', ':')).encode('utf-8') + b'\n')
+            self._since_checkpoint += 1
+            if self.snapshot_every and self._since_checkpoint >= self.snapshot_every:
+                self._since_checkpoint = 0
+                self._start_background_checkpoint()
+            return self._next_lsn
+
+    def _commit(self, lsn):
+        with self._commit_lock:
+            if self._durable_lsn >= lsn:
+                return  # another writer's commit already covered this record
+            self._check_failure()
+            with self._append_lock:
+                batch, self._pending = self._pending, []
+                batch_lsn = self._next_lsn
+                wal = self._wal
+            self._write_batch(wal, batch)
+            self._durable_lsn = batch_lsn
+
+    def _write_batch(self, wal, batch):
+        try:
+            wal.write(b''.join(batch))
+            wal.flush()
+            if self.fsync:
+                os.fsync(wal.fileno())
+        except BaseException as exc:
+            self._failure = exc
+            raise
+
+    def _check_failure(self):
+        if self._failure is not None:
+            raise OSError(
+                f"Account store log write failed; nothing after LSN {self._durable_lsn} is durable. "
+                "Reopen the store to recover."
+            ) from self._failure
+
+    def checkpoint(self):
+        """Seals the current WAL segment and folds all sealed segments into a new snapshot."""
+        with self._checkpoint_lock:
+            with self._commit_lock:
+                self._check_failure()
+                with self._append_lock:
+                    if self._next_lsn < self._segment_start:
+                        return  # nothing logged since the last checkpoint
+                    sealed_lsn = self._next_lsn
+                    batch, self._pending = self._pending, []
+                    old_wal = self._wal
+                    self._segment_start = sealed_lsn + 1
+                    self._wal = open(self._segment_path(self._segment_start), 'ab')
+                self._write_batch(old_wal, batch)
+                old_wal.close()
+                self._durable_lsn = max(self._durable_lsn, sealed_lsn)
+
+            sealed = [(start, path) for start, path in _wal_segments(self.directory) if start <= sealed_lsn]
+            for _, path in sealed:
+                for record in _read_records(path):
+                    if self._folded_lsn < record['lsn'] <= sealed_lsn:
+                        _fold_record(self._states, record)
+            self._folded_lsn = sealed_lsn
+            if not self._sync_ledgers():
+                return  # the sealed segments stay, and the next checkpoint covers them
+            self._write_snapshot(sealed_lsn)
+            for _, path in sealed:
+                os.remove(path)
+
+    def _sync_ledgers(self, timeout=1.0):
+        """Waits until every ledger holds the records the snapshot counts, then forces them to disk.
+
+        A writer logs its record before appending it to the ledger, so a
+        sealed record may not have reached the ledger yet; gives up and
+        returns False if one still has not after timeout seconds.
+        """
+        deadline = time.monotonic() + timeout
+        for user_id, state in list(self._states.items()):
+            ledger = self.accounts[user_id].transactions
+            while len(ledger) < state['checkpoints'].position:
+                if time.monotonic() > deadline:
+                    return False
+                time.sleep(0.001)
+            if self.fsync:
+                ledger.sync()
+        return True
+
+    def _write_snapshot(self, lsn):
+        path = os.path.join(self.directory, SNAPSHOT_FILE)
+        tmp_path = path + '.tmp'
+        with open(tmp_path, 'w') as f:
+            accounts = [{**state, 'checkpoints': state['checkpoints'].to_dict()} for state in self._states.values()]
+            json.dump({'lsn': lsn, 'accounts': accounts}, f, separators=(',', ':'))
+            f.flush()
+            if self.fsync:
+                os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+        if self.fsync:
+            _fsync_dir(self.directory)
+
+    def _start_background_checkpoint(self):
+        if self._checkpoint_thread is not None and self._checkpoint_thread.is_alive():
+            return
+        self._checkpoint_thread = threading.Thread(target=self.checkpoint, name='account-store-checkpoint', daemon=True)
+        self._checkpoint_thread.start()
+
+    def close(self):
+        """Flushes pending records, waits for a running checkpoint and closes the WAL and the ledgers.
+
+        A failed store has nothing more it can flush, so it just closes.
+        """
+        thread = self._checkpoint_thread
+        if thread is not None:
+            thread.join()
+        with self._append_lock:
+            lsn = self._next_lsn
+        if self._failure is None:
+            self._commit(lsn)
+        for account in self.accounts.values():
+            account.journal = None
+            account.transactions.close()
+        self._wal.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,69 @@
+import threading
+
+import pytest
+
+from account_registry import AccountRegistry
+from accounts import UserAccount, get_share_price
+
+
+class TestAccountRegistry:
+    @pytest.fixture
+    def registry(self):
+        return AccountRegistry()
+
+    def test_lookup_by_id_username_and_email(self, registry):
+        account = registry.create('john_doe', 'password123', 'john@example.com', 1000.0)
+        assert account.user_id == 1
+        assert registry.get(1) is account
+        assert registry.get(1.0) is account  # gr.Number delivers floats
+        assert registry.get_by_username('john_doe') is account
+        assert registry.get_by_email('john@example.com') is account
+        with pytest.raises(ValueError):
+            registry.get(2)
+
+    def test_duplicates_rejected(self, registry):
+        registry.create('john_doe', 'password123', 'john@example.com')
+        with pytest.raises(ValueError):
+            registry.create('john_doe', 'other', 'other@example.com')
+        with pytest.raises(ValueError):
+            registry.create('jane_doe', 'other', 'john@example.com')
+
+    def test_add_restored_account_advances_ids(self, registry):
+        registry.add(UserAccount(user_id=10, username='old', password='pw', email='old@example.com'))
+        assert registry.create('new', 'pw', 'new@example.com').user_id == 11
+
+    def test_concurrent_creation_allocates_unique_ids(self, registry):
+        threads = [
+            threading.Thread(target=registry.create, args=(f'user{i}', 'pw', f'user{i}@example.com'))
+            for i in range(50)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert sorted(account.user_id for account in registry) == list(range(1, 51))
+
+    def test_concurrent_deposits_on_one_account(self, registry):
+        account = registry.create('john_doe', 'password123', 'john@example.com')
+
+        def deposit_many():
+            for _ in range(200):
+                with registry.locked(account.user_id, 'deposit') as locked:
+                    locked.deposit(1.0)
+
+        threads = [threading.Thread(target=deposit_many) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert account.balance == 1600.0
+        assert len(account.get_transaction_history()) == 1600
+
+    def test_latency_counters(self, registry):
+        registry.create('john_doe', 'password123', 'john@example.com', 1000.0)
+        with registry.locked(1, 'buy_shares') as account:
+            account.buy_shares('AAPL', 1, get_share_price)
+        stats = registry.stats()
+        assert stats['create']['count'] == 1
+        assert stats['buy_shares']['count'] == 1
+        assert stats['buy_shares']['max_ms'] >= stats['buy_shares']['mean_ms'] >= 0.0
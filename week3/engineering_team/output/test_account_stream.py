@@ -0,0 +1,49 @@
+import io
+
+import pytest
+
+from account_stream import dump_jsonl, iter_jsonl, load_jsonl
+from accounts import UserAccount, get_share_price
+from accounts.ledger import MmapLedger
+
+
+class TestAccountStream:
+    @pytest.fixture
+    def account(self):
+        account = UserAccount(user_id=1, username='john_doe', password='password123', email='john@example.com', balance=1000000.0)
+        for i in range(3000):
+            account.deposit(float(i + 1))
+            account.buy_shares('AAPL', 1, get_share_price)
+        account.sell_shares('AAPL', 10, get_share_price)
+        return account
+
+    def test_round_trip(self, account, tmp_path):
+        path = str(tmp_path / 'account.jsonl')
+        with open(path, 'w') as f:
+            assert dump_jsonl(account, f) == 6002
+        restored, offset = load_jsonl(path)
+        assert restored.to_dict() == account.to_dict()
+        assert offset == len(open(path, 'rb').read())
+
+    def test_load_from_iterator_into_mmap_ledger(self, account, tmp_path):
+        with MmapLedger(str(tmp_path / 'restored.ledger')) as ledger:
+            restored, _ = load_jsonl(iter_jsonl(account), ledger=ledger)
+            assert restored.to_dict() == account.to_dict()
+
+    def test_resume_from_offset(self, account):
+        data = ''.join(iter_jsonl(account)).encode('utf-8')
+        cut = len(data) // 2 + 7  # mid-line, as a crashed or in-progress writer would leave it
+        partial, offset = load_jsonl(io.BytesIO(data[:cut]))
+        assert offset < cut and data[offset - 1:offset] == b'\n'
+        resumed, end = load_jsonl(io.BytesIO(data), account=partial, offset=offset)
+        assert resumed is partial
+        assert end == len(data)
+        assert resumed.to_dict() == account.to_dict()
+
+    def test_resume_export(self, account):
+        lines = list(iter_jsonl(account))
+        assert list(iter_jsonl(account, start=100)) == lines[100:]
+
+    def test_empty_stream(self):
+        with pytest.raises(ValueError):
+            load_jsonl(iter([]))
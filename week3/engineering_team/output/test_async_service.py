@@ -0,0 +1,127 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from accounts import get_share_price
+from async_service import AsyncAccountService, async_price_provider
+
+
+def run(coroutine):
+    return asyncio.run(coroutine)
+
+
+class TestAsyncAccountService:
+    def test_operations(self):
+        async def scenario():
+            service = AsyncAccountService(get_share_price=get_share_price)
+            account = await service.create_account('john_doe', 'password123', 'john@example.com')
+            assert await service.deposit(account.user_id, 1000.0) == 1000.0
+            assert await service.buy_shares(account.user_id, 'AAPL', 5) == {'AAPL': 5}
+            assert await service.sell_shares(account.user_id, 'AAPL', 2) == {'AAPL': 3}
+            assert await service.withdraw(account.user_id, 100.0) == 450.0
+            assert await service.get_portfolio_value(account.user_id) == ({'AAPL': 3}, 900.0)
+            history = await service.get_transaction_history(account.user_id)
+            assert [t['transaction_type'] for t in history] == ['deposit', 'buy', 'sell', 'withdrawal']
+            with pytest.raises(ValueError):
+                await service.buy_shares(account.user_id, 'GOOGL', 100)
+        run(scenario())
+
+    def test_slow_prices_do_not_serialize_accounts(self):
+        async def slow_price(symbol):
+            await asyncio.sleep(0.05)
+            return 100.0
+
+        async def scenario():
+            service = AsyncAccountService(get_share_price=slow_price)
+            accounts = [await service.create_account(f'user{i}', 'pw', f'user{i}@example.com', 1000.0) for i in range(50)]
+            started = time.perf_counter()
+            await asyncio.gather(*(service.buy_shares(a.user_id, 'MSFT', 1) for a in accounts))
+            return time.perf_counter() - started
+        assert run(scenario()) < 0.5
+
+    def test_same_account_operations_are_ordered(self):
+        async def scenario():
+            service = AsyncAccountService(get_share_price=get_share_price)
+            account = await service.create_account('john_doe', 'password123', 'john@example.com', 150.0)
+            results = await asyncio.gather(
+                service.buy_shares(account.user_id, 'AAPL', 1),
+                service.buy_shares(account.user_id, 'AAPL', 1),
+                return_exceptions=True
+            )
+            assert results[0] == {'AAPL': 1}
+            assert isinstance(results[1], ValueError)
+        run(scenario())
+
+    def test_query_transactions_pages_to_the_end(self):
+        async def scenario():
+            service = AsyncAccountService(get_share_price=get_share_price)
+            account = await service.create_account('john_doe', 'password123', 'john@example.com')
+            for _ in range(5):
+                await service.deposit(account.user_id, 10.0)
+            page, cursor = await service.query_transactions(account.user_id, limit=3)
+            assert len(page) == 3 and cursor == 3
+            page, cursor = await service.query_transactions(account.user_id, limit=3, cursor=cursor)
+            assert len(page) == 2 and cursor is None
+            assert account.history_index is not None  # the account's own index serves the queries
+        run(scenario())
+
+    def test_default_price_provider(self):
+        async def scenario():
+            service = AsyncAccountService()
+            account = await service.create_account('john_doe', 'password123', 'john@example.com', 1000.0)
+            assert await service.buy_shares(account.user_id, 'AAPL', 1) == {'AAPL': 1}
+        run(scenario())
+
+    def test_lock_held_by_a_thread_does_not_block_the_loop(self):
+        async def scenario():
+            service = AsyncAccountService(get_share_price=get_share_price)
+            busy = await service.create_account('busy', 'pw', 'busy@example.com', 1000.0)
+            free = await service.create_account('free', 'pw', 'free@example.com', 1000.0)
+            lock = service.registry.lock_for(busy.user_id)
+            released = threading.Event()
+
+            def hold():
+                with lock:
+                    released.wait(timeout=2)
+
+            holder = threading.Thread(target=hold)
+            holder.start()
+            blocked = asyncio.create_task(service.deposit(busy.user_id, 1.0))
+            await asyncio.sleep(0.01)  # let it reach the held lock
+            assert await service.deposit(free.user_id, 1.0) == 1001.0
+            assert not blocked.done()
+            released.set()
+            assert await blocked == 1001.0
+            holder.join()
+        run(scenario())
+
+    def test_registry_lock_held_by_a_thread_does_not_block_the_loop(self):
+        async def scenario():
+            service = AsyncAccountService(get_share_price=get_share_price)
+            free = await service.create_account('free', 'pw', 'free@example.com', 1000.0)
+            released = threading.Event()
+
+            def hold():
+                with service.registry._lock:
+                    released.wait(timeout=2)
+
+            holder = threading.Thread(target=hold)
+            holder.start()
+            created = asyncio.create_task(service.create_account('new', 'pw', 'new@example.com'))
+            await asyncio.sleep(0.01)  # let it reach the held lock
+            assert await service.get_portfolio_value(free.user_id) == ({}, 1000.0)
+            assert not created.done()
+            released.set()
+            assert (await created).username == 'new'
+            holder.join()
+        run(scenario())
+
+    def test_sync_provider_runs_off_the_loop(self):
+        async def scenario():
+            price = async_price_provider(lambda symbol: time.sleep(0.05) or 1.0)
+            started = time.perf_counter()
+            assert await asyncio.gather(*(price('X') for _ in range(8))) == [1.0] * 8
+            return time.perf_counter() - started
+        assert run(scenario()) < 0.3
@@ -0,0 +1,24 @@
+import sys
+
+from benchmarks import compare, load_baseline, run_suite, same_python, save_baseline
+
+
+class TestBenchmarks:
+    def test_compare_flags_only_slowdowns_past_the_threshold(self):
+        baseline = {'a': 1.0, 'b': 1.0, 'c': 1.0}
+        results = {'a': 1.2, 'b': 1.3, 'c': 0.5, 'new': 9.0}
+        assert compare(results, baseline, 0.25) == [('b', 1.0, 1.3, 1.3)]
+
+    def test_baseline_round_trip(self, tmp_path):
+        path = str(tmp_path / 'baseline.json')
+        results = run_suite(only='symbols=10]')
+        assert list(results) == ['portfolio_value[symbols=10]']
+        save_baseline(path, results)
+        assert load_baseline(path) == results
+        assert compare(results, load_baseline(path), 0.25) == []
+
+    def test_baselines_from_another_python_are_not_compared(self):
+        major, minor = sys.version_info[:2]
+        assert same_python(f'{major}.{minor}.99')
+        assert not same_python(f'{major}.{minor + 1}.0')
+        assert not same_python(None)
@@ -0,0 +1,87 @@
+import json
+from datetime import datetime, timedelta
+
+import pytest
+
+from accounts import UserAccount
+from accounts.checkpoints import HoldingsCheckpoints
+
+START = datetime(2025, 1, 1, 9, 0)
+
+
+def build_account(trades=500):
+    """Deposits then alternating AAPL/TSLA trades, one per minute, with known prices."""
+    account = UserAccount(user_id=1, username='john_doe', password='password123', email='john@example.com', balance=0.0)
+    entries = [{'transaction_type': 'deposit', 'amount': 100000.0, 'timestamp': START.isoformat()}]
+    for i in range(1, trades + 1):
+        symbol = 'AAPL' if i % 2 else 'TSLA'
+        side = 'sell' if i % 5 == 0 else 'buy'
+        entries.append({'transaction_type': side, 'symbol': symbol, 'quantity': 1, 'price': 100.0 + i,
+                        'timestamp': (START + timedelta(minutes=i)).isoformat()})
+    for entry in entries:
+        account.apply_transaction(entry)
+    return account
+
+
+def replay_until(account, at):
+    """The O(n) reference: walk the whole history up to at."""
+    copy = UserAccount(user_id=2, username='copy', password='pw', email='copy@example.com')
+    for entry in account.get_transaction_history():
+        if entry['timestamp'] > at.isoformat():
+            break
+        copy.apply_transaction(entry)
+    return copy
+
+
+class TestHoldingsCheckpoints:
+    @pytest.fixture
+    def account(self):
+        return build_account()
+
+    @pytest.mark.parametrize('minutes', [0, 1, 37, 100, 101, 250, 499, 500, 10000])
+    def test_matches_full_replay(self, account, minutes):
+        at = START + timedelta(minutes=minutes, seconds=30)
+        reference = replay_until(account, at)
+        account.checkpoints = HoldingsCheckpoints(account, interval=64)
+        assert account.get_holdings(at=at) == reference.holdings
+        last_prices = {}
+        for entry in reference.get_transaction_history():
+            if 'symbol' in entry:
+                last_prices[entry['symbol']] = entry['price']
+        expected = reference.get_portfolio_value(last_prices.__getitem__) - 100000.0
+        assert account.get_profit_loss(100000.0, at=at) == pytest.approx(expected)
+
+    def test_before_first_transaction(self, account):
+        assert account.get_holdings(at=START - timedelta(days=1)) == {}
+        assert account.get_profit_loss(0.0, at=(START - timedelta(days=1)).isoformat()) == pytest.approx(0.0)
+
+    def test_replays_a_bounded_tail(self, account):
+        checkpoints = HoldingsCheckpoints(account, interval=50)
+        reads = []
+
+        class CountingLedger(list):
+            def __getitem__(self, position):
+                reads.append(position)
+                return list.__getitem__(self, position)
+
+        account.transactions = CountingLedger(account.transactions)
+        checkpoints.state_at(START + timedelta(minutes=321))
+        assert 0 < len(reads) <= 50
+
+    def test_follows_new_transactions(self, account):
+        account.checkpoints = HoldingsCheckpoints(account, interval=16)
+        account.apply_transaction({'transaction_type': 'buy', 'symbol': 'MSFT', 'quantity': 3, 'price': 10.0,
+                                   'timestamp': (START + timedelta(days=1)).isoformat()})
+        assert account.get_holdings(at=START + timedelta(days=2)) == account.holdings
+        assert 'MSFT' not in account.get_holdings(at=START + timedelta(hours=20))
+
+    def test_round_trip(self, account):
+        at = START + timedelta(minutes=321, seconds=30)
+        checkpoints = HoldingsCheckpoints(account, interval=64)
+        restored = HoldingsCheckpoints.from_dict(json.loads(json.dumps(checkpoints.to_dict())), account)
+        assert restored.state_at(at) == checkpoints.state_at(at)
+        account.deposit(5.0)
+        assert restored.state_at(datetime.now()) == checkpoints.state_at(datetime.now())
+
+    def test_current_values_unchanged(self, account):
+        assert account.get_holdings() is account.holdings
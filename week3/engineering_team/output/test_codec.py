@@ -0,0 +1,68 @@
+import json
+
+import pytest
+
+from accounts import Transaction, UserAccount, get_share_price
+from codec import decode_account, decode_transaction, encode_account, encode_transaction
+from columnar import ColumnarLedger
+
+
+def build_account(trades):
+    account = UserAccount(user_id=1, username='john_doe', password='password123', email='john@example.com', balance=1e9)
+    symbols = ('AAPL', 'TSLA', 'GOOGL', 'MSFT')
+    for i in range(trades):
+        account.buy_shares(symbols[i % 4], i % 7 + 1, get_share_price)
+        if i % 3 == 0:
+            account.sell_shares(symbols[i % 4], 1, get_share_price)
+        if i % 10 == 0:
+            account.deposit(12.34)
+    return account
+
+
+class TestCodec:
+    def test_account_round_trip(self):
+        account = build_account(500)
+        account.withdraw(0.01)
+        account.buy_shares('AAPL', 0.25, get_share_price)
+        restored = decode_account(encode_account(account))
+        assert restored.to_dict() == account.to_dict()
+        assert restored.balance_units == account.balance_units
+
+    def test_round_trip_from_dict_form(self):
+        data = json.loads(json.dumps(build_account(50).to_dict()))
+        assert decode_account(encode_account(UserAccount.from_dict(data))).to_dict() == data
+
+    def test_decode_into_ledger_backend(self):
+        account = build_account(100)
+        restored = decode_account(encode_account(account), ledger=ColumnarLedger())
+        assert restored.to_dict() == account.to_dict()
+
+    def test_transaction_round_trip(self):
+        for transaction in (
+            Transaction(7, 1, 'AAPL', 5, 'buy'),
+            Transaction('t-8', 2, 'TSLA', 0.5, 'sell', timestamp='2025-03-01T09:30:00'),
+        ):
+            assert decode_transaction(encode_transaction(transaction)).to_dict() == transaction.to_dict()
+
+    def test_rejects_foreign_data(self):
+        with pytest.raises(ValueError):
+            decode_account(b'{"user_id": 1}')
+        data = bytearray(encode_account(build_account(1)))
+        data[4] = 99
+        with pytest.raises(ValueError):
+            decode_account(data)
+
+    def test_smaller_than_json(self):
+        """Encode/decode speed is tracked by codec_round_trip in benchmarks.py; this checks size and fidelity."""
+        account = build_account(20000)
+        as_json = json.dumps(account.to_dict()).encode('utf-8')
+        as_binary = encode_account(account)
+        assert decode_account(as_binary).to_dict() == account.to_dict()
+        assert len(as_binary) * 5 < len(as_json)
+
+    def test_prices_are_kept_to_eight_decimals(self):
+        account = build_account(1)
+        account.buy_shares('AAPL', 3, lambda symbol: 100 / 3)
+        price = decode_account(encode_account(account)).transactions[-1]['price']
+        assert price == 33.33333333
+        assert price != 100 / 3
@@ -0,0 +1,80 @@
+import random
+
+import pytest
+
+from accounts import UserAccount, get_share_price
+from columnar import ColumnarLedger
+
+
+def reference_average_cost(transactions):
+    """Walks the history one transaction at a time, as reports did before."""
+    position, basis, realized = {}, {}, {}
+    for t in transactions:
+        if t['transaction_type'] not in ('buy', 'sell'):
+            continue
+        symbol, quantity, price = t['symbol'], t['quantity'], t['price']
+        held = position.get(symbol, 0)
+        if t['transaction_type'] == 'buy':
+            position[symbol] = held + quantity
+            basis[symbol] = basis.get(symbol, 0.0) + quantity * price
+        else:
+            sold_cost = basis[symbol] * quantity / held
+            realized[symbol] = realized.get(symbol, 0.0) + quantity * price - sold_cost
+            position[symbol] = held - quantity
+            basis[symbol] -= sold_cost
+    return {s: b for s, b in basis.items() if position[s] > 0}, sum(realized.values())
+
+
+class TestColumnarLedger:
+    @pytest.fixture
+    def account(self):
+        return UserAccount(user_id=1, username='john_doe', password='password123', email='john@example.com', balance=100000.0, ledger=ColumnarLedger())
+
+    def test_history_round_trip(self, account):
+        account.deposit(500.0)
+        account.buy_shares('AAPL', 5, get_share_price)
+        account.sell_shares('AAPL', 2, get_share_price)
+        account.withdraw(100.0)
+        history = account.get_transaction_history()
+        assert [t['transaction_type'] for t in history] == ['deposit', 'buy', 'sell', 'withdrawal']
+        assert history[2]['symbol'] == 'AAPL' and history[2]['quantity'] == 2
+        assert UserAccount.from_dict(account.to_dict()).to_dict() == account.to_dict()
+
+    def test_cash_flow_and_turnover(self, account):
+        account.deposit(500.0)
+        account.withdraw(200.0)
+        account.buy_shares('AAPL', 4, get_share_price)
+        account.sell_shares('AAPL', 1, get_share_price)
+        flows = account.transactions.cash_flow()
+        assert flows == {'deposits': 500.0, 'withdrawals': 200.0, 'buys': 600.0, 'sells': 150.0, 'net_deposits': 300.0}
+        assert account.transactions.turnover() == 750.0
+        assert account.transactions.turnover('TSLA') == 0.0
+
+    def test_matches_reference_on_random_history(self, account):
+        rng = random.Random(7)
+        prices = {'AAPL': 150.0, 'TSLA': 600.0, 'GOOGL': 2500.0, 'MSFT': 300.0}
+        for _ in range(2000):
+            symbol = rng.choice(list(prices))
+            prices[symbol] *= rng.uniform(0.95, 1.05)
+            held = account.holdings.get(symbol, 0)
+            if held and rng.random() < 0.45:
+                account.sell_shares(symbol, rng.randint(1, held), prices.get)
+            else:
+                account.buy_shares(symbol, rng.randint(1, 5), prices.get)
+        basis, realized = reference_average_cost(account.get_transaction_history())
+        assert account.transactions.cost_basis() == pytest.approx(basis)
+        assert account.transactions.realized_pnl() == pytest.approx(realized)
+
+    def test_closed_position_has_no_basis(self, account):
+        prices = {'AAPL': 100.0}
+        account.buy_shares('AAPL', 10, prices.get)
+        prices['AAPL'] = 120.0
+        account.sell_shares('AAPL', 10, prices.get)
+        account.buy_shares('AAPL', 2, prices.get)
+        assert account.transactions.cost_basis() == {'AAPL': 240.0}
+        assert account.transactions.realized_pnl('AAPL') == pytest.approx(200.0)
+
+    def test_empty_ledger(self):
+        ledger = ColumnarLedger()
+        assert ledger.realized_pnl() == 0.0
+        assert ledger.cost_basis() == {}
@@ -0,0 +1,86 @@
+import time
+
+import pytest
+
+from accounts import UserAccount, get_share_price
+from price_cache import CachingPriceProvider
+
+
+class TestExecuteOrders:
+    @pytest.fixture
+    def account(self):
+        return UserAccount(user_id=1, username='john_doe', password='password123', email='john@example.com', balance=10000.0)
+
+    def test_matches_sequential_execution(self, account):
+        orders = [('buy', 'AAPL', 10), ('buy', 'TSLA', 5), ('sell', 'AAPL', 4), ('sell', 'TSLA', 5)]
+        reference = UserAccount(user_id=2, username='jane_doe', password='pw', email='jane@example.com', balance=10000.0)
+        for side, symbol, quantity in orders:
+            getattr(reference, f'{side}_shares')(symbol, quantity, get_share_price)
+        entries = account.execute_orders(orders, get_share_price)
+        assert account.balance == reference.balance
+        assert account.holdings == reference.holdings == {'AAPL': 6}
+        assert len(account.get_transaction_history()) == 4
+        assert len({entry['timestamp'] for entry in entries}) == 1
+
+    def test_sells_can_fund_later_buys(self, account):
+        account.buy_shares('GOOGL', 4, get_share_price)
+        account.execute_orders([('sell', 'GOOGL', 4), ('buy', 'TSLA', 16)], get_share_price)
+        assert account.holdings == {'TSLA': 16}
+
+    def test_failure_leaves_account_untouched(self, account):
+        account.buy_shares('AAPL', 10, get_share_price)
+        before = account.to_dict()
+        with pytest.raises(ValueError, match="Order 2: Insufficient funds"):
+            account.execute_orders([('sell', 'AAPL', 10), ('buy', 'TSLA', 1), ('buy', 'GOOGL', 100)], get_share_price)
+        with pytest.raises(ValueError, match="Order 1: Insufficient shares"):
+            account.execute_orders([('buy', 'TSLA', 1), ('sell', 'TSLA', 2)], get_share_price)
+        with pytest.raises(ValueError, match="Quantity must be positive"):
+            account.execute_orders([('buy', 'TSLA', 0)], get_share_price)
+        assert account.to_dict() == before
+
+    def test_prices_each_symbol_once_through_batch_provider(self, account):
+        calls = []
+
+        class BatchProvider:
+            def get_share_prices(self, symbols):
+                calls.append(sorted(symbols))
+                return {symbol: get_share_price(symbol) for symbol in symbols}
+
+        account.execute_orders([('buy', 'AAPL', 1)] * 5 + [('buy', 'MSFT', 1)] * 5, BatchProvider())
+        assert calls == [['AAPL', 'MSFT']]
+
+    def test_listeners_see_the_batch_once(self, account):
+        seen = []
+        account.add_listener(lambda acc, entries: seen.append([entry['symbol'] for entry in entries]))
+        account.execute_orders([('buy', 'AAPL', 1), ('buy', 'MSFT', 1)], CachingPriceProvider(get_share_price))
+        assert seen == [['AAPL', 'MSFT']]
+
+    def test_missing_batch_price(self, account):
+        class PartialProvider:
+            def get_share_prices(self, symbols):
+                return {'AAPL': 150.0}
+
+        with pytest.raises(ValueError, match="No price returned for: MSFT"):
+            account.execute_orders([('buy', 'AAPL', 1), ('buy', 'MSFT', 1)], PartialProvider())
+        assert account.holdings == {}
+        assert len(account.get_transaction_history()) == 0
+
+    def test_faster_than_looping(self):
+        orders = [('buy', 'AAPL', 1), ('sell', 'AAPL', 1)] * 1000
+
+        def slow_price(symbol):
+            time.sleep(0.0001)  # stands in for a quote source round-trip
+            return get_share_price(symbol)
+
+        looped = UserAccount(user_id=1, username='a', password='pw', email='a@example.com', balance=1000.0)
+        started = time.perf_counter()
+        for side, symbol, quantity in orders:
+            getattr(looped, f'{side}_shares')(symbol, quantity, slow_price)
+        loop_time = time.perf_counter() - started
+
+        batched = UserAccount(user_id=2, username='b', password='pw', email='b@example.com', balance=1000.0)
+        started = time.perf_counter()
+        batched.execute_orders(orders, slow_price)
+        batch_time = time.perf_counter() - started
+        assert batched.balance == looped.balance
+        assert batch_time * 10 < loop_time
@@ -0,0 +1,65 @@
+import pytest
+
+from accounts import UserAccount, get_share_price
+from exposure import ExposureIndex
+
+
+class TestExposureIndex:
+    @pytest.fixture
+    def accounts(self):
+        return [UserAccount(i, f'user{i}', 'pw', f'user{i}@example.com', 100000.0) for i in range(1, 5)]
+
+    @pytest.fixture
+    def index(self, accounts):
+        accounts[0].buy_shares('TSLA', 3, get_share_price)
+        return ExposureIndex(accounts)
+
+    def test_tracks_buys_and_sells(self, accounts, index):
+        assert index.holders('TSLA') == {1: 3}
+        accounts[1].buy_shares('TSLA', 10, get_share_price)
+        accounts[2].buy_shares('AAPL', 4, get_share_price)
+        accounts[0].sell_shares('TSLA', 3, get_share_price)
+        assert index.holders('TSLA') == {2: 10}
+        assert index.total_exposure('TSLA') == 10
+        assert index.total_exposure('AAPL') == 4
+        assert index.exposure_value('AAPL') == 600.0
+        accounts[2].sell_shares('AAPL', 4, get_share_price)
+        assert index.total_exposure('AAPL') == 0
+        assert index.symbols() == ['TSLA']
+
+    def test_matches_a_full_scan(self, accounts, index):
+        accounts[1].execute_orders([('buy', 'TSLA', 2), ('buy', 'GOOGL', 5)], get_share_price)
+        accounts[3].buy_shares('GOOGL', 1, get_share_price)
+        accounts[1].sell_shares('GOOGL', 2, get_share_price)
+        for symbol in ('TSLA', 'GOOGL'):
+            scanned = {a.user_id: a.holdings[symbol] for a in accounts if symbol in a.holdings}
+            assert index.holders(symbol) == scanned
+            assert index.total_exposure(symbol) == sum(scanned.values())
+
+    def test_existing_holdings_are_marked_when_tracked(self, accounts):
+        accounts[0].buy_shares('TSLA', 3, get_share_price)
+        assert ExposureIndex(accounts, get_share_price).exposure_value('TSLA') == 1800.0
+        assert ExposureIndex(accounts).exposure_value('TSLA') == 0.0
+        accounts[1].price_provider = lambda symbol: 500.0
+        accounts[1].buy_shares('AAPL', 2)
+        assert ExposureIndex(accounts[1:]).exposure_value('AAPL') == 1000.0
+
+    def test_top_holders(self, accounts, index):
+        for account, quantity in zip(accounts[1:], (7, 1, 12)):
+            account.buy_shares('TSLA', quantity, get_share_price)
+        assert index.top_holders('TSLA', 2) == [(4, 12), (2, 7)]
+        assert index.top_holders('NFLX') == []
+
+    def test_revalue_pushes_ticks_to_holders(self, accounts, index):
+        accounts[0].track_valuation(get_share_price)
+        accounts[1].buy_shares('TSLA', 2, get_share_price)
+        price = get_share_price('TSLA') + 10.0
+        changes = index.revalue('TSLA', price)
+        assert changes == {1: pytest.approx(30.0), 2: pytest.approx(20.0)}
+        assert accounts[0].get_portfolio_value() == pytest.approx(accounts[0].balance + 3 * price)
+
+    def test_untrack(self, accounts, index):
+        index.untrack(accounts[0])
+        accounts[0].buy_shares('AAPL', 1, get_share_price)
+        assert index.holders('TSLA') == {}
+        assert index.total_exposure('AAPL') == 0
@@ -0,0 +1,65 @@
+import pytest
+
+from accounts import UserAccount
+from columnar import ColumnarLedger
+
+
+def build_history(account):
+    """Two deposits and 30 trades a minute apart, so time filters are deterministic."""
+    entries = [{'transaction_type': 'deposit', 'amount': 1000.0, 'timestamp': '2025-01-01T09:00:00'}]
+    for minute in range(30):
+        symbol = ('AAPL', 'TSLA', 'GOOGL')[minute % 3]
+        side = 'buy' if minute % 2 == 0 else 'sell'
+        entries.append({'transaction_type': side, 'symbol': symbol, 'quantity': 1, 'price': 10.0,
+                        'timestamp': f'2025-01-01T10:{minute:02d}:00'})
+    entries.append({'transaction_type': 'deposit', 'amount': 5.0, 'timestamp': '2025-01-01T11:00:00'})
+    account.transactions.extend(entries)
+    return entries
+
+
+class TestQueryTransactions:
+    @pytest.fixture(params=[None, ColumnarLedger], ids=['list', 'columnar'])
+    def account(self, request):
+        ledger = request.param() if request.param else None
+        account = UserAccount(user_id=1, username='john_doe', password='password123', email='john@example.com', ledger=ledger)
+        build_history(account)
+        return account
+
+    def test_filters(self, account):
+        page, cursor = account.query_transactions(symbol='TSLA', transaction_type='buy')
+        assert cursor is None
+        assert [t['timestamp'][11:16] for t in page] == ['10:04', '10:10', '10:16', '10:22', '10:28']
+        page, _ = account.query_transactions(start='2025-01-01T10:05:00', end='2025-01-01T10:08:00')
+        assert [t['timestamp'][11:16] for t in page] == ['10:05', '10:06', '10:07']
+        page, _ = account.query_transactions(transaction_type='deposit')
+        assert [t['amount'] for t in page] == [1000.0, 5.0]
+        assert account.query_transactions(symbol='MSFT') == ([], None)
+
+    def test_cursor_pagination(self, account):
+        seen, cursor = [], None
+        while True:
+            page, cursor = account.query_transactions(symbol='AAPL', limit=3, cursor=cursor)
+            assert len(page) <= 3
+            seen.extend(page)
+            if cursor is None:
+                break
+        assert seen == [t for t in account.get_transaction_history() if t.get('symbol') == 'AAPL']
+
+    def test_index_picks_up_new_entries(self, account):
+        account.query_transactions()
+        account.deposit(1.0)
+        page, _ = account.query_transactions(transaction_type='deposit')
+        assert [t['amount'] for t in page] == [1000.0, 5.0, 1.0]
+
+    def test_out_of_order_timestamps_still_filter_correctly(self):
+        account = UserAccount(user_id=1, username='john_doe', password='pw', email='john@example.com')
+        account.transactions.extend([
+            {'transaction_type': 'deposit', 'amount': 1.0, 'timestamp': '2025-01-02T00:00:00'},
+            {'transaction_type': 'deposit', 'amount': 2.0, 'timestamp': '2025-01-01T00:00:00'},
+        ])
+        page, _ = account.query_transactions(end='2025-01-01T12:00:00')
+        assert [t['amount'] for t in page] == [2.0]
+
+    def test_invalid_page_size(self, account):
+        with pytest.raises(ValueError):
+            account.query_transactions(limit=0)
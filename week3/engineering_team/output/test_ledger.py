@@ -0,0 +1,82 @@
+import pytest
+
+from accounts import UserAccount, get_share_price
+from accounts.ledger import ListLedger, MmapLedger, LedgerView
+
+
+class TestMmapLedger:
+    @pytest.fixture
+    def ledger(self, tmp_path):
+        ledger = MmapLedger(str(tmp_path / 'john_doe.ledger'))
+        yield ledger
+        ledger.close()
+
+    @pytest.fixture
+    def account(self, ledger):
+        return UserAccount(user_id=1, username='john_doe', password='password123', email='john@example.com', balance=1000.0, ledger=ledger)
+
+    def test_history_matches_list_backend(self, account):
+        reference = UserAccount(user_id=1, username='john_doe', password='password123', email='john@example.com', balance=1000.0)
+        for acc in (account, reference):
+            acc.deposit(500.0)
+            acc.buy_shares('AAPL', 5, get_share_price)
+            acc.sell_shares('AAPL', 2, get_share_price)
+            acc.withdraw(100.0)
+        mapped = account.get_transaction_history()
+        assert isinstance(mapped, LedgerView)
+        assert isinstance(reference.get_transaction_history(), ListLedger)
+        strip = lambda history: [{k: v for k, v in t.items() if k != 'timestamp'} for t in history]
+        assert strip(mapped) == strip(reference.get_transaction_history())
+        assert mapped[0]['timestamp'] == account.transactions[0]['timestamp']
+
+    def test_view_is_sliceable(self, account):
+        for amount in range(1, 11):
+            account.deposit(float(amount))
+        history = account.get_transaction_history()
+        assert len(history) == 10
+        assert [t['amount'] for t in history[2:8:2]] == [3.0, 5.0, 7.0]
+        assert history[-1]['amount'] == 10.0
+
+    def test_reopen_preserves_records(self, account, ledger, tmp_path):
+        account.deposit(250.0)
+        account.buy_shares('TSLA', 1, get_share_price)
+        ledger.close()
+        with MmapLedger(ledger.path) as reopened:
+            assert len(reopened) == 2
+            assert reopened[1]['symbol'] == 'TSLA'
+            assert reopened[1]['price'] == 600.0
+
+    def test_quantities_keep_their_type(self, account):
+        account.buy_shares('AAPL', 3, get_share_price)
+        account.buy_shares('AAPL', 0.5, get_share_price)
+        whole, fractional = account.transactions[0]['quantity'], account.transactions[1]['quantity']
+        assert whole == 3 and type(whole) is int
+        assert fractional == 0.5
+
+    def test_reads_after_append_see_new_records(self, account):
+        account.deposit(1.0)
+        assert account.transactions[0]['amount'] == 1.0
+        account.deposit(2.0)
+        assert account.transactions[1]['amount'] == 2.0
+
+    def test_truncate(self, account, ledger):
+        account.deposit(1.0)
+        account.deposit(2.0)
+        account.deposit(3.0)
+        assert account.transactions[2]['amount'] == 3.0
+        ledger.truncate(1)
+        assert len(ledger) == 1
+        account.deposit(4.0)
+        assert [entry['amount'] for entry in ledger] == [1.0, 4.0]
+        with pytest.raises(ValueError):
+            ledger.truncate(5)
+
+    def test_to_dict_round_trip(self, account, tmp_path):
+        account.buy_shares('GOOGL', 0.2, get_share_price)
+        with MmapLedger(str(tmp_path / 'copy.ledger')) as copy_ledger:
+            copy = UserAccount.from_dict(account.to_dict(), ledger=copy_ledger)
+            assert copy.to_dict() == account.to_dict()
+
+    def test_symbol_too_long(self, ledger):
+        with pytest.raises(ValueError):
+            ledger.append({'transaction_type': 'buy', 'symbol': 'X' * 20, 'quantity': 1, 'price': 1.0, 'timestamp': '2025-01-01T00:00:00'})
@@ -0,0 +1,85 @@
+import random
+
+import pytest
+
+from accounts import UserAccount
+from accounts.money import cost_units, from_units, proceeds_units, to_units, value_units
+from accounts.valuation import batch_price_provider, value_portfolios
+
+
+class TestMoney:
+    @pytest.fixture
+    def account(self):
+        return UserAccount(user_id=1, username='john_doe', password='password123', email='john@example.com', balance=0.0)
+
+    def test_conversions(self):
+        assert to_units(19.99) == 1999
+        assert from_units(1999) == 19.99
+        assert value_units(0.1, 3) == 30
+        assert value_units(150.0, 2.5) == 37500
+        assert value_units(0.004, 1) == 0
+        assert cost_units(0.004, 1) == 1
+        assert proceeds_units(0.006, 1) == 0
+        assert cost_units(0.1, 3) == proceeds_units(0.1, 3) == 30
+
+    def test_sub_unit_amounts_are_rejected(self, account):
+        account.deposit(10.0)
+        for action in (lambda: account.deposit(0.001), lambda: account.withdraw(0.004)):
+            with pytest.raises(ValueError, match="smallest money unit"):
+                action()
+        assert account.balance_units == 1000
+        assert len(account.get_transaction_history()) == 1
+
+    def test_trades_round_against_the_account(self, account):
+        account.deposit(1.0)
+        account.buy_shares('X', 1, lambda symbol: 0.004)
+        assert account.balance_units == 99
+        account.sell_shares('X', 1, lambda symbol: 0.016)
+        assert account.balance_units == 100
+        account.buy_shares('X', 1, lambda symbol: 0.004)
+        with pytest.raises(ValueError, match="smallest money unit"):
+            account.sell_shares('X', 1, lambda symbol: 0.004)
+        with pytest.raises(ValueError, match="smallest money unit"):
+            account.buy_shares('X', 1, lambda symbol: 0.0)
+
+    def test_repeated_cash_movements_do_not_drift(self, account):
+        float_balance = 0.0
+        for _ in range(10000):
+            account.deposit(0.1)
+            float_balance += 0.1
+        assert float_balance != 1000.0
+        assert account.balance == 1000.0
+        assert account.balance_units == 100000
+
+    def test_trades_are_exact(self, account):
+        account.deposit(1000.0)
+        for _ in range(100):
+            account.buy_shares('X', 3, lambda symbol: 0.1)
+        assert account.balance == 970.0
+        account.execute_orders([('sell', 'X', 300)], lambda symbol: 0.1)
+        assert account.balance == 1000.0
+
+    def test_matches_the_float_path(self):
+        rng = random.Random(3)
+        accounts, quotes = [], {f'S{i}': round(rng.uniform(1, 500), 2) for i in range(20)}
+        for user_id in range(50):
+            account = UserAccount(user_id, f'u{user_id}', 'pw', f'u{user_id}@example.com', 100000.0)
+            for symbol in rng.sample(sorted(quotes), 5):
+                account.buy_shares(symbol, rng.randint(1, 20), quotes.__getitem__)
+            accounts.append(account)
+        values = value_portfolios(accounts, batch_price_provider(quotes.__getitem__))
+        for account, value in zip(accounts, values):
+            float_value = account.balance + sum(quotes[s] * q for s, q in account.holdings.items())
+            assert value == account.get_portfolio_value(quotes.__getitem__)
+            assert value == pytest.approx(float_value, abs=1e-6)
+
+    def test_configurable_scale(self):
+        class MilliAccount(UserAccount):
+            money_scale = 1000
+
+        account = MilliAccount(1, 'john_doe', 'pw', 'john@example.com', 10.0)
+        account.buy_shares('X', 1, lambda symbol: 0.001)
+        assert account.balance_units == 9999
+        assert account.balance == 9.999
+        quotes = {'X': 0.001}
+        assert value_portfolios([account], batch_price_provider(quotes.__getitem__)) == [10.0]
@@ -0,0 +1,103 @@
+import threading
+import time
+
+import pytest
+
+from accounts import UserAccount, get_share_price
+from price_cache import CachingPriceProvider
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestCachingPriceProvider:
+    @pytest.fixture
+    def clock(self):
+        return FakeClock()
+
+    @pytest.fixture
+    def calls(self):
+        return []
+
+    @pytest.fixture
+    def cache(self, clock, calls):
+        def counting_price(symbol):
+            calls.append(symbol)
+            return get_share_price(symbol)
+        return CachingPriceProvider(counting_price, ttl=10.0, maxsize=2, clock=clock)
+
+    def test_hit_and_expiry(self, cache, clock, calls):
+        assert cache('AAPL') == 150.0
+        assert cache('AAPL') == 150.0
+        assert calls == ['AAPL']
+        clock.now = 10.0
+        cache('AAPL')
+        assert calls == ['AAPL', 'AAPL']
+        assert cache.stats() == {'hits': 1, 'misses': 2, 'coalesced': 0, 'evictions': 0, 'size': 1}
+
+    def test_lru_eviction(self, cache, calls):
+        cache('AAPL')
+        cache('TSLA')
+        cache('AAPL')
+        cache('GOOGL')  # evicts TSLA, the least recently used
+        cache('AAPL')
+        cache('TSLA')
+        assert calls == ['AAPL', 'TSLA', 'GOOGL', 'TSLA']
+        assert cache.stats()['evictions'] == 2
+
+    def test_per_symbol_ttl(self, clock, calls):
+        cache = CachingPriceProvider(lambda s: calls.append(s) or 1.0, ttl=lambda s: 1.0 if s == 'TSLA' else 60.0, clock=clock)
+        cache('TSLA')
+        cache('AAPL')
+        clock.now = 5.0
+        cache('TSLA')
+        cache('AAPL')
+        assert calls == ['TSLA', 'AAPL', 'TSLA']
+
+    def test_single_flight(self):
+        release = threading.Event()
+        calls = []
+
+        def slow_price(symbol):
+            calls.append(symbol)
+            release.wait(5)
+            return 600.0
+
+        cache = CachingPriceProvider(slow_price)
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(cache('TSLA'))) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        while cache.stats()['coalesced'] < 7:
+            time.sleep(0.001)
+        release.set()
+        for thread in threads:
+            thread.join()
+        assert calls == ['TSLA']
+        assert results == [600.0] * 8
+
+    def test_errors_are_not_cached(self):
+        attempts = []
+
+        def flaky_price(symbol):
+            attempts.append(symbol)
+            if len(attempts) == 1:
+                raise ConnectionError("quote source unavailable")
+            return 150.0
+
+        cache = CachingPriceProvider(flaky_price)
+        with pytest.raises(ConnectionError):
+            cache('AAPL')
+        assert cache('AAPL') == 150.0
+
+    def test_usable_as_get_share_price(self, cache, calls):
+        account = UserAccount(user_id=1, username='john_doe', password='password123', email='john@example.com', balance=10000.0)
+        account.buy_shares('AAPL', 5, cache)
+        account.sell_shares('AAPL', 2, cache)
+        assert account.get_portfolio_value(cache) == 10000.0 - 450.0 + 450.0
+        assert calls == ['AAPL']
@@ -0,0 +1,60 @@
+import time
+
+import pytest
+
+from accounts import UserAccount
+from backtest import buy_and_hold, momentum, random_trader, run_backtest
+from price_feed import PriceFeed, random_walk, read_csv, write_csv
+
+
+class TestPriceFeed:
+    def test_random_walk_is_reproducible(self):
+        first = list(random_walk(steps=50, seed=7))
+        assert first == list(random_walk(steps=50, seed=7))
+        assert first != list(random_walk(steps=50, seed=8))
+        assert all(price > 0 for _, prices in first for price in prices.values())
+
+    def test_csv_round_trip(self, tmp_path):
+        bars = list(random_walk(('AAPL', 'TSLA'), steps=20, seed=1))
+        path = str(tmp_path / 'bars.csv')
+        write_csv(bars, path)
+        assert list(read_csv(path)) == bars
+
+    def test_feed_quotes_the_latest_bar(self):
+        feed = PriceFeed(random_walk(('AAPL',), steps=3, seed=1))
+        with pytest.raises(ValueError):
+            feed.get_share_price('AAPL')
+        for _, prices in feed:
+            assert feed('AAPL') == prices['AAPL']
+        assert feed.bars == 3
+
+    def test_rate_paces_the_replay(self):
+        started = time.perf_counter()
+        list(PriceFeed(random_walk(steps=6, seed=1), rate=100))
+        assert time.perf_counter() - started >= 0.05
+
+
+class TestBacktest:
+    def test_buy_and_hold(self):
+        result = run_backtest(PriceFeed(random_walk(steps=10, seed=3)), accounts=5, strategy=buy_and_hold)
+        assert result['bars'] == 10
+        assert result['trades'] == 15
+        assert result['valuations'] == 50
+        assert result['trades_per_sec'] > 0 and result['valuations_per_sec'] > 0
+
+    def test_random_strategy_keeps_accounts_consistent(self):
+        feed = PriceFeed(random_walk(steps=40, seed=5))
+        result = run_backtest(feed, accounts=20, strategy=random_trader(seed=5, probability=0.5), initial_cash=1000.0)
+        assert result['trades'] + result['rejected'] > 0
+        assert result['final_aum'] > 0
+
+    def test_momentum_waits_for_a_second_bar_of_a_new_symbol(self):
+        bars = [
+            ('2025-01-01T09:30:00', {'AAPL': 100.0}),
+            ('2025-01-01T09:31:00', {'AAPL': 101.0, 'IPO': 20.0}),
+            ('2025-01-01T09:32:00', {'AAPL': 101.0, 'IPO': 25.0}),
+        ]
+        accounts = [UserAccount(1, 'sim1', 'pw', 'sim1@example.com', 1000.0)]
+        result = run_backtest(PriceFeed(bars), accounts=accounts, strategy=momentum)
+        assert result['trades'] == 2 and result['rejected'] == 0
+        assert accounts[0].holdings == {'AAPL': 1, 'IPO': 1}
@@ -0,0 +1,53 @@
+import json
+import pickle
+from datetime import datetime
+
+import pytest
+
+from accounts import UserAccount, get_share_price
+from accounts.records import TransactionRecord, TransactionType, iso_to_epoch_ns
+from benchmarks import bench_memory_per_transaction
+
+
+class TestTransactionRecord:
+    @pytest.fixture
+    def account(self):
+        return UserAccount(user_id=1, username='john_doe', password='password123', email='john@example.com', balance=1000.0)
+
+    def test_reads_like_the_original_dicts(self, account):
+        account.deposit(500.0)
+        account.buy_shares('AAPL', 5, get_share_price)
+        deposit, buy = account.get_transaction_history()
+        assert set(deposit) == {'transaction_type', 'amount', 'timestamp'}
+        assert deposit['transaction_type'] == 'deposit' and deposit['amount'] == 500.0
+        assert dict(buy) == {
+            'transaction_type': 'buy', 'symbol': 'AAPL', 'quantity': 5, 'price': 150.0,
+            'timestamp': buy['timestamp']
+        }
+        assert buy.get('amount') is None
+        datetime.fromisoformat(buy['timestamp'])
+        json.dumps(account.to_dict())
+
+    def test_is_immutable(self):
+        record = TransactionRecord(TransactionType.DEPOSIT, amount=10.0)
+        with pytest.raises(AttributeError):
+            record.amount = 20.0
+        with pytest.raises(AttributeError):
+            record.extra = 1
+        with pytest.raises(TypeError):
+            record['amount'] = 20.0
+
+    def test_round_trips_through_dicts_and_pickle(self):
+        record = TransactionRecord(TransactionType.SELL, 'TSLA', 3, 700.0, timestamp_ns=iso_to_epoch_ns('2024-01-02T03:04:05.123456'))
+        assert record['timestamp'] == '2024-01-02T03:04:05.123456'
+        assert TransactionRecord.from_entry(dict(record)) == record
+        assert pickle.loads(pickle.dumps(record)) == record
+
+    def test_symbols_are_interned(self):
+        symbol = ''.join(['AA', 'PL'])
+        record = TransactionRecord(TransactionType.BUY, symbol, 1, 150.0)
+        assert record.symbol is TransactionRecord(TransactionType.BUY, 'AAPL', 1, 150.0).symbol
+
+    def test_memory_per_transaction(self):
+        """Records should take clearly less memory than the dicts they replace."""
+        assert bench_memory_per_transaction('record') < bench_memory_per_transaction('dict') * 0.75
@@ -0,0 +1,61 @@
+import pytest
+
+from accounts import UserAccount, get_share_price
+from accounts.valuation import batch_price_provider, value_portfolios
+from sharding import ShardedEngine
+
+
+class TestShardedEngine:
+    @pytest.fixture
+    def engine(self):
+        engine = ShardedEngine(shards=3)
+        yield engine
+        engine.close()
+
+    def test_routes_calls_to_the_owning_shard(self, engine):
+        user_id = engine.create_account('john_doe', 'password123', 'john@example.com', 1000.0)
+        assert engine.deposit(user_id, 500.0) == 1500.0
+        assert engine.buy_shares(user_id, 'AAPL', 5) == {'AAPL': 5}
+        assert engine.get_portfolio_value(user_id) == 1500.0
+        assert engine.sell_shares(user_id, 'AAPL', 5) == {}
+        assert engine.get_account(user_id)['username'] == 'john_doe'
+        assert len(engine.get_account(user_id)['transactions']) == 3
+
+    def test_shard_errors_are_reraised(self, engine):
+        user_id = engine.create_account('john_doe', 'password123', 'john@example.com', 100.0)
+        with pytest.raises(ValueError, match="Insufficient funds"):
+            engine.withdraw(user_id, 500.0)
+        with pytest.raises(ValueError, match="Account not found"):
+            engine.deposit(user_id + 1, 10.0)
+        with pytest.raises(ValueError, match="Username already taken"):
+            engine.create_account('john_doe', 'x', 'other@example.com')
+
+    def test_aggregates_match_a_single_process(self, engine):
+        reference = []
+        for i in range(12):
+            user_id = engine.create_account(f'user{i}', 'pw', f'user{i}@example.com', 10000.0)
+            account = UserAccount(user_id, f'user{i}', 'pw', f'user{i}@example.com', 10000.0)
+            for symbol, quantity in (('AAPL', i + 1), ('TSLA', i % 3), ('GOOGL', 2)):
+                if quantity:
+                    engine.buy_shares(user_id, symbol, quantity)
+                    account.buy_shares(symbol, quantity, get_share_price)
+            reference.append(account)
+
+        assert len(engine) == 12
+        assert engine.total_aum() == pytest.approx(sum(value_portfolios(reference, batch_price_provider(get_share_price))))
+        exposure = engine.exposure()
+        assert exposure['AAPL'] == (78, 78 * 150.0)
+        assert exposure['TSLA'][0] == sum(i % 3 for i in range(12))
+        assert exposure['GOOGL'] == (24, 24 * get_share_price('GOOGL'))
+
+    def test_dead_shard(self, engine):
+        process = engine._processes[1]
+        process.terminate()
+        process.join()
+        with pytest.raises(ConnectionError, match="Shard 1 is not running"):
+            engine.create_account('john_doe', 'password123', 'john@example.com', 100.0)  # user id 1 lives on shard 1
+        user_id = engine.create_account('john_doe', 'password123', 'john@example.com', 100.0)
+        assert engine.shard_for(user_id) == 2
+        with pytest.raises(ConnectionError, match="Shard 1 is not running"):
+            engine.total_aum()
+        assert engine.deposit(user_id, 10.0) == 110.0
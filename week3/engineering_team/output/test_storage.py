@@ -0,0 +1,198 @@
+import json
+import os
+import threading
+from datetime import datetime, timedelta
+
+import pytest
+
+from accounts import UserAccount, get_share_price
+from storage import AccountStore
+
+
+def make_account(user_id=1):
+    return UserAccount(user_id=user_id, username=f'user{user_id}', password='password123', email=f'user{user_id}@example.com', balance=10000.0)
+
+
+def trade(account):
+    account.deposit(500.0)
+    account.buy_shares('AAPL', 5, get_share_price)
+    account.sell_shares('AAPL', 2, get_share_price)
+    account.withdraw(100.0)
+
+
+class TestAccountStore:
+    def test_recover_from_wal(self, tmp_path):
+        with AccountStore(str(tmp_path), fsync=False) as store:
+            account = store.register(make_account())
+            trade(account)
+            expected = account.to_dict()
+        with AccountStore(str(tmp_path), fsync=False) as store:
+            assert store.accounts[1].to_dict() == expected
+
+    def test_recover_from_snapshot_and_tail(self, tmp_path):
+        with AccountStore(str(tmp_path), fsync=False) as store:
+            account = store.register(make_account())
+            trade(account)
+            store.checkpoint()
+            account.deposit(42.0)
+            expected = account.to_dict()
+        segments = sorted(name for name in os.listdir(tmp_path) if name.startswith('wal-'))
+        assert 'snapshot.json' in os.listdir(tmp_path)
+        assert len(segments) == 1  # the sealed segment was folded into the snapshot
+        with AccountStore(str(tmp_path), fsync=False) as store:
+            assert store.accounts[1].to_dict() == expected
+            store.accounts[1].deposit(1.0)
+            expected = store.accounts[1].to_dict()
+        with AccountStore(str(tmp_path), fsync=False) as store:
+            assert store.accounts[1].to_dict() == expected
+
+    def test_snapshot_holds_state_not_history(self, tmp_path):
+        with AccountStore(str(tmp_path), fsync=False) as store:
+            account = store.register(make_account())
+            trade(account)
+            store.checkpoint()
+        with open(tmp_path / 'snapshot.json') as f:
+            [state] = json.load(f)['accounts']
+        assert 'transactions' not in state
+        assert state['checkpoints']['tail_position'] == 4
+        assert state['checkpoints']['tail'][1] == {'AAPL': 3}
+
+    def test_recovered_accounts_reuse_persisted_checkpoints(self, tmp_path):
+        start = datetime(2025, 1, 1)
+        with AccountStore(str(tmp_path), fsync=False, snapshot_every=0) as store:
+            account = store.register(make_account())
+            for i in range(2500):
+                account.apply_transaction({'transaction_type': 'buy', 'symbol': 'AAPL', 'quantity': 1, 'price': 1.0,
+                                           'timestamp': (start + timedelta(minutes=i)).isoformat()})
+            store.checkpoint()
+        with AccountStore(str(tmp_path), fsync=False) as store:
+            account = store.accounts[1]
+            ledger = account.transactions
+            reads = []
+            read = ledger.read
+            ledger.read = lambda position: reads.append(position) or read(position)
+            assert account.get_holdings(at=start + timedelta(minutes=1800, seconds=30)) == {'AAPL': 1801}
+            assert len(reads) <= account.checkpoints.interval  # no undo pass over the whole history
+
+    def test_logs_before_applying(self, tmp_path):
+        with AccountStore(str(tmp_path), fsync=False) as store:
+            account = store.register(make_account())
+            account.deposit(10.0)
+            wal = store._wal
+
+            class FullDisk:
+                def write(self, data):
+                    raise OSError("No space left on device")
+
+            store._wal = FullDisk()
+            with pytest.raises(OSError):
+                account.buy_shares('AAPL', 5, get_share_price)
+            store._wal = wal
+            assert account.balance == 10010.0
+            assert account.holdings == {}
+            assert len(account.transactions) == 1
+            with pytest.raises(OSError, match="Reopen the store"):
+                account.deposit(1.0)
+        with AccountStore(str(tmp_path), fsync=False) as store:
+            assert store.accounts[1].balance == 10010.0
+            assert store.accounts[1].holdings == {}
+
+    def test_failed_write_fails_every_record_in_the_batch(self, tmp_path):
+        with AccountStore(str(tmp_path), fsync=False) as store:
+            wal = store._wal
+
+            class FullDisk:
+                def write(self, data):
+                    raise OSError("No space left on device")
+
+            store._wal = FullDisk()
+            first = store._append({'op': 'test'})
+            second = store._append({'op': 'test'})
+            with pytest.raises(OSError, match="No space"):
+                store._commit(first)
+            store._wal = wal
+            # The second writer's record went down with the batch.
+            with pytest.raises(OSError, match="Reopen the store"):
+                store._commit(second)
+            assert store._durable_lsn < first
+
+    def test_rejected_symbol_leaves_account_and_store_intact(self, tmp_path):
+        with AccountStore(str(tmp_path), fsync=False) as store:
+            account = store.register(make_account())
+            with pytest.raises(ValueError):
+                account.buy_shares('BRK.B-PREFERRED-X', 1, lambda symbol: 10.0)
+            assert account.balance == 10000.0
+            assert account.holdings == {}
+            assert len(account.transactions) == 0
+            account.deposit(5.0)
+        with AccountStore(str(tmp_path), fsync=False) as store:
+            assert store.accounts[1].balance == 10005.0
+            assert store.accounts[1].holdings == {}
+            assert len(store.accounts[1].transactions) == 1
+
+    def test_wal_append_is_constant_size(self, tmp_path):
+        with AccountStore(str(tmp_path), fsync=False, snapshot_every=0) as store:
+            account = store.register(make_account())
+            wal = store._wal.name
+            sizes = []
+            for _ in range(3):
+                for _ in range(100):
+                    account.deposit(1.0)
+                sizes.append(os.path.getsize(wal))
+        assert sizes[2] - sizes[1] == sizes[1] - sizes[0]
+
+    def test_torn_write_is_discarded(self, tmp_path):
+        with AccountStore(str(tmp_path), fsync=False) as store:
+            account = store.register(make_account())
+            account.deposit(10.0)
+            expected = account.to_dict()
+            wal = store._wal.name
+        with open(wal, 'ab') as f:
+            f.write(b'{"op":"txn","user_id":1,"ent')
+        with AccountStore(str(tmp_path), fsync=False) as store:
+            assert store.accounts[1].to_dict() == expected
+            store.accounts[1].deposit(5.0)
+        with AccountStore(str(tmp_path), fsync=False) as store:
+            assert store.accounts[1].balance == 10015.0
+
+    def test_concurrent_writers_with_background_checkpoints(self, tmp_path):
+        with AccountStore(str(tmp_path), snapshot_every=50) as store:
+            accounts = [store.register(make_account(user_id)) for user_id in range(1, 5)]
+
+            def deposit_many(account):
+                for _ in range(100):
+                    account.deposit(1.0)
+
+            threads = [threading.Thread(target=deposit_many, args=(account,)) for account in accounts]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        with AccountStore(str(tmp_path)) as store:
+            assert [store.accounts[i].balance for i in range(1, 5)] == [10100.0] * 4
+            assert all(len(store.accounts[i].transactions) == 100 for i in range(1, 5))
+
+    def test_order_batch_is_one_record(self, tmp_path):
+        with AccountStore(str(tmp_path), fsync=False, snapshot_every=0) as store:
+            account = store.register(make_account())
+            wal = store._wal.name
+            account.execute_orders([('buy', 'AAPL', 5), ('buy', 'TSLA', 1), ('sell', 'AAPL', 2)], get_share_price)
+            expected = account.to_dict()
+        with open(wal, 'rb') as f:
+            lines = f.readlines()
+        assert len(lines) == 2  # the opening record and the batch
+        with open(wal, 'wb') as f:
+            f.write(lines[0] + lines[1][:len(lines[1]) // 2])  # crash halfway through writing the batch
+        with AccountStore(str(tmp_path), fsync=False) as store:
+            assert store.accounts[1].holdings == {}
+            assert store.accounts[1].balance == 10000.0
+        with open(wal, 'wb') as f:
+            f.writelines(lines)
+        with AccountStore(str(tmp_path), fsync=False) as store:
+            assert store.accounts[1].to_dict() == expected
+
+    def test_duplicate_registration(self, tmp_path):
+        with AccountStore(str(tmp_path), fsync=False) as store:
+            store.register(make_account())
+            with pytest.raises(ValueError):
+                store.register(make_account())
@@ -0,0 +1,85 @@
+import pytest
+
+from accounts import UserAccount, get_share_price
+from accounts.valuation import PriceTicker, batch_price_provider, value_portfolios
+
+
+class TestValuePortfolios:
+    @pytest.fixture
+    def accounts(self):
+        accounts = []
+        for user_id in range(1, 51):
+            account = UserAccount(user_id=user_id, username=f'user{user_id}', password='pw', email=f'user{user_id}@example.com', balance=1000000.0)
+            for symbol in ('AAPL', 'TSLA', 'GOOGL', 'MSFT')[:user_id % 5]:
+                account.buy_shares(symbol, user_id, get_share_price)
+            accounts.append(account)
+        return accounts
+
+    def test_matches_per_account_valuation(self, accounts):
+        values = value_portfolios(accounts, batch_price_provider(get_share_price))
+        assert values == pytest.approx([a.get_portfolio_value(get_share_price) for a in accounts])
+
+    def test_prices_each_symbol_once(self, accounts):
+        calls = []
+
+        def get_share_prices(symbols):
+            calls.append(list(symbols))
+            return {symbol: get_share_price(symbol) for symbol in symbols}
+
+        value_portfolios(accounts, get_share_prices)
+        assert len(calls) == 1
+        assert sorted(calls[0]) == ['AAPL', 'GOOGL', 'MSFT', 'TSLA']
+
+    def test_cash_only_accounts(self):
+        account = UserAccount(user_id=1, username='john_doe', password='pw', email='john@example.com', balance=42.0)
+        assert value_portfolios([account], lambda symbols: pytest.fail("no symbols to price")) == [42.0]
+        assert value_portfolios([], dict) == []
+
+    def test_missing_price(self, accounts):
+        with pytest.raises(KeyError):
+            value_portfolios(accounts, lambda symbols: {})
+
+
+class TestIncrementalValuation:
+    @pytest.fixture
+    def account(self):
+        account = UserAccount(user_id=1, username='john_doe', password='password123', email='john@example.com', balance=100000.0)
+        account.buy_shares('AAPL', 10, get_share_price)
+        account.buy_shares('TSLA', 5, get_share_price)
+        return account
+
+    def test_initial_value_matches_full_valuation(self, account):
+        account.track_valuation(get_share_price)
+        assert account.get_portfolio_value() == account.get_portfolio_value(get_share_price)
+
+    def test_follows_trades_and_cash(self, account):
+        account.track_valuation(get_share_price)
+        account.deposit(1000.0)
+        account.buy_shares('GOOGL', 2, get_share_price)
+        account.sell_shares('TSLA', 5, get_share_price)
+        account.execute_orders([('buy', 'MSFT', 3), ('sell', 'AAPL', 4)], get_share_price)
+        assert account.get_portfolio_value() == pytest.approx(account.get_portfolio_value(get_share_price))
+        assert set(account.valuation._terms) == {'AAPL', 'GOOGL', 'MSFT'}
+
+    def test_price_tick_updates_one_term(self, account):
+        ticker = PriceTicker()
+        valuation = account.track_valuation(get_share_price, ticker=ticker)
+        prices = {'AAPL': 150.0, 'TSLA': 600.0}
+        ticker.publish('TSLA', 610.0)
+        ticker.publish('GOOGL', 1.0)  # not held, nobody subscribed
+        prices['TSLA'] = 610.0
+        assert valuation.value == pytest.approx(account.get_portfolio_value(prices.get))
+        account.sell_shares('TSLA', 5, prices.get)
+        ticker.publish('TSLA', 9999.0)
+        assert valuation.value == pytest.approx(account.get_portfolio_value(prices.get))
+
+    def test_ticks_do_not_drift(self, account):
+        valuation = account.track_valuation(get_share_price)
+        for i in range(1000):
+            valuation.on_price('AAPL', 150.0 + (i % 7) * 0.1)
+        valuation.on_price('AAPL', 150.0)
+        assert valuation.value == account.get_portfolio_value(get_share_price)
+
+    def test_requires_price_function_when_untracked(self, account):
+        with pytest.raises(ValueError):
+            account.get_portfolio_value()